@@ -0,0 +1,98 @@
+"""
+Benchmark of turning the port trade table's ANSI output into terminal
+fragments, with prompt_toolkit's ANSI class line by line and with
+ANSIFragments.
+
+Run with:
+
+    pdm run python benchmarks/ansi.py
+"""
+
+import time
+
+from colorclass import Color
+from prompt_toolkit import ANSI
+from prompt_toolkit.formatted_text import to_formatted_text
+from tabulate import DataRow, Line, TableFormat, tabulate
+
+from tspace.client.ansi import ANSIFragments
+from tspace.client.twbuffer import TwBuffer
+from tspace.common.models import CommodityType
+
+ROUNDS = 2_000
+
+
+def port_table() -> str:
+    """
+    The commodity table from the port prompt's commerce report
+    """
+    rows = []
+    for i, ctype in enumerate(CommodityType):
+        amount, capacity = 1500 + i * 700, 3000
+        rows.append(
+            [
+                Color.cyan("{name}").format(name=ctype.value),
+                Color.green("Buying" if i % 2 else "Selling"),
+                Color.cyan("{}").format(amount),
+                Color("{green}{}{/green}{red}%{/red}").format(
+                    int(amount / capacity * 100)
+                ),
+                Color.cyan(str(i * 10)),
+            ]
+        )
+    return tabulate(
+        tabular_data=rows,
+        stralign="center",
+        numalign="center",
+        headers=(
+            Color.green(t)
+            for t in ["Items", "Status", "Trading", "% of max", "OnBoard"]
+        ),
+        tablefmt=TableFormat(
+            lineabove=Line("", "-", "  ", ""),
+            linebelowheader=Line("", Color.magenta("-"), "  ", ""),
+            linebetweenrows=None,
+            linebelow=Line("", "-", "  ", ""),
+            headerrow=DataRow("", "  ", ""),
+            datarow=DataRow("", "  ", ""),
+            padding=0,
+            with_header_hide=["lineabove", "linebelow"],
+        ),
+    )
+
+
+def prompt_toolkit_lines(text: str) -> list[list[tuple[str, str]]]:
+    return [to_formatted_text(ANSI(line)) for line in text.split("\n")]
+
+
+def bench(convert, text: str) -> tuple[float, float, int]:
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        lines = convert(text)
+    parse = (time.perf_counter() - start) / ROUNDS
+
+    # and written out to the terminal, as write_ansi does
+    buffer = TwBuffer()
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        buffer.insert_after(*convert(text), [])
+    write = (time.perf_counter() - start) / ROUNDS
+    return parse, write, sum(len(line) for line in lines)
+
+
+def main():
+    text = port_table()
+    print(f"port table: {len(text)} characters, {text.count(chr(10)) + 1} lines")
+    for label, convert in (
+        ("prompt_toolkit ANSI", prompt_toolkit_lines),
+        ("ANSIFragments", ANSIFragments.split_lines),
+    ):
+        parse, write, fragments = bench(convert, text)
+        print(
+            f"{label:>20}: parse {parse * 1e6:6.1f}us, parse and write "
+            f"{write * 1e6:6.1f}us, {fragments:>4} fragments"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Benchmark of the server battle engine, resolving many concurrent battles.
+
+Run with:
+
+    pdm run python benchmarks/battles.py
+"""
+
+import random
+import time
+
+from tspace.server.builders.drones import FIGHTER
+from tspace.server.builders.ships import MERCHANT_CRUISER
+from tspace.server.combat import BattleEngine, Combatant
+
+REPEATS = 5
+
+
+def random_combatant(rnd: random.Random) -> Combatant:
+    return Combatant(
+        ship_type=MERCHANT_CRUISER,
+        stacks=[
+            (FIGHTER, rnd.randint(1, 50))
+            for _ in range(MERCHANT_CRUISER.drone_stack_max)
+        ],
+    )
+
+
+def bench(concurrent: int) -> tuple[float, float]:
+    rnd = random.Random(concurrent)
+    elapsed = 0.0
+    rounds = 0
+    for _ in range(REPEATS):
+        engine = BattleEngine(capacity=concurrent)
+        for battle_id in range(concurrent):
+            engine.add(
+                battle_id,
+                seed=rnd.getrandbits(64),
+                attacker=random_combatant(rnd),
+                target=random_combatant(rnd),
+            )
+
+        start = time.perf_counter()
+        while engine.step():
+            rounds += 1
+        elapsed += time.perf_counter() - start
+
+    return concurrent * REPEATS / elapsed, rounds / elapsed
+
+
+def main():
+    for concurrent in (100, 1000):
+        battles, ticks = bench(concurrent)
+        print(
+            f"{concurrent:>5} concurrent: {battles:>10,.0f} battles/sec, "
+            f"{ticks:>8,.0f} ticks/sec"
+        )
+
+
+if __name__ == "__main__":
+    main()
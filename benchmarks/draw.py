@@ -0,0 +1,50 @@
+"""
+Benchmark of rendering the planet and port approach animation shown when
+warping into a sector, in frames per second, and how soon the first frame is
+ready when rendered in the background by the frame cache.
+
+Run with:
+
+    pdm run python benchmarks/draw.py
+"""
+
+import asyncio
+import time
+
+from tspace.client.ui.draw import FrameCache, FramesKey, gen_frames
+
+# three seconds at the client's 15 fps, as WarpDialog asks for
+STEPS = 45
+SIZES = ((120, 40), (240, 80))
+
+
+async def first_frame(key: FramesKey) -> tuple[float, float, int]:
+    cache = FrameCache()
+    start = time.perf_counter()
+    frames = cache.request(key)
+    while not frames.frames:
+        await asyncio.sleep(0)
+    first = time.perf_counter() - start
+    await frames.task
+    return first, time.perf_counter() - start, cache.nbytes
+
+
+def main():
+    for width, height in SIZES:
+        start = time.perf_counter()
+        frames = gen_frames(width, height, STEPS, True, True)
+        elapsed = time.perf_counter() - start
+
+        fragments = sum(len(line) for frame in frames for line in frame) / len(frames)
+        first, total, nbytes = asyncio.run(
+            first_frame(FramesKey(width, height, STEPS, True, True))
+        )
+        print(
+            f"{width:>3}x{height:<3}: {len(frames) / elapsed:8.1f} frames/s, "
+            f"{fragments:8.0f} fragments per frame, in the background first frame "
+            f"{first * 1e3:5.1f}ms, all {total * 1e3:6.1f}ms, {nbytes / 2**20:5.1f}MiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
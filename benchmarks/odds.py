@@ -0,0 +1,50 @@
+"""
+Benchmark of estimating battle odds, simulated and from the cache, against the
+budget for estimating them inline while building a sector for display.
+
+Run with:
+
+    pdm run python benchmarks/odds.py
+"""
+
+import time
+
+from tspace.server.builders.drones import FIGHTER
+from tspace.server.builders.ships import MERCHANT_CRUISER
+from tspace.server.combat import Combatant
+from tspace.server.odds import BattleOddsEstimator
+
+UNCACHED_BUDGET_SECS = 0.05
+CACHED_BUDGET_SECS = 0.001
+ROUNDS = 1000
+
+
+def combatant(*sizes: int) -> Combatant:
+    return Combatant(MERCHANT_CRUISER, [(FIGHTER, size) for size in sizes])
+
+
+def main():
+    estimator = BattleOddsEstimator()
+    attacker = combatant(50, 50, 50)
+    target = combatant(49, 50, 50)
+
+    start = time.perf_counter()
+    estimator.estimate(attacker, target)
+    uncached = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        estimator.estimate(attacker, target)
+    cached = (time.perf_counter() - start) / ROUNDS
+
+    print(
+        f"uncached: {uncached * 1e3:8.3f}ms "
+        f"(budget {UNCACHED_BUDGET_SECS * 1e3:.0f}ms)"
+    )
+    print(
+        f"cached:   {cached * 1e3:8.3f}ms " f"(budget {CACHED_BUDGET_SECS * 1e3:.0f}ms)"
+    )
+
+
+if __name__ == "__main__":
+    main()
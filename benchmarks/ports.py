@@ -0,0 +1,71 @@
+"""
+Micro-benchmark of buy/sell transactions against a single port.
+
+Run with:
+
+    pdm run python benchmarks/ports.py
+"""
+
+import asyncio
+import time
+
+from tspace.common.models import CommodityType
+from tspace.server.config import GameConfig
+from tspace.server.galaxy import Galaxy
+from tspace.server.models import SessionContext, PortClass, Port
+from tspace.server.moves import ShipMoves
+
+ROUNDS = 20_000
+
+
+def setup() -> tuple[ShipMoves, Port]:
+    galaxy = Galaxy(GameConfig(1, "Bench", diameter=10, seed="bench"))
+    galaxy.start()
+    player = galaxy.add_player("Bench")
+    player.credits = 10**12
+    player.ship.holds_capacity = 10**9
+    player.ship.add_to_holds(CommodityType.fuel_ore, 10**6)
+
+    port = next(iter(galaxy.ports.values()))
+    # make sure the port both buys and sells something
+    for ctype, buying in PortClass.BSB.buying.items():
+        trading = port.commodity(ctype)
+        trading.buying = buying
+        trading.capacity = 10**9
+        trading.amount = 10**9
+
+    moves = ShipMoves(lambda: {}, SessionContext(player=player), galaxy, events=None)
+    return moves, port
+
+
+def bench_commodity_ops(port: Port) -> float:
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        trading = port.commodity(CommodityType.organics)
+        cost = int(trading.price * 10)
+        trading.amount -= 10
+        trading = port.commodity(CommodityType.fuel_ore)
+        cost += int(trading.price * 10)
+        trading.amount += 10
+        port.to_public(None)
+    return (ROUNDS * 2) / (time.perf_counter() - start)
+
+
+async def bench_handlers(moves: ShipMoves, port: Port) -> float:
+    rounds = ROUNDS // 10
+    start = time.perf_counter()
+    for _ in range(rounds):
+        await moves.buy_from_port(port.id, CommodityType.organics.name, 1)
+        await moves.sell_to_port(port.id, CommodityType.fuel_ore, 1)
+    return (rounds * 2) / (time.perf_counter() - start)
+
+
+def main():
+    moves, port = setup()
+    print(f"commodity ops:  {bench_commodity_ops(port):>12,.0f} transactions/sec")
+    handlers = asyncio.run(bench_handlers(moves, port))
+    print(f"move handlers:  {handlers:>12,.0f} transactions/sec")
+
+
+if __name__ == "__main__":
+    main()
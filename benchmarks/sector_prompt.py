@@ -0,0 +1,78 @@
+"""
+Benchmark of printing a busy sector to the terminal, counting the redraws it
+asks for.
+
+Run with:
+
+    pdm run python benchmarks/sector_prompt.py
+"""
+
+import asyncio
+import json
+import time
+
+from tspace.client.game import Game
+from tspace.client.models import GameConfig as ClientGameConfig
+from tspace.client.sector_prompt import Prompt
+from tspace.client.terminal import Terminal
+from tspace.client.twbuffer import TwBuffer
+from tspace.common.models import GameConfigPublic, PlayerPublic, TypeCatalogPublic
+from tspace.server.config import GameConfig
+from tspace.server.server import Server
+
+PLAYERS = 20
+ROUNDS = 2_000
+
+
+async def enter_game() -> Game:
+    """
+    Joins a game with a crowd of other players in the starting sector, returning
+    the last player's view of it
+    """
+    server = Server(GameConfig(1, "Bench", diameter=10, seed="bench"))
+    sent: list[str] = []
+
+    async def callback(text: str):
+        sent.append(text)
+
+    for i in range(PLAYERS):
+        sent.clear()
+        await server.join(f"Trader {i}", callback)
+    server.game.scheduler.stop()
+
+    params = json.loads(sent[0])["params"]
+    game = Game(ClientGameConfig(GameConfigPublic(**params["config"])))
+    game.update_catalog(TypeCatalogPublic(**params["catalog"]))
+    game.update_player(PlayerPublic(**params["player"]))
+    return game
+
+
+def main():
+    game = asyncio.run(enter_game())
+    buffer = TwBuffer()
+    redraws = 0
+
+    def invalidate():
+        nonlocal redraws
+        redraws += 1
+
+    buffer.on_change(invalidate)
+    prompt = Prompt(game, actions=None, term=Terminal(buffer))
+
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        prompt.print_sector()
+    elapsed = time.perf_counter() - start
+
+    sector = game.player.sector
+    print(
+        f"sector with {len(sector.ships)} ships, {len(sector.planets)} planets, "
+        f"{len(sector.ports)} ports"
+    )
+    print(
+        f"print_sector: {elapsed / ROUNDS * 1e6:8.1f}us, {redraws / ROUNDS:.0f} redraws"
+    )
+
+
+if __name__ == "__main__":
+    main()
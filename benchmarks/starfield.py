@@ -0,0 +1,34 @@
+"""
+Benchmark of the CPU time the title screen's starfield takes per frame, moving
+the stars and handing out every line as a render does.
+
+Run with:
+
+    pdm run python benchmarks/starfield.py
+"""
+
+import time
+
+from tspace.client.ui.starfield import Starfield
+
+FRAMES = 2_000
+SIZES = ((120, 40), (240, 80))
+
+
+def main():
+    for width, height in SIZES:
+        starfield = Starfield()
+        start = time.process_time()
+        for _ in range(FRAMES):
+            content = starfield.create_content(width, height)
+            for y in range(height):
+                content.get_line(y)
+        elapsed = time.process_time() - start
+        print(
+            f"{width:>3}x{height:<3}: {elapsed / FRAMES * 1e6:7.1f}us CPU per frame, "
+            f"{elapsed / FRAMES * 15 * 100:.2f}% of a core at 15 fps"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark of filling the terminal's scrollback and rendering it.
+
+Run with:
+
+    pdm run python benchmarks/terminal.py
+"""
+
+import time
+import tracemalloc
+
+from prompt_toolkit.application import DummyApplication
+from prompt_toolkit.application.current import set_app
+from prompt_toolkit.layout.mouse_handlers import MouseHandlers
+from prompt_toolkit.layout.screen import Point, Screen, WritePosition
+
+from tspace.client.terminal_text_area import TerminalTextArea
+from tspace.client.twbuffer import DEFAULT_SCROLLBACK
+
+LINES = 100_000
+RENDERS = 200
+KEYSTROKES = 20_000
+WIDTH, HEIGHT = 120, 40
+
+
+def fill(scrollback: int | None) -> tuple[TerminalTextArea, float, int]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    text_area = TerminalTextArea(scrollback=scrollback)
+    for i in range(LINES):
+        text_area.append_text(
+            [
+                ("magenta", "Sector "),
+                ("bold yellow", str(i)),
+                ("magenta", " : "),
+                ("cyan", "Ports"),
+                ("green", f" Trader {i % 7}"),
+            ],
+            [],
+        )
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return text_area, elapsed, peak
+
+
+def render(text_area: TerminalTextArea, y: int) -> float:
+    text_area.buffer.cursor = Point(0, y)
+    # otherwise prompt_toolkit builds a throwaway app for every lookup
+    with set_app(DummyApplication()):
+        start = time.perf_counter()
+        for _ in range(RENDERS):
+            text_area.window.write_to_screen(
+                Screen(),
+                MouseHandlers(),
+                WritePosition(0, 0, WIDTH, HEIGHT),
+                "",
+                False,
+                None,
+            )
+        return (time.perf_counter() - start) / RENDERS
+
+
+def type_keys(text_area: TerminalTextArea) -> float:
+    """
+    Types and rubs out characters at the end of a long prompt line, as the
+    amount and command prompts do
+    """
+    buffer = text_area.buffer
+    buffer.insert_after([("magenta", f"{i} ") for i in range(200)])
+    start = time.perf_counter()
+    for i in range(KEYSTROKES):
+        buffer.insert_after([("yellow", "\u257e")])
+        buffer.backspace(1)
+    return (time.perf_counter() - start) / KEYSTROKES
+
+
+def main():
+    for label, scrollback in (
+        (f"scrollback {DEFAULT_SCROLLBACK:,}", DEFAULT_SCROLLBACK),
+        ("unbounded", None),
+    ):
+        text_area, elapsed, peak = fill(scrollback)
+        line_count = text_area.buffer.line_count
+        print(
+            f"{label:>18}: {LINES:,} lines written in {elapsed:.2f}s, "
+            f"{line_count:,} kept, peak {peak / 2**20:.1f} MiB"
+        )
+        for position, y in (("bottom", line_count - 1), ("middle", line_count // 2)):
+            frame = render(text_area, y)
+            print(f"{'':>18}  render at {position}: {frame * 1000:.3f}ms/frame")
+        print(f"{'':>18}  keystroke: {type_keys(text_area) * 1e6:.1f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Benchmark of websocket frame compression, replaying the messages the server
+sends during a session of moving and trading.
+
+Run with:
+
+    pdm run python benchmarks/websocket.py
+"""
+
+import asyncio
+import json
+import random
+import time
+
+from tspace.common import wire
+from tspace.common.models import CommodityType
+from tspace.server.config import GameConfig
+from tspace.server.ratelimit import RateLimit
+from tspace.server.server import Server
+
+STEPS = 300
+REPEATS = 5
+
+
+async def record_session() -> list[list[str]]:
+    """
+    Plays a trader moving and trading with two other players watching, returning
+    the messages each connection was sent, in order
+    """
+    unlimited = RateLimit(rate=10**9, burst=10**9)
+    server = Server(
+        GameConfig(
+            1,
+            "Bench",
+            diameter=20,
+            seed="bench",
+            rpc_rate_limits={
+                name: unlimited
+                for name in (
+                    "move_trader",
+                    "buy_from_port",
+                    "sell_to_port",
+                    "enter_port",
+                )
+            },
+        )
+    )
+    connections: list[list[str]] = []
+    answers: dict[int, asyncio.Future] = {}
+
+    def connect():
+        sent: list[str] = []
+        connections.append(sent)
+
+        async def callback(text: str):
+            sent.append(text)
+            if not connections.index(sent):
+                answer = answers.pop(json.loads(text).get("id"), None)
+                if answer:
+                    answer.set_result(None)
+
+        return callback
+
+    trader = await server.join("Trader", connect())
+    for name in ("Watcher", "Other"):
+        await server.join(name, connect())
+
+    rnd = random.Random(1)
+    request_id = 0
+
+    async def call(method: str, **params):
+        nonlocal request_id
+        request_id += 1
+        answer = answers[request_id] = asyncio.get_running_loop().create_future()
+        await trader(
+            json.dumps(
+                {"jsonrpc": "2.0", "id": request_id, "method": method, "params": params}
+            )
+        )
+        # requests failing with something other than a game error get no
+        # answer at all, so don't wait on them forever
+        try:
+            await asyncio.wait_for(answer, 1)
+        except asyncio.TimeoutError:
+            answers.pop(request_id, None)
+
+    for _ in range(STEPS):
+        sector = server.game.sectors[trader.player.ship.sector_id]
+        for port in sector.ports:
+            await call("enter_port", port_id=port.id)
+            organics = CommodityType.organics
+            await call(
+                "buy_from_port", port_id=port.id, commodity=organics.name, amount=1
+            )
+            await call(
+                "sell_to_port", port_id=port.id, commodity=organics.value, amount=1
+            )
+            await call("exit_port", port_id=port.id)
+        await call("move_trader", sector_id=rnd.choice(sector.warps))
+
+    await asyncio.sleep(0.1)
+    server.rpc_dispatcher.stop()
+    server.game.scheduler.stop()
+    return connections
+
+
+def bench(
+    connections: list[list[str]], threshold: int | None
+) -> tuple[int, int, float, float]:
+    wire_bytes = frames = 0
+    encode = decode = 0.0
+    for _ in range(REPEATS):
+        wire_bytes = frames = 0
+        for messages in connections:
+            compressor = (
+                wire.FrameCompressor(threshold) if threshold is not None else None
+            )
+            decompressor = wire.FrameDecompressor()
+            for text in messages:
+                start = time.perf_counter()
+                frame = compressor.encode(text) if compressor else text.encode()
+                encode += time.perf_counter() - start
+                if isinstance(frame, bytes) and compressor:
+                    start = time.perf_counter()
+                    decompressor.decode(frame)
+                    decode += time.perf_counter() - start
+                    frames += 1
+                    wire_bytes += len(frame)
+                else:
+                    wire_bytes += (
+                        len(frame.encode()) if isinstance(frame, str) else len(frame)
+                    )
+    return wire_bytes, frames, encode / REPEATS, decode / REPEATS
+
+
+def main():
+    connections = asyncio.run(record_session())
+    messages = sum(len(sent) for sent in connections)
+    raw = sum(len(text.encode()) for sent in connections for text in sent)
+    print(f"{messages} messages, {raw:,} bytes uncompressed")
+
+    for label, threshold in (
+        ("off", None),
+        ("all frames", 0),
+        (f"threshold {wire.COMPRESS_THRESHOLD}", wire.COMPRESS_THRESHOLD),
+    ):
+        wire_bytes, frames, encode, decode = bench(connections, threshold)
+        print(
+            f"{label:>14}: {wire_bytes:>10,} bytes ({wire_bytes / raw:6.1%}), "
+            f"{frames:>5} compressed, "
+            f"encode {encode * 1000:7.2f}ms, decode {decode * 1000:7.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
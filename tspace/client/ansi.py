@@ -0,0 +1,179 @@
+import re
+from typing import Generator, List, Tuple
+
+# the same colour tables prompt_toolkit's ANSI class uses, so styles come out the same
+from prompt_toolkit.formatted_text.ansi import _256_colors, _bg_colors, _fg_colors
+
+# a CSI sequence with its parameter and intermediate bytes, an escape that
+# doesn't start one (dropped along with the character after it, as
+# prompt_toolkit does, unless that's a line break), or a line break
+_TOKEN = re.compile(
+    r"((?:\x1b\[|\x9b)[\x30-\x3f]*[\x20-\x2f]*[\x40-\x7e]|\x1b[^\[\n]|\x1b(?=\n)|\n)"
+)
+# the start of an escape sequence cut off at the end of a chunk
+_PARTIAL = re.compile(r"(?:\x1b\[?|\x9b)[\x30-\x3f]*[\x20-\x2f]*$")
+# parameters of the sequences acted on, private and intermediate bytes aside
+_PLAIN_PARAMS = re.compile(r"[0-9;]*")
+
+# color, bgcolor, bold, dim, underline, strike, italic, blink, reverse, hidden
+_State = Tuple[str | None, str | None, bool, bool, bool, bool, bool, bool, bool, bool]
+_RESET: _State = (None, None, False, False, False, False, False, False, False, False)
+_FLAGS = ("bold", "dim", "underline", "strike", "italic", "blink", "reverse", "hidden")
+# SGR codes turning a flag on or off, as (index into the state, value)
+_FLAG_CODES = {
+    1: (2, True),
+    2: (3, True),
+    3: (6, True),
+    4: (4, True),
+    5: (7, True),
+    6: (7, True),
+    7: (8, True),
+    8: (9, True),
+    9: (5, True),
+    23: (6, False),
+    24: (4, False),
+    25: (7, False),
+    27: (8, False),
+    28: (9, False),
+    29: (5, False),
+}
+
+# beyond this many entries the cache is cleared, truecolor output can make any
+# number of distinct states
+_CACHE_SIZE = 4096
+
+
+class ANSIFragments:
+    """
+    Turns text containing ANSI SGR colour codes into prompt_toolkit fragments,
+    with one fragment per run of text in the same style rather than one per
+    character.
+
+    Like ANSICursor it's a coroutine fed with input, but it takes whole chunks
+    and splits them on escape sequences with a regex instead of looking at each
+    character. Text can arrive in any number of chunks, escape sequences split
+    across them included, and the style carries over from one chunk and line to
+    the next as it would on a terminal.
+
+    The style each SGR sequence leads to from each style is cached across
+    instances, along with its style string, as the same few colours come up over
+    and over.
+    """
+
+    _transitions: dict[tuple[_State, str], tuple[_State, str]] = {}
+
+    def __init__(self):
+        self.lines: List[List[Tuple[str, str]]] = [[]]
+        self._state = _RESET
+        self._style = ""
+        self._parser = self._parse_corot()
+        self._parser.send(None)
+
+    @classmethod
+    def split_lines(cls, text: str) -> List[List[Tuple[str, str]]]:
+        fragments = cls()
+        fragments.feed(text)
+        return fragments.lines
+
+    def feed(self, text: str):
+        self._parser.send(text)
+
+    def _parse_corot(self) -> Generator[None, str, None]:
+        pending = ""
+        while True:
+            text = pending + (yield)
+            pending = ""
+
+            # only the last escape can be cut off, however long its parameters
+            partial = _PARTIAL.match(
+                text, max(text.rfind("\x1b"), text.rfind("\x9b"), 0)
+            )
+            if partial:
+                pending = text[partial.start() :]
+                text = text[: partial.start()]
+
+            # alternates between text and the token that ends it
+            parts = iter(_TOKEN.split(text))
+            for part in parts:
+                if part:
+                    self._append(part)
+                token = next(parts, None)
+                if token is None:
+                    break
+
+                if token == "\n":
+                    self.lines.append([])
+                    continue
+                params_start = 1 if token[0] == "\x9b" else 2
+                if params_start == 2 and token[1:2] != "[":
+                    continue
+                # any other sequence, cursor visibility and the like, is dropped
+                params = token[params_start:-1]
+                if not _PLAIN_PARAMS.fullmatch(params):
+                    continue
+                if token[-1] == "m":
+                    self._select_graphic_rendition(token)
+                elif token[-1] == "C":
+                    # cursor forward, filled in with spaces
+                    self._append(" " * _params(params)[0])
+
+    def _append(self, text: str):
+        if not text:
+            return
+        line = self.lines[-1]
+        if line and line[-1][0] == self._style:
+            line[-1] = (self._style, line[-1][1] + text)
+        else:
+            line.append((self._style, text))
+
+    def _select_graphic_rendition(self, sequence: str):
+        key = (self._state, sequence)
+        cached = self._transitions.get(key)
+        if cached is None:
+            if len(self._transitions) > _CACHE_SIZE:
+                self._transitions.clear()
+            params = sequence[1:-1] if sequence[0] == "\x9b" else sequence[2:-1]
+            state = _apply_sgr(self._state, _params(params))
+            cached = self._transitions[key] = (state, _style_string(state))
+        self._state, self._style = cached
+
+
+def _params(params: str) -> list[int]:
+    return [min(int(p or 0), 9999) for p in params.split(";")]
+
+
+def _apply_sgr(state: _State, codes: list[int]) -> _State:
+    new = list(state)
+    codes = codes[::-1]
+    while codes:
+        code = codes.pop()
+        if code in _fg_colors:
+            new[0] = _fg_colors[code]
+        elif code in _bg_colors:
+            new[1] = _bg_colors[code]
+        elif code in _FLAG_CODES:
+            index, value = _FLAG_CODES[code]
+            new[index] = value
+        elif code == 22:
+            new[2] = new[3] = False
+        elif not code:
+            new = list(_RESET)
+        elif code in (38, 48) and len(codes) > 1:
+            index = 0 if code == 38 else 1
+            mode = codes.pop()
+            if mode == 5 and codes:
+                new[index] = _256_colors.get(codes.pop())
+            elif mode == 2 and len(codes) >= 3:
+                new[index] = f"#{codes.pop():02x}{codes.pop():02x}{codes.pop():02x}"
+    return tuple(new)
+
+
+def _style_string(state: _State) -> str:
+    color, bgcolor = state[0], state[1]
+    result = []
+    if color:
+        result.append(color)
+    if bgcolor:
+        result.append("bg:" + bgcolor)
+    result.extend(flag for flag, on in zip(_FLAGS, state[2:]) if on)
+    return " ".join(result)
@@ -14,11 +14,17 @@ from tspace.client.scene.game import TerminalScene
 from tspace.client.scene.main_menu import TitleScene
 from tspace.client.ui import style
 from tspace.client.util import sync_to_async
-from tspace.common.background import schedule_background_task
+from tspace.common import wire
 from tspace.server.config import GameConfig
 from tspace.server.server import Server
 
 
+# seconds between attempts to resume a dropped connection to a server, and how
+# many are made before giving up
+RECONNECT_DELAY = 2
+RECONNECT_ATTEMPTS = 5
+
+
 class InvalidScreenSize(Exception):
     def __init__(self, expected: Size, actual: Size):
         self.expected = expected
@@ -33,7 +39,8 @@ class TwApplication(Application):
         super().__init__(
             mouse_support=True,
             full_screen=True,
-            refresh_interval=1 / 15,
+            # no refresh interval, the screen is redrawn when something changes
+            # and animations ask for their own frames, see RedrawScheduler
             style=style.css,
             color_depth=ColorDepth.DEPTH_8_BIT,
         )
@@ -119,42 +126,108 @@ class TwApplication(Application):
         terminal_scene = TerminalScene(self, lambda text: out_queue.put(text))
         self.layout = terminal_scene.layout
 
+        url = f"ws://{host}:{port}/?name=Remote%20Jim&{wire.COMPRESS_PARAM}=1"
         async with aiohttp.ClientSession() as aiosession:
-            async with aiosession.ws_connect(
-                f"ws://{host}:{port}/?name=Remote%20Jim"
-            ) as ws:
 
-                async def read_input():
+            def connect(url: str):
+                return aiosession.ws_connect(
+                    url, heartbeat=wire.HEARTBEAT, max_msg_size=wire.MAX_MESSAGE_SIZE
+                )
+
+            ws = await connect(url)
+            # cleared while resuming a dropped connection, holding back what's sent
+            connected = asyncio.Event()
+            connected.set()
+
+            async def reconnect(token: str) -> aiohttp.ClientWebSocketResponse | None:
+                for _ in range(RECONNECT_ATTEMPTS):
+                    try:
+                        return await connect(f"{url}&token={token}")
+                    except aiohttp.ClientError as e:
+                        log.info(f"Failed to reconnect: {e}")
+                        await asyncio.sleep(RECONNECT_DELAY)
+                return None
+
+            async def read_input():
+                nonlocal ws
+                while True:
+                    # each connection starts a new deflate stream
+                    decompressor = wire.FrameDecompressor()
                     async for msg in ws:
                         if msg.type == aiohttp.WSMsgType.TEXT:
                             await terminal_scene.session.bus(msg.data)
+                        elif msg.type == aiohttp.WSMsgType.BINARY:
+                            await terminal_scene.session.bus(
+                                decompressor.decode(msg.data)
+                            )
                         elif msg.type == aiohttp.WSMsgType.ERROR:
                             print("error")
                             break
 
-                async def write_output():
+                    token = terminal_scene.session.session_token
+                    # a clean close is the server ending the game, not a dropped
+                    # connection
+                    if token is None or ws.close_code == aiohttp.WSCloseCode.OK:
+                        break
+                    # resume the session on a new connection, which replays
+                    # whatever the server sent meanwhile
+                    log.info("Lost connection, reconnecting")
+                    connected.clear()
+                    await ws.close()
+                    resumed = await reconnect(token)
+                    if resumed is None:
+                        log.info("Gave up reconnecting")
+                        break
+                    ws = resumed
+                    connected.set()
+
+                # no answers can come anymore, so calls waiting on one fail
+                terminal_scene.session.bus.fail_pending(
+                    ConnectionError("Lost connection to the server")
+                )
+                scene_task.cancel()
+
+            async def write_output():
+                while True:
+                    try:
+                        msg = await out_queue.get()
+                    except InterruptedError:
+                        break
                     while True:
+                        await connected.wait()
                         try:
-                            msg = await out_queue.get()
-                        except InterruptedError:
+                            await ws.send_str(msg)
                             break
-                        await ws.send_str(msg)
+                        except ConnectionError as e:
+                            # sent again once the session is resumed
+                            log.info(f"Holding a message while reconnecting: {e}")
+                            connected.clear()
 
-                write_task = asyncio.create_task(write_output())
-                schedule_background_task(read_input())
+            scene_task = asyncio.create_task(terminal_scene.start())
+            write_task = asyncio.create_task(write_output())
+            read_task = asyncio.create_task(read_input())
 
-                try:
-                    await terminal_scene.start()
-                except CancelledError:
-                    pass  # print("cancelled'")
+            try:
+                await scene_task
+            except CancelledError:
+                pass  # print("cancelled'")
 
-                write_task.cancel()
+            write_task.cancel()
+            read_task.cancel()
+            await ws.close()
 
         terminal_scene.end()
 
     async def start_game(self):
+        # the local game is small enough to build on a thread, and forking a
+        # process pool from the client isn't worth it
         config = GameConfig(
-            1, "Test Game", diameter=10, seed="test", debug_network=False
+            1,
+            "Test Game",
+            diameter=10,
+            seed="test",
+            debug_network=False,
+            worker_processes=0,
         )
         server = Server(config)
 
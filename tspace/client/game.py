@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 from collections import defaultdict
+from dataclasses import dataclass
+from typing import Callable
 
 import networkx as nx
 
@@ -20,10 +22,35 @@ from tspace.common.models import (
     TraderShipPublic,
     SectorPublic,
     ShipPublic, BattlePublic,
+    DroneType,
+    ShipType,
+    TypeCatalogPublic,
 )
 
 
+@dataclass(frozen=True)
+class Change:
+    """
+    Something in the game changed: an entity in one of the game's collections,
+    such as "sectors" or "player", or the collection as a whole with no id.
+    version is the game version it changed at.
+    """
+
+    collection: str
+    id: int | None
+    version: int
+
+
 class Game:
+    """
+    What the client knows of the game.
+
+    Every change made through its methods bumps the game version, stamps the
+    entity and its collection with it, and is passed on to the listeners as a
+    Change. Views can then redraw only when something they show has changed,
+    by comparing version_of() what they read, or by listening for changes.
+    """
+
     def __init__(self, config: GameConfig):
         self.config = config
         self.sectors: dict[int, Sector] = {}
@@ -33,14 +60,49 @@ class Game:
         self.traders: dict[int, Trader] = {}
         self.planets: dict[int, Planet] = {}
         self.battles: dict[int, Battle] = {}
+        self.ship_types: dict[int, ShipType] = {}
+        self.drone_types: dict[int, DroneType] = {}
         self.player: Player = None
 
+        self.version = 0
+        self._versions: dict[tuple[str, int | None], int] = {}
+        self._listeners: list[Callable[[Change], None]] = []
+
+    def on_change(self, listener: Callable[[Change], None]):
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[Change], None]):
+        self._listeners.remove(listener)
+
+    def version_of(self, collection: str, id: int | None = None) -> int:
+        """
+        The game version the entity last changed at, or with no id, anything in
+        the collection. 0 if it never has.
+        """
+        return self._versions.get((collection, id), 0)
+
+    def _changed(self, collection: str, id: int | None = None):
+        self.version += 1
+        self._versions[(collection, id)] = self.version
+        if id is not None:
+            self._versions[(collection, None)] = self.version
+
+        change = Change(collection, id, self.version)
+        for listener in self._listeners:
+            listener(change)
+
+    def update_catalog(self, catalog: TypeCatalogPublic):
+        self.ship_types.update((t.id, t) for t in catalog.ship_types)
+        self.drone_types.update((t.id, t) for t in catalog.drone_types)
+        self._changed("catalog")
+
     # noinspection PyUnresolvedReferences
     def update_player(self, client: PlayerPublic) -> Player:
         if self.player:
             self.player.update(client)
         else:
             self.player = Player(self, client)
+        self._changed("player", self.player.id)
 
         if client.ship:
             self.update_ship(client.ship)
@@ -56,17 +118,38 @@ class Game:
         if client.sector:
             self.update_sector(client.sector)
             self.ships[client.id].sector_id = client.sector.id
-            self.player.visited.add(client.sector.id)
+            self._visit(client.sector.id)
+        self._changed("ships", client.id)
 
         return self.ships[client.id]
 
+    def enter_sector(self, sector_id: int):
+        """
+        Moves the player's ship into the sector
+        """
+        self.player.ship.sector_id = sector_id
+        self._changed("ships", self.player.ship_id)
+        self._visit(sector_id)
+
+    def dock(self, port_id: int | None):
+        """
+        Docks the player at the port, or undocks with None
+        """
+        self.player.port_id = port_id
+        self._changed("player", self.player.id)
+
+    def _visit(self, sector_id: int):
+        if sector_id not in self.player.visited:
+            self.player.visited.add(sector_id)
+            self._changed("visited", sector_id)
+
     def update_sector(self, client: SectorPublic) -> Sector:
-        sector = self.sectors[client.id] if client.id in self.sectors else None
-        if sector:
-            sector.update(client)
-        else:
+        sector = self.sectors.get(client.id)
+        if sector is None:
             log.info(f"Adding sector : {client.id}")
-            self.sectors[client.id] = Sector(self, client)
+            sector = self.sectors[client.id] = Sector(self, client.id)
+        sector.update(client)
+        self._changed("sectors", client.id)
 
         if client.ports:
             for port in client.ports:
@@ -82,17 +165,17 @@ class Game:
 
         for warp_id in (x for x in client.warps if x not in self.sectors):
             log.info(f"Adding warp sector : {warp_id}")
-            self.sectors[warp_id] = Sector(
-                self, SectorPublic(id=warp_id, warps=[], ports=[], ships=[], planets=[])
-            )
+            self.sectors[warp_id] = Sector(self, warp_id)
+            self._changed("sectors", warp_id)
 
-        return self.sectors[client.id]
+        return sector
 
     def update_trader_ship(self, client: TraderShipPublic) -> TraderShip:
         if client.id in self.trader_ships:
             self.trader_ships[client.id].update(client)
         else:
             self.trader_ships[client.id] = TraderShip(self, client)
+        self._changed("trader_ships", client.id)
 
         if client.trader:
             self.update_trader(client.trader)
@@ -104,6 +187,7 @@ class Game:
             self.ports[client.id].update(client)
         else:
             self.ports[client.id] = Port(self, client)
+        self._changed("ports", client.id)
 
         return self.ports[client.id]
 
@@ -112,6 +196,7 @@ class Game:
             self.battles[client.id].update(client)
         else:
             self.battles[client.id] = Battle(self, client)
+        self._changed("battles", client.id)
 
         return self.battles[client.id]
 
@@ -120,6 +205,7 @@ class Game:
             self.traders[client.id].update(client)
         else:
             self.traders[client.id] = Trader(self, client)
+        self._changed("traders", client.id)
 
         return self.traders[client.id]
 
@@ -128,6 +214,7 @@ class Game:
             self.planets[client.id].update(client)
         else:
             self.planets[client.id] = Planet(self, client)
+        self._changed("planets", client.id)
 
         return self.planets[client.id]
 
@@ -17,7 +17,8 @@ from tspace.common.models import (
     TraderPublic,
     DroneStackPublic,
     ShipType,
-    RelativeStrength, BattlePublic,
+    DroneType,
+    RelativeStrength, BattlePublic, BattleOddsPublic,
 )
 
 if typing.TYPE_CHECKING:
@@ -151,17 +152,23 @@ class TraderShip:
         self._game = game
         self.name: str = ""
         self.trader_id: int = 0
-        self.ship_type: ShipType = client.type
+        self.ship_type_id: int = client.type_id
         self.relative_strength: RelativeStrength = RelativeStrength.EVEN
         self.in_battle: bool = False
+        self.odds: BattleOddsPublic | None = None
         self.update(client)
 
     def update(self, client: TraderShipPublic):
         self.name = client.name
         self.trader_id = client.trader.id
-        self.ship_type = client.type
+        self.ship_type_id = client.type_id
         self.relative_strength = client.relative_strength
         self.in_battle = client.in_battle
+        self.odds = client.odds
+
+    @property
+    def ship_type(self) -> ShipType:
+        return self._game.ship_types[self.ship_type_id]
 
     @property
     def trader(self) -> Trader | None:
@@ -169,17 +176,31 @@ class TraderShip:
 
 
 class Sector:
-    def __init__(self, game: Game, client: SectorPublic):
-        self.id = client.id
+    def __init__(self, game: Game, sector_id: int):
+        self.id = sector_id
         self._game = game
-        self.update(client)
+        # empty until updated, which a sector only known as a warp never is
+        self._set_contents([], [], [], [])
 
     def update(self, client: SectorPublic):
-        self.warps = client.warps
+        self._set_contents(
+            client.warps,
+            [port.id for port in client.ports],
+            [ship.id for ship in client.ships],
+            [p.id for p in client.planets],
+        )
 
-        self.port_ids = [port.id for port in client.ports]
-        self.trader_ship_ids = [ship.id for ship in client.ships]
-        self.planet_ids = [p.id for p in client.planets]
+    def _set_contents(
+        self,
+        warps: list[int],
+        port_ids: list[int],
+        trader_ship_ids: list[int],
+        planet_ids: list[int],
+    ):
+        self.warps = warps
+        self.port_ids = port_ids
+        self.trader_ship_ids = trader_ship_ids
+        self.planet_ids = planet_ids
 
     @property
     def ports(self) -> list[Port]:
@@ -198,10 +219,14 @@ class Sector:
 
 class DroneStack:
     def __init__(self, game: Game, client: DroneStackPublic):
-        self.drone_type = client.drone_type
+        self.drone_type_id = client.drone_type_id
         self.size = client.size
         self._game = game
 
+    @property
+    def drone_type(self) -> DroneType:
+        return self._game.drone_types[self.drone_type_id]
+
 
 class Ship:
     def __init__(self, game: Game, client: ShipPublic):
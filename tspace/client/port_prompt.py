@@ -46,55 +46,56 @@ class Prompt(SimpleMenuCmd):
         raise PromptTransition(PromptType.NONE)
 
     async def _print_table(self, ship: Ship, port: Port):
-        print_action(self.out, "Port")
-        self.out.write_line(
-            ("yellow", "Commerce report for "),
-            ("cyan", port.name),
-            ("yellow", ": 12:50:33 PM Sat May 06, 2028"),
-        )
-        self.out.nl()
-        self.out.write_line(("magenta", "-=-=-        Docking Log        -=-=-"))
-        self.out.nl(2)
-        self.out.write_line(("green", "No current ship docking log on file."))
-        self.out.nl(2)
-        rows = []
-        for c in port.commodities.values():
-            rows.append(
-                [
-                    Color.cyan("{name}").format(name=c.type.value),
-                    Color.green("Buying" if c.buying else "Selling"),
-                    Color.cyan("{}").format(c.amount),
-                    Color("{green}{}{/green}{red}%{/red}").format(
-                        int(c.amount / c.capacity * 100)
-                    ),
-                    Color.cyan(str(ship.holds[c.type])),
-                ]
+        with self.out.batch():
+            print_action(self.out, "Port")
+            self.out.write_line(
+                ("yellow", "Commerce report for "),
+                ("cyan", port.name),
+                ("yellow", ": 12:50:33 PM Sat May 06, 2028"),
             )
-
-        self.out.write_ansi(
-            tabulate(
-                tabular_data=rows,
-                stralign="center",
-                numalign="center",
-                headers=(
-                    Color.green(t)
-                    for t in ["Items", "Status", "Trading", "% of max", "OnBoard"]
-                ),
-                tablefmt=TableFormat(
-                    lineabove=Line("", "-", "  ", ""),
-                    linebelowheader=Line("", Color.magenta("-"), "  ", ""),
-                    linebetweenrows=None,
-                    linebelow=Line("", "-", "  ", ""),
-                    headerrow=DataRow("", "  ", ""),
-                    datarow=DataRow("", "  ", ""),
-                    padding=0,
-                    with_header_hide=["lineabove", "linebelow"],
-                ),
+            self.out.nl()
+            self.out.write_line(("magenta", "-=-=-        Docking Log        -=-=-"))
+            self.out.nl(2)
+            self.out.write_line(("green", "No current ship docking log on file."))
+            self.out.nl(2)
+            rows = []
+            for c in port.commodities.values():
+                rows.append(
+                    [
+                        Color.cyan("{name}").format(name=c.type.value),
+                        Color.green("Buying" if c.buying else "Selling"),
+                        Color.cyan("{}").format(c.amount),
+                        Color("{green}{}{/green}{red}%{/red}").format(
+                            int(c.amount / c.capacity * 100)
+                        ),
+                        Color.cyan(str(ship.holds[c.type])),
+                    ]
+                )
+
+            self.out.write_ansi(
+                tabulate(
+                    tabular_data=rows,
+                    stralign="center",
+                    numalign="center",
+                    headers=(
+                        Color.green(t)
+                        for t in ["Items", "Status", "Trading", "% of max", "OnBoard"]
+                    ),
+                    tablefmt=TableFormat(
+                        lineabove=Line("", "-", "  ", ""),
+                        linebelowheader=Line("", Color.magenta("-"), "  ", ""),
+                        linebetweenrows=None,
+                        linebelow=Line("", "-", "  ", ""),
+                        headerrow=DataRow("", "  ", ""),
+                        datarow=DataRow("", "  ", ""),
+                        padding=0,
+                        with_header_hide=["lineabove", "linebelow"],
+                    ),
+                )
             )
-        )
-        self.out.nl(2)
+            self.out.nl(2)
 
-        self.print_trader_status()
+            self.print_trader_status()
 
         if self.player.ship.holds_free < self.player.ship.holds_capacity:
             for c in port.commodities.values():
@@ -0,0 +1,63 @@
+import asyncio
+from weakref import WeakKeyDictionary, ref
+
+from prompt_toolkit import Application
+from prompt_toolkit.application import get_app, get_app_or_none
+
+
+class RedrawScheduler:
+    """
+    Redraws an application only when something on screen changes, instead of
+    on a fixed refresh interval.
+
+    Changes to the game or the terminal buffer redraw straight away through
+    Application.invalidate. Animations ask for their next frame with
+    request_frame each time they're drawn, each at its own rate, so they stop
+    costing anything once they're paused or no longer on screen. With nothing
+    changing, nothing is redrawn.
+    """
+
+    def __init__(self, app: Application):
+        self.app = app
+        self._pending: WeakKeyDictionary[object, asyncio.TimerHandle] = (
+            WeakKeyDictionary()
+        )
+
+    def request_frame(self, owner: object, interval: float):
+        """
+        Redraws in interval seconds, unless the owner already has a frame
+        coming. Called from the owner's create_content.
+        """
+        if owner not in self._pending and self.app.is_running:
+            self._pending[owner] = asyncio.get_running_loop().call_later(
+                interval, self._frame_due, ref(owner)
+            )
+
+    def _frame_due(self, owner: ref):
+        alive = owner()
+        if alive is None:
+            # gone meanwhile, taking its entry with it
+            return
+        self._pending.pop(alive, None)
+        self.app.invalidate()
+
+
+_schedulers: WeakKeyDictionary[Application, RedrawScheduler] = WeakKeyDictionary()
+
+
+def get_scheduler(app: Application | None = None) -> RedrawScheduler:
+    """
+    The redraw scheduler of the app, by default the one running
+    """
+    app = app or get_app()
+    scheduler = _schedulers.get(app)
+    if scheduler is None:
+        scheduler = _schedulers[app] = RedrawScheduler(app)
+    return scheduler
+
+
+def request_frame(owner: object, interval: float):
+    # outside of a running app get_app would build a throwaway one every time
+    app = get_app_or_none()
+    if app is not None:
+        get_scheduler(app).request_frame(owner, interval)
@@ -31,7 +31,8 @@ class TerminalScene:
         self.buffer.on_change(lambda: app.invalidate())
 
         self.terminal = Terminal(self.buffer)
-        self.session = Session(self.terminal)
+        # the stat frames and map show the game, redraw whenever it changes
+        self.session = Session(self.terminal, on_game_change=lambda _: app.invalidate())
 
         has_ship = lambda: bool(
             self.session
@@ -51,18 +52,21 @@ class TerminalScene:
                                     stats=self.get_player_stats(),
                                     title="Player",
                                     width=D(max=25),
+                                    version=partial(self._versions, "player", "ports"),
                                 ),
                                 StatFrame(
                                     condition=has_ship,
                                     stats=self.get_holds_stats(),
                                     title="Holds",
                                     width=D(max=25),
+                                    version=partial(self._versions, "ships"),
                                 ),
                                 StatFrame(
                                     condition=has_ship,
                                     stats=self.get_ship_stats(),
                                     title="Ship",
                                     width=D(max=25),
+                                    version=partial(self._versions, "ships"),
                                 ),
                             ]
                         ),
@@ -107,6 +111,12 @@ class TerminalScene:
         )
         self.layout = Layout(menu_container, focused_element=textfield)
         self.textfield = textfield
+        self._warps_key: tuple | None = None
+        self._warps_label = FormattedText([])
+
+    def _versions(self, *collections: str) -> tuple:
+        game = self.session.game
+        return game, *(game.version_of(collection) for collection in collections)
 
     def get_player_stats(self) -> List[Stat]:
         player = lambda: self.session.game.player
@@ -154,27 +164,49 @@ class TerminalScene:
         ]
         return "".join(lines)
 
-    def get_warps_label(self, condition: Callable[[], bool]):
-        frags = []
+    def get_warps_label(self, condition: Callable[[], bool]) -> FormattedText:
+        """
+        The map of warps around the player's sector, only rebuilt once the
+        player moves, visits a sector or learns more about one or its ports
+        """
+        key = None
         if condition():
-            sector = self.session.game.player.sector
-            rows = self._calculate_max_rows(sector)
+            game = self.session.game
+            key = (
+                game,
+                game.player.sector.id,
+                game.version_of("sectors"),
+                game.version_of("ports"),
+                game.version_of("visited"),
+            )
 
-            if len(rows) > 40:
-                max_depth = 2
-            else:
-                max_depth = 3
+        if key != self._warps_key:
+            self._warps_label = FormattedText([])
+            if key is not None:
+                self._warps_label = self._build_warps_label()
+            self._warps_key = key
+        return self._warps_label
 
-            # frags.append(("", f"len: {len(rows)}\n"))
-            # frags.append(("", "\n".join(textwrap.wrap(f"rows: {','.join([str(r) for r in rows])}", 15))))
-            visited = set()
-            visited.add(sector.id)
-            frags += self.print_sector(sector)
-            frags.append(("", "\n"))
-            for idx, warp in enumerate(sector.warps):
-                frags += self._append_sector_warps(
-                    warp, max_depth, 1, visited, last=idx == len(sector.warps) - 1
-                )
+    def _build_warps_label(self) -> FormattedText:
+        frags = []
+        sector = self.session.game.player.sector
+        rows = self._calculate_max_rows(sector)
+
+        if len(rows) > 40:
+            max_depth = 2
+        else:
+            max_depth = 3
+
+        # frags.append(("", f"len: {len(rows)}\n"))
+        # frags.append(("", "\n".join(textwrap.wrap(f"rows: {','.join([str(r) for r in rows])}", 15))))
+        visited = set()
+        visited.add(sector.id)
+        frags += self.print_sector(sector)
+        frags.append(("", "\n"))
+        for idx, warp in enumerate(sector.warps):
+            frags += self._append_sector_warps(
+                warp, max_depth, 1, visited, last=idx == len(sector.warps) - 1
+            )
         return FormattedText(frags)
 
     def _calculate_max_rows(self, sector):
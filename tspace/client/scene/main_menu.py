@@ -54,6 +54,7 @@ class TitleScene(Scene):
     async def start(self):
         log.info("Starting title")
         self.starfield.reset_speed()
+        self.starfield.paused = False
         self.layout.container = to_container(self.dialog)
         result = await self.future
         self.future = Future()
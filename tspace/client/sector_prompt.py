@@ -17,7 +17,12 @@ from tspace.client.stream import print_action
 from tspace.client.stream import print_grid
 from tspace.client.ui.warp import WarpDialog
 from tspace.common.events import ServerEvents
-from tspace.common.models import TraderShipPublic, SectorPublic, BattlePublic
+from tspace.common.models import (
+    TraderShipPublic,
+    SectorPublic,
+    BattlePublic,
+    ShipTrafficPublic,
+)
 from tspace.common.actions import SectorActions
 
 
@@ -50,6 +55,9 @@ class Prompt(ServerEvents):
         if self.player.ship.sector.id == sector.id:
             self.print_ship_exit_sector(ship)
 
+    async def on_ship_traffic(self, traffic: ShipTrafficPublic):
+        self.print_ship_traffic(traffic)
+
     # noinspection PyUnusedLocal
     async def do_d(self, line):
         """
@@ -67,7 +75,7 @@ class Prompt(ServerEvents):
         )
         p = self.game.update_port(port)
         self.game.update_player(player)
-        self.game.player.port_id = p.id
+        self.game.dock(p.id)
 
         raise PromptTransition(PromptType.PORT)
 
@@ -84,6 +92,15 @@ class Prompt(ServerEvents):
                 ("blue", f"{ship.ship_type.name} "),
                 ("cyan bold", f"({ship.relative_strength.value})"),
             )
+            if ship.odds:
+                self.out.nl()
+                self.out.write_line(
+                    ("green", "Odds of winning: "),
+                    ("yellow", f"{ship.odds.win_probability:.0%}"),
+                    ("green", ", expected losses: "),
+                    ("yellow", f"{ship.odds.expected_losses:.0f}"),
+                    ("green", " drones "),
+                )
             do_attack = await InstantCmd.yes_no(self.out)
             if do_attack:
                 self.out.write_line(("red", "Attacking..."))
@@ -131,7 +148,11 @@ class Prompt(ServerEvents):
         print_action(self.out, "Move")
         if target_id in self.player.sector.warps:
 
-            dialog = WarpDialog(target_id)
+            # what's in the sector is only known if it's been visited before
+            known = None
+            if target_id in self.game.player.visited:
+                known = self.game.sectors.get(target_id)
+            dialog = WarpDialog(target_id, known)
             dialog_task = asyncio.create_task(dialog.show())
             # get_app().invalidate()
             # await self.beams_animated_prompt(f"<< Warping to Sector {target_id} >>")
@@ -146,8 +167,7 @@ class Prompt(ServerEvents):
             dialog.set_next_sector(s)
             await dialog_task
 
-            self.game.player.ship.sector_id = s.id
-            self.game.player.visited.add(s.id)
+            self.game.enter_sector(s.id)
             self.print_sector(s)
 
         elif self.game.sectors.get(target_id):
@@ -164,8 +184,7 @@ class Prompt(ServerEvents):
                 sector_client = await self.actions.move_trader(sector_id=warp.id)
                 s = self.game.update_sector(sector_client)
 
-                self.game.player.ship.sector_id = s.id
-                self.game.player.visited.add(s.id)
+                self.game.enter_sector(s.id)
                 self.print_sector(s)
 
         else:
@@ -239,8 +258,6 @@ class Prompt(ServerEvents):
                 ship_items.append(item)
             data.rows.append(Row(header=Fragment("yellow", "Ships"), items=ship_items))
 
-        print_grid(self.out, data, separator=Fragment("yellow", ": "))
-
         warps: List[Fragment] = []
         for w in sector.warps:
             if w in self.player.visited:
@@ -253,7 +270,7 @@ class Prompt(ServerEvents):
                 ]
             warps.append(Fragment("green", " - "))
 
-        data = Table(
+        warps_data = Table(
             rows=[
                 Row(
                     header=Fragment("green bold", "Warps to Sector(s)"),
@@ -261,19 +278,36 @@ class Prompt(ServerEvents):
                 )
             ]
         )
-        print_grid(self.out, data, separator=Fragment("yellow", ": "))
-        self.out.nl()
+        with self.out.batch():
+            print_grid(self.out, data, separator=Fragment("yellow", ": "))
+            print_grid(self.out, warps_data, separator=Fragment("yellow", ": "))
+            self.out.nl()
 
     def print_ship_enter_sector(self, ship):
-        self.out.nl()
-        self.out.write_line(
-            ("cyan bold", ship.trader.name), ("green", " warps into the sector.")
-        )
-        self.out.nl()
+        with self.out.batch():
+            self.out.nl()
+            self.out.write_line(
+                ("cyan bold", ship.trader.name), ("green", " warps into the sector.")
+            )
+            self.out.nl()
 
     def print_ship_exit_sector(self, ship):
-        self.out.nl()
-        self.out.write_line(
-            ("cyan bold", ship.trader.name), ("green", " warps out of the sector.")
-        )
-        self.out.nl()
+        with self.out.batch():
+            self.out.nl()
+            self.out.write_line(
+                ("cyan bold", ship.trader.name), ("green", " warps out of the sector.")
+            )
+            self.out.nl()
+
+    def print_ship_traffic(self, traffic: ShipTrafficPublic):
+        with self.out.batch():
+            self.out.nl()
+            self.out.write_line(
+                ("cyan bold", traffic.trader.name),
+                ("green", " warps from sector "),
+                ("yellow", str(traffic.from_sector_id)),
+                ("green", " to "),
+                ("yellow", str(traffic.to_sector_id)),
+                ("green", "."),
+            )
+            self.out.nl()
@@ -7,7 +7,7 @@ from typing import Callable, Awaitable
 from typing import Optional
 
 from tspace.client import models, sector_prompt, port_prompt
-from tspace.client.game import Game
+from tspace.client.game import Change, Game
 from tspace.client.instant_cmd import InstantCmd
 from tspace.client.logging import log
 from tspace.client.models import GameConfig
@@ -15,15 +15,26 @@ from tspace.client.prompts import PromptTransition
 from tspace.client.prompts import PromptType
 from tspace.client.terminal import Terminal
 from tspace.client.util import EventBus
-from tspace.common.models import GameConfigPublic, PlayerPublic, PortPublic
+from tspace.common.models import (
+    BattlePublic,
+    GameConfigPublic,
+    PlayerPublic,
+    PortPublic,
+    TypeCatalogPublic,
+)
 from tspace.common.actions import SectorActions, PortActions, BattleActions
 
 
 class Session:
-    def __init__(self, term: Terminal):
+    def __init__(
+        self, term: Terminal, on_game_change: Callable[[Change], None] | None = None
+    ):
         self.term = term
+        # listens to every game joined
+        self.on_game_change = on_game_change
 
         self.game: Optional[Game] = None
+        self.session_token: Optional[str] = None
         self.action_sink = None
 
         self.bus: Optional[EventBus] = None
@@ -62,9 +73,20 @@ class Session:
                     elif e.next == PromptType.NONE:
                         self.prompt = self._start_no_prompt()
 
-    async def on_game_enter(self, player: PlayerPublic, config: GameConfigPublic):
+    async def on_game_enter(
+        self,
+        player: PlayerPublic,
+        config: GameConfigPublic,
+        catalog: TypeCatalogPublic,
+        session_token: str | None = None,
+    ):
         log.info("on game enter!!!!!!!!!!!!!")
+        # lets a dropped connection resume this session
+        self.session_token = session_token
         self.game = Game(GameConfig(config))
+        if self.on_game_change:
+            self.game.on_change(self.on_game_change)
+        self.game.update_catalog(catalog)
         self.game.update_player(player)
 
         prompt = self._start_sector_prompt()
@@ -75,7 +97,7 @@ class Session:
     async def on_port_enter(self, port: PortPublic, player: PlayerPublic):
         p = self.game.update_port(port)
         self.game.update_player(player)
-        self.game.player.port_id = p.id
+        self.game.dock(p.id)
 
         self.prompt = self._start_port_prompt()
         self.prompt_task.cancel()
@@ -83,7 +105,14 @@ class Session:
     async def on_port_exit(self, port: PortPublic, player: PlayerPublic):
         self.game.update_port(port)
         self.game.update_player(player)
-        self.game.player.port_id = None
+        self.game.dock(None)
+
+        self.prompt = self._start_sector_prompt()
+        self.prompt_task.cancel()
+
+    async def on_battle_exit(self, battle: BattlePublic, player: PlayerPublic):
+        self.game.update_battle(battle)
+        self.game.update_player(player)
 
         self.prompt = self._start_sector_prompt()
         self.prompt_task.cancel()
@@ -40,29 +40,31 @@ class Table:
 
 def print_grid(stream: Terminal, data: Table, separator: Fragment):
     header_len = max(len(row.header.text) for row in data.rows) + 1
-    for row in data.rows:
-        stream.write_line(
-            astuple(row.header),
-            ("", " " * (header_len - len(row.header.text))),
-            astuple(separator),
-        )
-        pad = False
-        for item in row.items:
-            if pad:
-                stream.write_line(("", " " * (header_len + 2)))
-            else:
-                pad = True
+    with stream.batch():
+        for row in data.rows:
+            stream.write_line(
+                astuple(row.header),
+                ("", " " * (header_len - len(row.header.text))),
+                astuple(separator),
+            )
+            pad = False
+            for item in row.items:
+                if pad:
+                    stream.write_line(("", " " * (header_len + 2)))
+                else:
+                    pad = True
 
-            for frag in item.value:
-                stream.write_line(astuple(frag))
+                for frag in item.value:
+                    stream.write_line(astuple(frag))
 
-            stream.nl()
+                stream.nl()
 
 
 def print_action(stream: Terminal, title):
-    stream.nl()
-    stream.print(text=title, color="white", bg="blue")
-    stream.nl(2)
+    with stream.batch():
+        stream.nl()
+        stream.print(text=title, color="white", bg="blue")
+        stream.nl(2)
 
 
 @dataclass
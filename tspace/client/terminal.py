@@ -5,6 +5,7 @@ from typing import Tuple, Sequence
 from prompt_toolkit import ANSI
 from prompt_toolkit.formatted_text import to_formatted_text
 
+from tspace.client.ansi import ANSIFragments
 from tspace.client.twbuffer import TwBuffer
 
 
@@ -13,6 +14,12 @@ class Terminal:
         self.buffer = buffer
         self.stdin = input
 
+    def batch(self):
+        """
+        Writes made inside the block are shown together, with a single redraw
+        """
+        return self.buffer.batch()
+
     def backspace(self, num_characters: int = 1):
         self.buffer.backspace(num_characters)
 
@@ -37,14 +44,15 @@ class Terminal:
         self.write_lines(*[[(style, line)] for line in lines])
 
     def nl(self, times=1):
-        for x in range(times):
-            self.write_lines([], [])
+        if times > 0:
+            self.write_lines(*[[] for _ in range(times + 1)])
 
     def error(self, msg):
-        self.nl()
-        self.print(msg, "red")
-        self.nl()
-        self.nl()
+        with self.batch():
+            self.nl()
+            self.print(msg, "red")
+            self.nl()
+            self.nl()
 
     async def read_key(self) -> str:
         queue = Queue()
@@ -70,9 +78,8 @@ class Terminal:
     #     return queue.get()
 
     def write_ansi(self, text):
-        for line in text.split("\n"):
-            self.write_line(*to_formatted_text(ANSI(line)))
-            self.nl()
+        # every line, the last included, ends with a newline
+        self.write_lines(*ANSIFragments.split_lines(text), [])
 
     def write_ansi_raw(self, text):
         formatted_text = to_formatted_text(ANSI(text))
@@ -12,7 +12,29 @@ from prompt_toolkit.layout import Window, UIControl, ScrollbarMargin, UIContent
 from prompt_toolkit.layout.screen import Point
 from prompt_toolkit.mouse_events import MouseEventType
 
-from tspace.client.twbuffer import TwBuffer
+from tspace.client.twbuffer import DEFAULT_SCROLLBACK, TwBuffer
+
+
+class _BufferContent(UIContent):
+    """
+    Works out line heights from the widths the buffer already keeps, instead of
+    joining and measuring each line's text every render
+    """
+
+    def __init__(self, buffer: TwBuffer, **kwargs):
+        super().__init__(
+            get_line=buffer.get_line, line_count=buffer.line_count, **kwargs
+        )
+        self.buffer = buffer
+
+    def get_height_for_line(self, lineno, width, get_line_prefix, slice_stop=None):
+        if get_line_prefix or slice_stop is not None:
+            return super().get_height_for_line(
+                lineno, width, get_line_prefix, slice_stop
+            )
+        if width == 0:
+            return 10**8
+        return max(1, -(-self.buffer.get_line_width(lineno) // width))
 
 
 class TerminalTextArea(UIControl):
@@ -72,6 +94,7 @@ class TerminalTextArea(UIControl):
     Other attributes:
 
     :param search_field: An optional `SearchToolbar` object.
+    :param scrollback: How many lines to keep before dropping the oldest.
     """
 
     def __init__(
@@ -100,11 +123,12 @@ class TerminalTextArea(UIControl):
         preview_search=True,
         prompt="",
         input_processors=None,
+        scrollback=DEFAULT_SCROLLBACK,
     ):
 
         # Writeable attributes.
 
-        self.buffer = TwBuffer()
+        self.buffer = TwBuffer(scrollback)
 
         class MyMargin(Margin):
             def get_width(self, get_ui_content):
@@ -198,9 +222,8 @@ class TerminalTextArea(UIControl):
         return True
 
     def create_content(self, width, height):
-        return UIContent(
-            get_line=self.buffer.get_line,
-            line_count=self.buffer.line_count,
+        return _BufferContent(
+            self.buffer,
             cursor_position=self.buffer.cursor_position,
             show_cursor=self.show_cursor,
         )
@@ -0,0 +1,51 @@
+from prompt_toolkit import ANSI
+from prompt_toolkit.formatted_text import to_formatted_text
+
+from tspace.client.ansi import ANSIFragments
+
+
+def test_matches_prompt_toolkit_styles_in_merged_runs():
+    line = (
+        "\x1b[1;31mBu\x1b[0m\x1b[32mying\x1b[39m \x1b[38;5;200m42\x1b[48;2;1;2;3m%"
+        "\x1b[22;4m\x1b[2C!\x1b[m plain"
+    )
+    expected = []
+    for style, text in to_formatted_text(ANSI(line)):
+        if expected and expected[-1][0] == style:
+            expected[-1] = (style, expected[-1][1] + text)
+        else:
+            expected.append((style, text))
+
+    assert ANSIFragments.split_lines(line) == [expected]
+
+
+def test_sequences_split_across_chunks():
+    fragments = ANSIFragments()
+    for chunk in ("ab\x1b", "[3", "1mc", "d\nef\x1b[0", "m", "g"):
+        fragments.feed(chunk)
+
+    assert fragments.lines == [
+        [("", "ab"), ("ansired", "cd")],
+        [("ansired", "ef"), ("", "g")],
+    ]
+
+
+def test_long_sequence_split_across_chunks():
+    fragments = ANSIFragments()
+    sequence = "\x1b[" + "0;" * 30 + "31m"
+    fragments.feed("a" * 40 + sequence[:50])
+    fragments.feed(sequence[50:] + "b")
+
+    assert fragments.lines == [[("", "a" * 40), ("ansired", "b")]]
+
+
+def test_lone_escape_keeps_the_line_break_after_it():
+    assert ANSIFragments.split_lines("a\x1b\nb\x1bxc") == [[("", "a")], [("", "bc")]]
+
+
+def test_other_sequences_are_dropped():
+    assert ANSIFragments.split_lines("a\x1b[?25lb\x1b[2Jc\x1b[1 qd") == [[("", "abcd")]]
+    fragments = ANSIFragments()
+    fragments.feed("a\x1b[?2")
+    fragments.feed("5hb")
+    assert fragments.lines == [[("", "ab")]]
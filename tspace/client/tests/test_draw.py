@@ -0,0 +1,77 @@
+import asyncio
+
+import numpy as np
+import pytest
+from PIL import Image
+from prompt_toolkit import ANSI
+from prompt_toolkit.formatted_text import to_formatted_text
+
+from tspace.client.ui import draw
+from tspace.client.ui.draw import (
+    BLANK,
+    CELLS,
+    STAR_CELLS,
+    C,
+    FrameCache,
+    FramesKey,
+    G,
+    _render_image,
+    rgb,
+    to_fragments,
+)
+
+
+def test_image_drawn_over_background_in_merged_runs():
+    bg = np.full((2, 5), BLANK)
+    bg[1, 4] = STAR_CELLS
+    img = Image.new("RGBA", (5, 2), (0, 0, 0, 0))
+    for x in (1, 2, 3):
+        img.putpixel((x, 0), rgb(C.CYAN, G.BLOCK))
+    img.putpixel((3, 1), rgb(C.CYAN, G.LIGHT))
+
+    lines = to_fragments(_render_image(bg, img))
+
+    cyan = to_formatted_text(ANSI(f"{C.CYAN.value}x"))[0][0]
+    assert lines[0] == [("", " "), (cyan, "███"), ("", " ")]
+    assert lines[1] == [("", "   "), (cyan, "░"), CELLS[STAR_CELLS]]
+
+
+def test_frame_cache_drops_least_recently_used():
+    async def run():
+        cache = FrameCache()
+        small = cache.request(FramesKey(20, 10, 3, True, False))
+        await small.task
+        assert small.done and small.get(10) is small.frames[-1]
+        cache.max_bytes = cache.nbytes + 1
+
+        other = cache.request(FramesKey(20, 10, 3, False, True))
+        assert other.get(0) is None
+        assert cache.request(small.key) is small
+        # over the limit after its first frame, and used longest ago
+        with pytest.raises(asyncio.CancelledError):
+            await other.task
+
+        assert len(other.frames) == 1
+        assert len(cache) == 1 and cache.request(small.key) is small
+        assert cache.nbytes == small.nbytes
+
+    asyncio.run(run())
+
+
+def test_failed_render_is_kept_with_its_frames(monkeypatch):
+    def broken_frames(*key):
+        yield [[("", "x")]]
+        raise ValueError("broken")
+
+    monkeypatch.setattr(draw, "iter_frames", broken_frames)
+
+    async def run():
+        cache = FrameCache()
+        frames = cache.request(FramesKey(20, 10, 3, True, False))
+        await frames.task
+
+        assert isinstance(frames.error, ValueError)
+        assert frames.get(2) == [[("", "x")]]
+        assert cache.request(frames.key) is frames
+
+    asyncio.run(run())
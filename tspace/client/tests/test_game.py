@@ -0,0 +1,34 @@
+from tspace.client.game import Change, Game
+from tspace.client.models import GameConfig
+from tspace.common.models import GameConfigPublic, PlayerPublic, SectorPublic
+
+
+def test_updates_bump_versions_and_notify():
+    game = Game(
+        GameConfig(GameConfigPublic(id=1, name="Test", diameter=10, sectors_count=0))
+    )
+    changes = []
+    game.on_change(changes.append)
+
+    game.update_player(
+        PlayerPublic.model_construct(id=7, name="Jim", credits=100, ship=None)
+    )
+    game.update_sector(SectorPublic(id=1, warps=[2, 3], ports=[], ships=[], planets=[]))
+
+    assert changes == [
+        Change("player", 7, 1),
+        Change("sectors", 1, 2),
+        Change("sectors", 2, 3),
+        Change("sectors", 3, 4),
+    ]
+    assert game.version_of("sectors", 1) == 2
+    assert game.version_of("sectors") == 4
+    assert game.version_of("ports") == 0
+
+    # warps not seen yet are known only by their id
+    assert game.sectors[2].id == 2 and game.sectors[2].warps == []
+
+    game.update_sector(SectorPublic(id=2, warps=[1], ports=[], ships=[], planets=[]))
+    assert changes[-1] == Change("sectors", 2, 5)
+    assert game.version_of("sectors", 1) == 2
+    assert game.sectors[2].warps == [1]
@@ -0,0 +1,73 @@
+import asyncio
+
+from prompt_toolkit import Application
+from prompt_toolkit.input import create_pipe_input
+from prompt_toolkit.layout import Layout
+from prompt_toolkit.output import DummyOutput
+
+from tspace.client.redraw import RedrawScheduler
+from tspace.client.ui.starfield import Starfield
+
+
+def test_idle_screen_is_not_redrawn():
+    async def run():
+        with create_pipe_input() as pipe:
+            starfield = Starfield(fps=20)
+            app = Application(
+                layout=Layout(starfield.window), input=pipe, output=DummyOutput()
+            )
+            redraws = 0
+
+            def count(_):
+                nonlocal redraws
+                redraws += 1
+
+            app.after_render += count
+            task = asyncio.create_task(app.run_async())
+
+            # the animation asks for its own frames
+            await asyncio.sleep(0.5)
+            animated = redraws
+            starfield.paused = True
+            await asyncio.sleep(0.1)
+
+            idle = redraws
+            await asyncio.sleep(0.5)
+            idle = redraws - idle
+
+            app.exit()
+            await task
+        return animated, idle
+
+    animated, idle = asyncio.run(run())
+    assert animated >= 4
+    assert idle == 0
+
+
+def test_frames_are_kept_per_owner_until_due():
+    class App:
+        is_running = True
+        invalidated = 0
+
+        def invalidate(self):
+            self.invalidated += 1
+
+    class Owner:
+        pass
+
+    async def run():
+        app = App()
+        scheduler = RedrawScheduler(app)
+        kept, dropped = Owner(), Owner()
+        scheduler.request_frame(kept, 0.01)
+        scheduler.request_frame(kept, 0.01)
+        scheduler.request_frame(dropped, 0.01)
+        assert len(scheduler._pending) == 2
+
+        del dropped
+        assert len(scheduler._pending) == 1
+        await asyncio.sleep(0.05)
+        assert len(scheduler._pending) == 0
+        return app.invalidated
+
+    assert asyncio.run(run()) == 1
@@ -0,0 +1,73 @@
+import asyncio
+import json
+from functools import partial
+
+from prompt_toolkit.application import DummyApplication
+
+from tspace.client.game import Game
+from tspace.client.models import GameConfig as ClientGameConfig
+from tspace.client.scene.game import TerminalScene
+from tspace.client.ui.stat_frame import Stat, StatFrame
+from tspace.common.models import GameConfigPublic, PlayerPublic, TypeCatalogPublic
+from tspace.server.config import GameConfig
+from tspace.server.server import Server
+
+
+async def enter_game() -> Game:
+    server = Server(GameConfig(1, "Test", diameter=10, seed="test"))
+    sent: list[str] = []
+
+    async def callback(text: str):
+        sent.append(text)
+
+    await server.join("Trader", callback)
+    server.game.scheduler.stop()
+
+    params = json.loads(sent[0])["params"]
+    game = Game(ClientGameConfig(GameConfigPublic(**params["config"])))
+    game.update_catalog(TypeCatalogPublic(**params["catalog"]))
+    game.update_player(PlayerPublic(**params["player"]))
+    return game
+
+
+def test_warps_label_rebuilt_only_on_change():
+    scene = TerminalScene(DummyApplication(), writer=None)
+    has_ship = lambda: scene.session.game is not None
+    assert scene.get_warps_label(has_ship) == []
+
+    game = scene.session.game = asyncio.run(enter_game())
+    label = scene.get_warps_label(has_ship)
+    assert label and scene.get_warps_label(has_ship) is label
+
+    # changes to what the map doesn't show leave it be
+    game.dock(None)
+    assert scene.get_warps_label(has_ship) is label
+
+    warp = game.player.sector.warps[0]
+    game.enter_sector(warp)
+    moved = scene.get_warps_label(has_ship)
+    assert moved is not label and moved[0] == ("cyan", str(warp))
+    assert scene.get_warps_label(has_ship) is moved
+
+
+def test_stat_frames_read_again_on_change():
+    scene = TerminalScene(DummyApplication(), writer=None)
+    game = scene.session.game = asyncio.run(enter_game())
+    reads = 0
+
+    def credits():
+        nonlocal reads
+        reads += 1
+        return game.player.credits
+
+    frame = StatFrame(
+        title="Player",
+        condition=lambda: True,
+        stats=[Stat(title="Credits", callable=credits)],
+        version=partial(scene._versions, "player"),
+    )
+    label = frame.get_label()
+    assert frame.get_label() is label and reads == 1
+
+    game.dock(None)
+    assert frame.get_label() == label and reads == 2
@@ -0,0 +1,26 @@
+import numpy as np
+
+from tspace.client.ui.starfield import Starfield
+
+
+def test_only_rows_with_stars_are_built():
+    starfield = Starfield(num_stars=2, max_depth=12)
+    # so the star sent back doesn't land on the row checked below
+    starfield._rng = np.random.default_rng(1)
+    starfield.speed = 0.03
+    starfield.x[:] = [2, 0]
+    starfield.y[:] = [-1, 0]
+    starfield.z[:] = [6.03, 0.01]
+
+    content = starfield.create_content(120, 60)
+
+    # halfway in, projected right of and above the middle
+    line = content.get_line(8)
+    assert line[102] == ("#808080", "*")
+    assert line.count(("", " ")) == 119
+
+    # the other star went past the screen and starts again at the back
+    assert starfield.z[1] == 12
+    blank = content.get_line(0)
+    assert blank == [("", " ")] * 120
+    assert sum(content.get_line(y) is blank for y in range(60)) >= 58
@@ -0,0 +1,58 @@
+from prompt_toolkit.layout.screen import Point
+
+from tspace.client.twbuffer import TwBuffer
+
+
+def test_scrollback_drops_oldest_lines():
+    buffer = TwBuffer(max_lines=5)
+    for i in range(10):
+        buffer.insert_after([("", f"line {i}")], [])
+
+    assert buffer.line_count == 5
+    assert buffer.get_line(0) == [("", "line 6"), ("", " ")]
+    assert buffer.get_line(4) == [("", " ")]
+    assert buffer.cursor == Point(x=0, y=4)
+    # lines are handed out as stored, not rebuilt per call
+    assert buffer.get_line(1) is buffer.get_line(1)
+
+    # a cursor kept across a write stays on the same line as older ones go
+    buffer.insert_after([("", "more")], [], [], cursor_pos=Point(x=2, y=3))
+    assert buffer.cursor == Point(x=2, y=1)
+    assert buffer.get_line(1) == [("", "line 9"), ("", " ")]
+
+
+def test_line_sizes_follow_edits():
+    buffer = TwBuffer()
+    buffer.insert_after([("", "ab"), ("red", "\u4e16\u257e")])
+    # the wide glyph takes two columns but is one character for the cursor
+    assert buffer.get_line_length(0) == 5
+    assert buffer.get_line_width(0) == 6
+    assert buffer.cursor == Point(x=4, y=0)
+
+    buffer.backspace(3)
+    assert buffer.get_line(0) == [("", "a"), ("", " ")]
+    assert (buffer.get_line_length(0), buffer.get_line_width(0)) == (2, 2)
+    assert buffer.cursor == Point(x=1, y=0)
+
+    buffer.backspace(5)
+    assert buffer.get_line(0) == [("", " ")]
+    assert buffer.cursor == Point(x=0, y=0)
+
+
+def test_batch_notifies_once():
+    buffer = TwBuffer()
+    changes = []
+    buffer.on_change(lambda: changes.append(buffer.line_count))
+
+    with buffer.batch():
+        buffer.insert_after([("", "a")], [])
+        with buffer.batch():
+            buffer.insert_after([("", "b")], [])
+        assert changes == []
+        buffer.insert_after([("", "c")], [])
+
+    assert changes == [4]
+
+    with buffer.batch():
+        pass
+    assert changes == [4]
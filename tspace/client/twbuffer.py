@@ -1,76 +1,157 @@
+from collections import deque
+from contextlib import contextmanager
 from enum import Enum, auto
 from sqlite3 import Cursor
 from typing import Callable, Generator
 from typing import Tuple, List, Sequence
 
 from prompt_toolkit.layout.screen import Point
+from prompt_toolkit.utils import get_cwidth
 
 from tspace.client.logging import log
 
 
+# lines kept before the oldest are dropped
+DEFAULT_SCROLLBACK = 10_000
+
+# every line ends in a blank cell for the cursor to sit on at the end of it
+_CURSOR_CELL = ("", " ")
+_EMPTY_LINE = [_CURSOR_CELL]
+
+
+def _width(text: str) -> int:
+    # plain ascii is one column a character, and get_cwidth would cache every
+    # distinct string it's given
+    if text.isascii() and text.isprintable():
+        return len(text)
+    return get_cwidth(text)
+
+
 class TwBuffer:
-    def __init__(self):
-        self.buffer: List[List[Tuple[str, str]]] = [[]]
+    """
+    Lines of formatted text fragments, the oldest dropped once there are more
+    than max_lines.
+
+    Lines are stored with their trailing cursor cell, so get_line hands out the
+    stored list itself rather than building one per render. Callers must not
+    change what it returns.
+
+    Each line's length in characters, which is what the cursor counts in, and
+    its display width in terminal columns are kept alongside it, so neither
+    needs the fragments walked again.
+    """
+
+    def __init__(self, max_lines: int | None = DEFAULT_SCROLLBACK):
+        self.buffer: deque[List[Tuple[str, str]]] = deque([[_CURSOR_CELL]], max_lines)
+        self.lengths: deque[int] = deque([1], max_lines)
+        self.widths: deque[int] = deque([1], max_lines)
         self.cursor = Point(x=0, y=0)
 
         self.input_listeners: List[Callable[[str], None]] = []
         self.change_listeners: List[Callable[[], None]] = []
+        self._batch_depth = 0
+        self._changed = False
 
     def insert_after(
         self, *text: Sequence[Tuple[str, str]], cursor_pos: Point | None = None
     ):
-        if not isinstance(text, (Tuple, List)):
+        if not isinstance(text, (tuple, list)):
             raise ValueError()
 
-        if any(isinstance(x, Tuple) for x in text):
+        if any(isinstance(x, tuple) for x in text):
             raise ValueError()
 
         str_buffer = []
+        lengths = []
+        widths = []
         for line in text:
             line_buffer = []
+            length = width = 0
             for frag in line:
-                if not isinstance(frag, Tuple):
+                if not isinstance(frag, tuple):
 
                     raise ValueError(f"Invalid fragment: {frag}")
                 if not isinstance(frag[1], str):
-                    line_buffer.append((frag[0], str(frag[1])))
-                else:
-                    line_buffer.append(frag)
+                    frag = (frag[0], str(frag[1]))
+                line_buffer.append(frag)
+                length += len(frag[1])
+                width += _width(frag[1])
             str_buffer.append(line_buffer)
+            lengths.append(length)
+            widths.append(width)
         text = str_buffer
 
         if text and text[0]:
             # old_line = self.buffer[self.cursor.y]
+            y = self.cursor.y
             if self.cursor.x == 0:
-                self.buffer[self.cursor.y] = text[0]
+                self.buffer[y] = text[0] + [_CURSOR_CELL]
+                self.lengths[y] = lengths[0] + 1
+                self.widths[y] = widths[0] + 1
             else:
-                self.buffer[self.cursor.y] += text[0]
+                self.buffer[y][-1:-1] = text[0]
+                self.lengths[y] += lengths[0]
+                self.widths[y] += widths[0]
 
+        dropped = 0
         if len(text) > 1:
-            self.buffer += text[1:]
+            line_count = len(self.buffer) + len(text) - 1
+            self.buffer.extend(line + [_CURSOR_CELL] for line in text[1:])
+            self.lengths.extend(length + 1 for length in lengths[1:])
+            self.widths.extend(width + 1 for width in widths[1:])
+            dropped = line_count - len(self.buffer)
 
         if cursor_pos:
-            self.cursor = cursor_pos
+            # keep pointing at the same line when older ones were dropped
+            self.cursor = Point(x=cursor_pos.x, y=max(0, cursor_pos.y - dropped))
         else:
             self._set_cursor_to_buffer_end()
 
+        self._notify_change()
+
+    @contextmanager
+    def batch(self):
+        """
+        Holds back change notifications until the block ends, then sends one if
+        anything was written, so printing a whole table redraws the screen once.
+        Batches can be nested.
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth and self._changed:
+                self._notify_change()
+
+    def _notify_change(self):
+        if self._batch_depth:
+            self._changed = True
+            return
+        self._changed = False
         for listener in self.change_listeners:
             listener()
 
     def _set_cursor_to_buffer_end(self):
-        new_y = len(self.buffer) - 1
-        new_x = self.get_line_length(new_y) - 1
-        self.cursor = Point(x=new_x, y=new_y)
+        self.cursor = Point(x=self.lengths[-1] - 1, y=len(self.buffer) - 1)
 
     def on_change(self, listener: Callable[[], None]):
         self.change_listeners.append(listener)
 
     def get_line(self, index: int) -> List[Tuple[str, str]]:
-        result = [] if index >= len(self.buffer) else self.buffer[index]
-        return result + [("", " ")]
+        return _EMPTY_LINE if index >= len(self.buffer) else self.buffer[index]
 
     def get_line_length(self, index: int) -> int:
-        return sum(len(x[1]) for x in self.get_line(index))
+        """
+        Characters in the line, including the cursor cell
+        """
+        return 1 if index >= len(self.buffer) else self.lengths[index]
+
+    def get_line_width(self, index: int) -> int:
+        """
+        Columns the line takes up on screen, including the cursor cell
+        """
+        return 1 if index >= len(self.buffer) else self.widths[index]
 
     @property
     def line_count(self) -> int:
@@ -83,8 +164,7 @@ class TwBuffer:
     @cursor_position.setter
     def cursor_position(self, value: Point):
         self.cursor = value
-        for listener in self.change_listeners:
-            listener()
+        self._notify_change()
 
     def on_key_press(self, txt: str):
         for listener in self.input_listeners:
@@ -92,18 +172,17 @@ class TwBuffer:
 
     def backspace(self, num_characters: int):
         line = self.buffer[-1]
-        if num_characters >= self.get_line_length(-1):
-            self.buffer[-1] = []
-        else:
-            while num_characters:
-                last = line[-1]
-                chars = last[1]
-                if len(chars) >= num_characters:
-                    num_characters = 0
-                    chars = chars[0:-num_characters]
-                else:
-                    num_characters -= len(chars)
-                    chars = ""
-                line[-1] = (last[0], chars)
+        # only walks back over the fragments being removed
+        while num_characters > 0 and len(line) > 1:
+            style, chars = line[-2]
+            if len(chars) > num_characters:
+                removed = chars[-num_characters:]
+                line[-2] = (style, chars[:-num_characters])
+            else:
+                removed = chars
+                del line[-2]
+            num_characters -= len(removed)
+            self.lengths[-1] -= len(removed)
+            self.widths[-1] -= _width(removed)
 
         self._set_cursor_to_buffer_end()
@@ -1,17 +1,22 @@
-import random
-from copy import deepcopy
+import asyncio
+import sys
+from collections import OrderedDict
 from enum import Enum
 from functools import cache
+from typing import Iterable, Iterator, NamedTuple
 
+import numpy as np
 from PIL import Image, ImageDraw
-from prompt_toolkit import ANSI
+from prompt_toolkit import print_formatted_text
 from prompt_toolkit.application import get_app
-from prompt_toolkit.formatted_text import to_formatted_text
+from prompt_toolkit.formatted_text import FormattedText
 from prompt_toolkit.layout import UIContent
 from prompt_toolkit.layout import UIControl
 from prompt_toolkit.layout import Window
 
+from tspace.client.ansi import ANSIFragments
 from tspace.client.logging import log
+from tspace.client.redraw import request_frame
 
 
 class C(Enum):
@@ -47,23 +52,48 @@ TRANS = (0, 0, 0, 0)
 COLORS = [c for c in C]
 GLYPHS = [g for g in G]
 
+# greys the background stars are drawn in, 256 is past the palette and so keeps
+# the default colour
+STAR_GRADIENTS = range(239, 257)
 
-@cache
-def rgb(c: C, g: G = G.BLOCK) -> tuple[int, int, int, int]:
-    return COLORS.index(c), GLYPHS.index(g), 255, 255
 
+def _style(code: str) -> str:
+    return ANSIFragments.split_lines(f"{code} ")[0][0][0]
 
-@cache
-def from_rgb(value: tuple[int, int, int, int]) -> tuple[C, G]:
-    return COLORS[value[0]], GLYPHS[value[1]]
+
+# Frames are worked on as arrays of indexes into CELLS, each a (style, text)
+# fragment one character wide: a blank, the background stars, then every
+# colour and glyph an image can be drawn in.
+BLANK = 0
+STAR_CELLS = 1
+IMAGE_CELLS = STAR_CELLS + len(STAR_GRADIENTS)
+CELLS = (
+    [("", G.SPACE.value)]
+    + [(_style(f"\033[38;5;{gradient}m"), G.DOT.value) for gradient in STAR_GRADIENTS]
+    + [(_style(c.value), g.value) for c in COLORS for g in GLYPHS]
+)
+STYLES = sorted({style for style, _ in CELLS})
+CELL_STYLES = np.array([STYLES.index(style) for style, _ in CELLS])
+CELL_TEXT = np.array([text for _, text in CELLS], dtype="<U1")
+# the encoding the string data of a "<U1" array is in
+_UTF32 = "utf-32-le" if sys.byteorder == "little" else "utf-32-be"
+
+# the lines of fragments making up one frame of an animation
+Frame = list[list[tuple[str, str]]]
+
+# enough for a few full screen approaches at 240x80
+FRAME_CACHE_BYTES = 32 * 1024 * 1024
 
 
 @cache
-def gen_frames(
+def rgb(c: C, g: G = G.BLOCK) -> tuple[int, int, int, int]:
+    return COLORS.index(c), GLYPHS.index(g), 255, 255
+
+
+def iter_frames(
     width: int, height: int, steps: int, port: bool, planet: bool
-) -> list[list[str]]:
+) -> Iterator[Frame]:
     log.info(f"Rendering w:{width} h:{height} steps:{steps}")
-    frames = []
     bg = stars(width, height)
     max_scale = 1.0
     min_scale = 0.2
@@ -81,10 +111,154 @@ def gen_frames(
         else:
             result = g
         scale = min(max_scale, scale + speed)
-        frames.append(
-            [to_formatted_text(ANSI("".join(line_parts))) for line_parts in result]
-        )
-    return frames
+        yield to_fragments(result)
+
+
+def gen_frames(
+    width: int, height: int, steps: int, port: bool, planet: bool
+) -> list[Frame]:
+    return list(iter_frames(width, height, steps, port, planet))
+
+
+def to_fragments(cells: np.ndarray) -> Frame:
+    """
+    Turns an array of cells into lines of fragments, with one fragment per run
+    of cells in the same style
+    """
+    height, width = cells.shape
+    styles = CELL_STYLES[cells]
+    text = CELL_TEXT[cells].tobytes().decode(_UTF32)
+
+    # a run starts at each line and wherever the style changes
+    run_starts = np.ones(cells.shape, dtype=bool)
+    np.not_equal(styles[:, 1:], styles[:, :-1], out=run_starts[:, 1:])
+    starts = np.flatnonzero(run_starts)
+    ends = np.append(starts[1:], cells.size)
+
+    lines: Frame = [[] for _ in range(height)]
+    for start, end, style in zip(
+        starts.tolist(), ends.tolist(), styles.flat[starts].tolist()
+    ):
+        lines[start // width].append((STYLES[style], text[start:end]))
+    return lines
+
+
+class FramesKey(NamedTuple):
+    width: int
+    height: int
+    steps: int
+    port: bool
+    planet: bool
+
+
+class FrameSet:
+    """
+    The frames of one approach animation, filled in as they're rendered
+    """
+
+    def __init__(self, key: FramesKey):
+        self.key = key
+        self.frames: list[Frame] = []
+        self.nbytes = 0
+        self.task: asyncio.Task | None = None
+        # set when rendering failed, the frames rendered before are kept
+        self.error: Exception | None = None
+
+    @property
+    def done(self) -> bool:
+        return len(self.frames) == self.key.steps
+
+    def get(self, index: int) -> Frame | None:
+        """
+        The frame at the index, or the latest one rendered if it isn't ready yet
+        """
+        if not self.frames:
+            return None
+        return self.frames[min(index, len(self.frames) - 1)]
+
+
+class FrameCache:
+    """
+    Approach animations by size and contents, least recently used first.
+
+    Frames are rendered one at a time in a worker thread, so an animation can
+    start showing as soon as its first frame is ready and the UI keeps running
+    while the rest come in. Once the frames held take up more than max_bytes the
+    least recently used animations are dropped, the one asked for last is
+    always kept.
+    """
+
+    def __init__(self, max_bytes: int = FRAME_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._sets: OrderedDict[FramesKey, FrameSet] = OrderedDict()
+
+    def __len__(self):
+        return len(self._sets)
+
+    def request(self, key: FramesKey) -> FrameSet:
+        """
+        The frames for the key, rendering them in the background if they
+        aren't cached. Needs a running event loop.
+        """
+        frame_set = self._sets.get(key)
+        if frame_set is not None:
+            self._sets.move_to_end(key)
+            return frame_set
+
+        frame_set = self._sets[key] = FrameSet(key)
+        frame_set.task = asyncio.create_task(self._render(frame_set))
+        return frame_set
+
+    def prefetch(self, keys: Iterable[FramesKey]):
+        """
+        Starts rendering any of the animations not cached yet
+        """
+        for key in keys:
+            if key not in self._sets:
+                self.request(key)
+
+    def clear(self):
+        for frame_set in self._sets.values():
+            frame_set.task.cancel()
+        self._sets.clear()
+        self.nbytes = 0
+
+    async def _render(self, frame_set: FrameSet):
+        frames = iter_frames(*frame_set.key)
+        while True:
+            try:
+                frame = await asyncio.to_thread(next, frames, None)
+            except Exception as e:
+                # kept in the cache, so it isn't rendered again on every redraw
+                log.exception(f"Failed rendering approach frames {frame_set.key}")
+                frame_set.error = e
+                return
+            if frame is None:
+                return
+            size = _frame_size(frame)
+            frame_set.frames.append(frame)
+            frame_set.nbytes += size
+            self.nbytes += size
+            self._evict()
+
+    def _evict(self):
+        while self.nbytes > self.max_bytes and len(self._sets) > 1:
+            _, frame_set = self._sets.popitem(last=False)
+            frame_set.task.cancel()
+            self.nbytes -= frame_set.nbytes
+
+
+def _frame_size(frame: Frame) -> int:
+    # styles are shared by every frame, only the text is counted
+    return sys.getsizeof(frame) + sum(
+        sys.getsizeof(line)
+        + sum(sys.getsizeof(fragment) + sys.getsizeof(fragment[1]) for fragment in line)
+        for line in frame
+    )
+
+
+approach_frames = FrameCache()
 
 
 class AnimatedPlanetApproach(UIControl):
@@ -92,7 +266,8 @@ class AnimatedPlanetApproach(UIControl):
         self.show_cursor = False
         self._port = port
         self._planet = planet
-        self.steps = secs * get_app().fps
+        self.fps = get_app().fps
+        self.steps = secs * self.fps
 
         self.window = Window(
             dont_extend_height=False,
@@ -102,15 +277,22 @@ class AnimatedPlanetApproach(UIControl):
         )
         self.frame = 0
 
-    @cache
-    def _stars(self, width: int, height: int):
-        return stars(width, height)
-
-    def next_frame(self, width: int, height: int):
-        frames = gen_frames(width, height, self.steps, self._port, self._planet)
-        result = frames[self.frame]
-        self.frame = min(self.steps - 1, self.frame + 1)
-        return result
+    def next_frame(self, width: int, height: int) -> Frame:
+        frames = approach_frames.request(
+            FramesKey(width, height, self.steps, self._port, self._planet)
+        )
+        due = self.frame
+        result = frames.get(due)
+        # stay on a frame until it's been rendered and shown
+        rendered = due < len(frames.frames)
+        if rendered:
+            self.frame = min(self.steps - 1, self.frame + 1)
+        elif frames.error is not None:
+            # the last frame there is stays up
+            return result or []
+        if due < self.steps - 1 or not rendered:
+            request_frame(self, 1 / self.fps)
+        return result or []
 
     def create_content(self, width, height):
         screen = self.next_frame(width, height)
@@ -131,26 +313,20 @@ class AnimatedPlanetApproach(UIControl):
         return self.window
 
 
-def stars(width: int, height: int) -> list[list[str]]:
-    bg = []
-    for y in range(height):
-        bg.append([])
-        for x in range(width):
-            if random.randint(0, 20) == 1:
-                gradient = random.randint(239, 256)
-                bg[y].append(f"\033[38;5;{gradient}m.{C.RESET.value}")
-            else:
-                bg[y].append(" ")
-
-    return bg
+def stars(width: int, height: int) -> np.ndarray:
+    rng = np.random.default_rng()
+    gradients = rng.integers(0, len(STAR_GRADIENTS), size=(height, width))
+    return np.where(
+        rng.integers(0, 21, size=(height, width)) == 1, STAR_CELLS + gradients, BLANK
+    )
 
 
 def gen_planet(
     scale: float,
     size: tuple[int, int],
     center_mod: tuple[float, float] = (0.5, 0.5),
-    bg: list[list[str]] | None = None,
-) -> list[list[str]]:
+    bg: np.ndarray | None = None,
+) -> np.ndarray:
 
     # log.info(f"x: {width}, y: {height}, distance: {distance}")
     width, height = size
@@ -179,8 +355,8 @@ def gen_port(
     scale: float,
     size: tuple[int, int],
     center_mod: tuple[float, float] = (0.5, 0.5),
-    bg: list[list[str]] | None = None,
-) -> list[list[str]]:
+    bg: np.ndarray | None = None,
+) -> np.ndarray:
 
     # log.info(f"x: {width}, y: {height}, distance: {distance}")
     width, height = size
@@ -266,29 +442,16 @@ def gen_port(
     #     print()
 
 
-def _render_image(bg, img: Image.Image) -> list[list[str]]:
-    ascii_img = []
-    for y in range(img.height):
-        ascii_img.append([])
-        for x in range(img.width):
-            img_c = img.getpixel((x, y))
-            if img_c == TRANS:
-                ascii_img[y].append(" " if bg is None else bg[y][x])
-                continue
-
-            c, g = from_rgb(img_c)
-            ascii_img[y].append(f"{c.value}{g.value}{C.RESET.value}")
-    return ascii_img
-
+def _render_image(bg: np.ndarray | None, img: Image.Image) -> np.ndarray:
+    pixels = np.asarray(img)
+    # a drawn pixel holds its colour and glyph indexes, see rgb()
+    indexes = pixels[..., :2].astype(np.intp)
+    cells = IMAGE_CELLS + indexes[..., 0] * len(GLYPHS) + indexes[..., 1]
+    return np.where(pixels[..., 3] != 0, cells, BLANK if bg is None else bg)
 
-def merge(bg: list[list[str]], fg: list[list[str]]) -> list[list[str]]:
 
-    result = deepcopy(bg)
-    for y in range(len(bg)):
-        for x in range(len(bg[y])):
-            cur = fg[y][x]
-            result[y][x] = bg[y][x] if cur == " " else cur
-    return result
+def merge(bg: np.ndarray, fg: np.ndarray) -> np.ndarray:
+    return np.where(fg == BLANK, bg, fg)
 
 
 def sizes(func, w: int, h: int):
@@ -296,10 +459,8 @@ def sizes(func, w: int, h: int):
 
     for scale in (0.1, 0.5, 1):
         g = func(scale, (w, h), (0.5, 0.5), bg=bg)
-        for y in range(len(g)):
-            for x in range(len(g[y])):
-                print(g[y][x], end="")
-            print()
+        for line in to_fragments(g):
+            print_formatted_text(FormattedText(line))
 
 
 def comp(w: int, h: int):
@@ -308,10 +469,8 @@ def comp(w: int, h: int):
     for scale in (0.1, 0.5, 1):
         g = gen_planet(1 + 0.2 * scale, (w, h), (0.5, 1.3), bg=bg)
         g = gen_port(scale, (w, h), (0.6, 0.6), bg=g)
-        for y in range(len(g)):
-            for x in range(len(g[y])):
-                print(g[y][x], end="")
-            print()
+        for line in to_fragments(g):
+            print_formatted_text(FormattedText(line))
 
 
 if __name__ == "__main__":
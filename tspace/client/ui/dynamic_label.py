@@ -14,8 +14,9 @@ class DynamicLabel(object):
     """
     Widget that displays the given text. It is not editable or focusable.
 
-    :param text: The text to be displayed. (This can be multiline. This can be
-        formatted text as well.)
+    :param text_func: Returns the text to be displayed. (This can be multiline.
+        This can be formatted text as well.) The width is only measured again
+        once it returns a different object.
     :param style: A style string.
     :param width: When given, use this width, rather than calculating it from
         the text size.
@@ -30,16 +31,17 @@ class DynamicLabel(object):
         dont_extend_width=False,
     ):
         self.text_func = text_func
+        # the width of the last text, while text_func keeps returning it
+        self._measured = None
+        self._measured_width = D(preferred=0)
 
         def get_width():
             if width is None:
-                text_fragments = to_formatted_text(self.text_func())
-                text = fragment_list_to_text(text_fragments)
-                if text:
-                    longest_line = max(get_cwidth(line) for line in text.splitlines())
-                else:
-                    return D(preferred=0)
-                return D(preferred=longest_line)
+                text = self.text_func()
+                if text is not self._measured:
+                    self._measured_width = self._measure(text)
+                    self._measured = text
+                return self._measured_width
             else:
                 return width
 
@@ -53,5 +55,14 @@ class DynamicLabel(object):
             dont_extend_width=dont_extend_width,
         )
 
+    @staticmethod
+    def _measure(text: Union[str, FormattedText]) -> D:
+        text = fragment_list_to_text(to_formatted_text(text))
+        if text:
+            longest_line = max(get_cwidth(line) for line in text.splitlines())
+        else:
+            return D(preferred=0)
+        return D(preferred=longest_line)
+
     def __pt_container__(self):
         return self.window
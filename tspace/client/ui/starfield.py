@@ -1,21 +1,26 @@
-import asyncio
-from random import randrange
-
+import numpy as np
 from prompt_toolkit.application import get_app
 from prompt_toolkit.key_binding import KeyBindings
 from prompt_toolkit.layout import UIContent
 from prompt_toolkit.layout import UIControl
 from prompt_toolkit.layout import Window
 
+from tspace.client.redraw import request_frame
+
+# the glyph a star is drawn with as it gets nearer
+_GLYPHS = (".", "*", "o", "\u26AB")
+_GREYS = [f"#{shade:02x}{shade:02x}{shade:02x}" for shade in range(256)]
+
 
 class Starfield(UIControl):
     """
     Based on http://codentronix.com/2011/05/28/3d-starfield-made-using-python-and-pygame/
     """
 
-    def __init__(self, num_stars: int = 256, max_depth: int = 12):
+    def __init__(self, num_stars: int = 256, max_depth: int = 12, fps: int = 15):
         self.num_stars = num_stars
         self.max_depth = max_depth
+        self.fps = fps
 
         self.key_bindings = KeyBindings()
         self.show_cursor = False
@@ -26,6 +31,11 @@ class Starfield(UIControl):
             content=self,
             style="bg:black",
         )
+        self._rng = np.random.default_rng()
+        # the row handed out for every line without a star
+        self._blank_row: list[tuple[str, str]] | None = None
+        self._rows: dict[int, list[tuple[str, str]]] = {}
+        self._size: tuple[int, int] | None = None
         self.init_stars()
         self.speed = 0.03
         self.paused = False
@@ -35,79 +45,68 @@ class Starfield(UIControl):
 
     def init_stars(self):
         """Create the starfield"""
-        self.stars = []
-        for i in range(self.num_stars):
-            # A star is represented as a list with this format: [X,Y,Z]
-            star = [randrange(-5, 5), randrange(-5, 5), randrange(1, self.max_depth)]
-            self.stars.append(star)
-
-    def move_stars(self, width, height):
-        """Move and draw the stars"""
-        origin_x = width / 2
-        origin_y = height / 2
-
-        screen = [None] * height
-        for y in range(height):
-            row = [("", " ")] * width
-            screen[y] = row
-
-        for star in self.stars:
-            # The Z component is decreased on each frame.
-            star[2] -= self.speed
-
-            # If the star has past the screen (I mean Z<=0) then we
-            # reposition it far away from the screen (Z=max_depth)
-            # with random X and Y coordinates.
-            if star[2] <= 0:
-                star[0] = randrange(-5, 5)
-                star[1] = randrange(-5, 5)
-                star[2] = self.max_depth
-
-            # Convert the 3D coordinates to 2D using perspective projection.
-            k = 128.0 / star[2]
-            x = int(star[0] * k + origin_x)
-            y = int(star[1] * k + origin_y)
-
-            if 0 <= x < width and 0 <= y < height:
-                size = (1 - float(star[2]) / self.max_depth) * 5
-                shade = (1 - float(star[2]) / self.max_depth) * 255
-                # print(f"star {id}: {x},{y}")
-
-                hex_part = hex(round(shade))[2:]
-                if len(hex_part) == 1:
-                    hex_part = f"0{hex_part}"
-
-                hex_shade = hex_part * 3
-
-                dot = "."
-                if size > 3.5:
-                    parts = []
-                    for _ in range(3):
-                        val = hex(randrange(0, 255))[2:]
-                        if len(val) == 1:
-                            parts.append(f"0{val}")
-                        else:
-                            parts.append(val)
-                    hex_shade = "".join(parts)
-                    # print(f"shade: {hex_shade}")
-                    dot = "\u26AB"
-                elif size > 3:
-                    dot = "o"
-                elif size > 2:
-                    dot = "*"
-                # print(f"size:{size}")
-
-                screen[y][x] = (f"#{hex_shade}", dot)
-                # self.screen.fill((shade, shade, shade), (x, y, size, size))
-
-        return screen
+        # star i is at (x[i], y[i], z[i])
+        self.x = self._rng.integers(-5, 5, self.num_stars).astype(float)
+        self.y = self._rng.integers(-5, 5, self.num_stars).astype(float)
+        self.z = self._rng.integers(1, self.max_depth, self.num_stars).astype(float)
+
+    def move_stars(self, width, height) -> dict[int, list[tuple[str, str]]]:
+        """
+        Move and draw the stars, returning the rows that have any by their y
+        """
+        # The Z component is decreased on each frame.
+        self.z -= self.speed
+
+        # If the star has past the screen (I mean Z<=0) then we
+        # reposition it far away from the screen (Z=max_depth)
+        # with random X and Y coordinates.
+        past = np.flatnonzero(self.z <= 0)
+        if len(past):
+            self.x[past] = self._rng.integers(-5, 5, len(past))
+            self.y[past] = self._rng.integers(-5, 5, len(past))
+            self.z[past] = self.max_depth
+
+        # Convert the 3D coordinates to 2D using perspective projection.
+        k = 128.0 / self.z
+        xs = (self.x * k + width / 2).astype(int)
+        ys = (self.y * k + height / 2).astype(int)
+        visible = np.flatnonzero((0 <= xs) & (xs < width) & (0 <= ys) & (ys < height))
+
+        closeness = 1 - self.z[visible] / self.max_depth
+        sizes = closeness * 5
+        shades = np.round(closeness * 255).astype(int)
+        glyphs = (sizes > 2).astype(int) + (sizes > 3) + (sizes > 3.5)
+        # the nearest stars twinkle in a random colour
+        colors = iter(
+            self._rng.integers(0, 255, (np.count_nonzero(glyphs == 3), 3)).tolist()
+        )
+
+        if self._blank_row is None or len(self._blank_row) != width:
+            self._blank_row = [("", " ")] * width
+        rows = {}
+        for x, y, shade, glyph in zip(
+            xs[visible].tolist(), ys[visible].tolist(), shades.tolist(), glyphs.tolist()
+        ):
+            row = rows.get(y)
+            if row is None:
+                row = rows[y] = self._blank_row.copy()
+            if glyph == 3:
+                row[x] = ("#{:02x}{:02x}{:02x}".format(*next(colors)), _GLYPHS[glyph])
+            else:
+                row[x] = (_GREYS[shade], _GLYPHS[glyph])
+        return rows
 
     def create_content(self, width, height):
-        screen = self.move_stars(width, height)
+        # a paused field stays as it is, unless it has to be drawn at a new size
+        if not self.paused or self._size != (width, height):
+            self._rows = self.move_stars(width, height)
+            self._size = (width, height)
+        if not self.paused:
+            request_frame(self, 1 / self.fps)
+        rows, blank_row = self._rows, self._blank_row
 
         def get_line(i):
-            result = screen[i]
-            return result
+            return rows.get(i, blank_row)
 
         return UIContent(get_line=get_line, line_count=height)  # Something very big.
 
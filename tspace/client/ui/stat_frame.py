@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import Any, Tuple, List, Callable
+from typing import Any, Tuple, List, Callable, Hashable
 
 from prompt_toolkit.formatted_text import FormattedText
 from prompt_toolkit.widgets import Frame
@@ -15,15 +15,39 @@ class Stat:
 
 
 class StatFrame(Frame):
+    """
+    A frame of titled values. Given a version, a callable returning anything
+    that changes whenever the values might, the values are only read again
+    once it does.
+    """
+
     def __init__(
-        self, title, condition: Callable[[], bool], stats: List[Stat], **kwargs
+        self,
+        title,
+        condition: Callable[[], bool],
+        stats: List[Stat],
+        version: Callable[[], Hashable] | None = None,
+        **kwargs,
     ):
         self.condition = condition
         self.stats = stats
+        self.version = version
+        self._key = None
+        self._label = FormattedText([])
         Frame.__init__(self, title=title, body=DynamicLabel(self.get_label), **kwargs)
 
     def get_label(self):
         render_values = self.condition()
+        if self.version is None:
+            return self._build_label(render_values)
+
+        key = (render_values, self.version() if render_values else None)
+        if key != self._key:
+            self._label = self._build_label(render_values)
+            self._key = key
+        return self._label
+
+    def _build_label(self, render_values: bool) -> FormattedText:
         fragments = []
         max_length = max(len(stat.title) for stat in self.stats if not stat.multiline)
         for stat in self.stats:
@@ -15,17 +15,22 @@ from prompt_toolkit.widgets import Dialog, Label, Box, Frame
 from tspace.client.logging import log
 from tspace.client.models import Sector
 from tspace.client.ui.button import Button
-from tspace.client.ui.draw import AnimatedPlanetApproach
+from tspace.client.ui.draw import AnimatedPlanetApproach, FramesKey, approach_frames
 from tspace.client.ui.starfield import Starfield
 
 
+# how long the approach to the next sector plays for
+APPROACH_SECS = 3
+
+
 def dyn_container():
     return getattr(dyn_container, "blah", None)
 
 
 class WarpDialog(Dialog):
-    def __init__(self, sector_id: int):
+    def __init__(self, sector_id: int, known_sector: Sector | None = None):
         self._dims = get_app().output.get_size()
+        self._prefetch_approach(known_sector)
         self._starfield = Starfield()
         self.body = HSplit(
             children=[self._starfield],
@@ -43,6 +48,27 @@ class WarpDialog(Dialog):
         self._sector_future = Future()
         self.future = Future()
 
+    def _prefetch_approach(self, sector: Sector | None):
+        """
+        Starts rendering the approach to the next sector while the warp plays
+        out, for what's known to be there or else anything that could be
+        """
+        if sector is not None:
+            contents = [(bool(sector.ports), bool(sector.planets))]
+        else:
+            contents = [(True, True), (True, False), (False, True)]
+        approach_frames.prefetch(
+            FramesKey(
+                int(self._dims.columns / 2),
+                int(self._dims.rows / 2),
+                APPROACH_SECS * get_app().fps,
+                port,
+                planet,
+            )
+            for port, planet in contents
+            if port or planet
+        )
+
     def set_next_sector(self, sector: Sector):
         self._sector_future.set_result(sector)
 
@@ -63,7 +89,7 @@ class WarpDialog(Dialog):
             self.body = HSplit(
                 children=[
                     AnimatedPlanetApproach(
-                        3,
+                        APPROACH_SECS,
                         port=has_port,
                         planet=has_planet,
                     )
@@ -71,12 +97,14 @@ class WarpDialog(Dialog):
                 width=int(self._dims.columns / 2),
                 height=int(self._dims.rows / 2),
             )
+            get_app().invalidate()
             if has_something:
                 await asyncio.sleep(3)
             # for _ in range(3):
             #     self._starfield.speed /= 2.5
             #     await asyncio.sleep(0.5)
             self.ok_btn.disabled = False
+            get_app().invalidate()
 
         asyncio.create_task(speed_up())
         return await show_dialog_as_float(self)
@@ -91,6 +119,7 @@ async def show_dialog_as_float(dialog):
     app = get_app()
     root_container = app.layout.container
     root_container.floats.insert(0, float_)
+    app.invalidate()
 
     try:
         focused_before = app.layout.current_window
@@ -102,5 +131,6 @@ async def show_dialog_as_float(dialog):
 
     if float_ in root_container.floats:
         root_container.floats.remove(float_)
+        app.invalidate()
 
     return result
@@ -52,6 +52,9 @@ class EventBus:
     def remove_event_listener(self, target: Any):
         self._api.unregister_methods(target)
 
+    def fail_pending(self, error: Exception):
+        self._api.fail_pending(error)
+
     async def __call__(self, data: str):
         try:
             await self._api.on_incoming(data)
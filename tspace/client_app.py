@@ -1,5 +1,6 @@
 import argparse
 import asyncio
+import multiprocessing
 from tspace.client.app import TwApplication
 from tspace.client.logging import log
 
@@ -20,4 +21,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # for the worker process pool in frozen builds
+    multiprocessing.freeze_support()
     main()
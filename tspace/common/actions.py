@@ -1,4 +1,10 @@
-from tspace.common.models import SectorPublic, PlayerPublic, PortPublic, BattlePublic
+from tspace.common.models import (
+    SectorPublic,
+    PlayerPublic,
+    PortPublic,
+    BattlePublic,
+    GalaxyMapPublic,
+)
 
 
 class SectorActions:
@@ -11,6 +17,9 @@ class SectorActions:
     async def enter_battle(self, attacker_ship_id: int, target_ship_id: int) -> BattlePublic:
         pass
 
+    async def get_galaxy_map(self, radius: int) -> GalaxyMapPublic:
+        pass
+
 
 class PortActions:
     async def buy_from_port(
@@ -14,6 +14,10 @@ class InvalidActionError(TSpaceError):
     code = 32011
 
 
+class RateLimitedError(TSpaceError):
+    code = 32012
+
+
 def from_code(code: int, message: str | None) -> TSpaceError:
     mod = importlib.import_module("tspace.common.errors", package=None)
     for name, obj in inspect.getmembers(mod):
@@ -2,12 +2,19 @@ from tspace.common.models import (
     SectorPublic,
     TraderShipPublic,
     PlayerPublic,
-    GameConfigPublic, CombatantPublic, BattlePublic,
+    GameConfigPublic, CombatantPublic, BattlePublic, ShipTrafficPublic,
+    TypeCatalogPublic,
 )
 
 
 class ServerEvents:
-    async def on_game_enter(self, player: PlayerPublic, config: GameConfigPublic):
+    async def on_game_enter(
+        self,
+        player: PlayerPublic,
+        config: GameConfigPublic,
+        catalog: TypeCatalogPublic,
+        session_token: str | None = None,
+    ):
         pass
 
     async def on_ship_enter_sector(
@@ -20,5 +27,11 @@ class ServerEvents:
     ) -> None:
         pass
 
+    async def on_ship_traffic(self, traffic: ShipTrafficPublic) -> None:
+        pass
+
     async def on_battle_enter(self, battle: BattlePublic):
         pass
+
+    async def on_battle_exit(self, battle: BattlePublic, player: PlayerPublic):
+        pass
@@ -0,0 +1,121 @@
+import asyncio
+from bisect import bisect_left
+from typing import Iterable, Iterator
+
+# latency buckets in seconds, upper bounds inclusive as in prometheus
+DEFAULT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+)
+
+
+class Histogram:
+    """
+    Fixed bucket histogram. Everything runs on the event loop thread, so plain
+    integer updates need no locking, and observing a value allocates nothing.
+    """
+
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.bounds = bounds
+        # the extra count at the end is for values over the largest bound
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> Iterator[tuple[float, int]]:
+        total = 0
+        for bound, count in zip(self.bounds, self.counts):
+            total += count
+            yield bound, total
+        yield float("inf"), self.count
+
+
+class MethodMetrics:
+    __slots__ = ("calls", "errors", "limited", "latency")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        # requests turned away without being dispatched
+        self.limited = 0
+        self.latency = Histogram()
+
+    def observe(self, duration: float):
+        self.calls += 1
+        self.latency.observe(duration)
+
+
+# series for requests naming a method that isn't registered, as clients can
+# send any name they like
+UNKNOWN_METHOD = "unknown"
+
+
+class RpcMetrics:
+    def __init__(self):
+        self.methods: dict[str, MethodMetrics] = {}
+        self.known: set[str] = set()
+
+    def register(self, names: Iterable[str]):
+        self.known.update(names)
+
+    def method(self, name: str) -> MethodMetrics:
+        if name not in self.known:
+            name = UNKNOWN_METHOD
+        metrics = self.methods.get(name)
+        if metrics is None:
+            metrics = self.methods[name] = MethodMetrics()
+        return metrics
+
+
+class LoopLagMonitor:
+    """
+    Measures how late the event loop wakes up a sleeping task, which is how long
+    callbacks had to wait behind whatever was hogging the loop.
+    """
+
+    def __init__(self, interval: float = 0.25):
+        self.interval = interval
+        self.lag = Histogram()
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self._task: asyncio.Task | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        if not self.running:
+            self._task = asyncio.create_task(self.run())
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - start - self.interval)
+            self.last_lag = lag
+            self.max_lag = max(self.max_lag, lag)
+            self.lag.observe(lag)
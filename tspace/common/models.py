@@ -6,6 +6,7 @@ from pydantic import BaseModel
 
 
 class ShipType(BaseModel):
+    id: int
     name: str
     cost: int
     holds_initial: int
@@ -18,6 +19,7 @@ class ShipType(BaseModel):
 
 
 class DroneType(BaseModel):
+    id: int
     name: str
     symbol_right: str
     symbol_left: str
@@ -27,6 +29,7 @@ class DroneType(BaseModel):
     speed: int
     initiative: int
     damage_range: tuple[int, int]
+    health: int = 1
 
 
 class CommodityType(StrEnum):
@@ -35,6 +38,12 @@ class CommodityType(StrEnum):
     equipment = "Equipment"
 
 
+class TypeCatalogPublic(BaseModel):
+    # sent once on entering the game, later payloads only refer to types by id
+    ship_types: list[ShipType]
+    drone_types: list[DroneType]
+
+
 class GameConfigPublic(BaseModel):
     id: int
     name: str
@@ -57,7 +66,7 @@ class TraderPublic(BaseModel):
 
 
 class DroneStackPublic(BaseModel):
-    drone_type: DroneType
+    drone_type_id: int
     size: int
 
 
@@ -76,13 +85,29 @@ class RelativeStrength(StrEnum):
         return member
 
 
+class BattleOddsPublic(BaseModel):
+    win_probability: float
+    expected_losses: float
+    expected_kills: float
+
+
 class TraderShipPublic(BaseModel):
     id: int
     name: str
-    type: ShipType
+    type_id: int
     trader: TraderPublic
     relative_strength: RelativeStrength
     in_battle: bool = False
+    odds: BattleOddsPublic | None = None
+
+
+class ShipTrafficPublic(BaseModel):
+    # a ship warping between two sectors near, but not in, the player's sector
+    ship_id: int
+    ship_name: str
+    trader: TraderPublic
+    from_sector_id: int
+    to_sector_id: int
 
 
 class CombatantPublic(BaseModel):
@@ -124,6 +149,22 @@ class SectorPublic(BaseModel):
     planets: list[PlanetPublic]
 
 
+class SectorSummaryPublic(BaseModel):
+    id: int
+    coords: tuple[int, int]
+    warps: list[int]
+    ports: int
+    planets: int
+    ships: int
+
+
+class GalaxyMapPublic(BaseModel):
+    # every sector within radius hexes of the centre sector
+    center_sector_id: int
+    radius: int
+    sectors: list[SectorSummaryPublic]
+
+
 class PlanetPublic(BaseModel):
     id: int
     name: str
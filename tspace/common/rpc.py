@@ -1,6 +1,7 @@
 import functools
 import inspect
 import json
+import time
 from asyncio import Future
 from types import SimpleNamespace
 from typing import Awaitable, Any, Optional, Type, TypeVar
@@ -14,7 +15,11 @@ from pydantic import BaseModel
 from pjrpc.server.validators import pydantic as validators
 
 from tspace.client.logging import log
-from tspace.common.errors import from_code
+from tspace.common.errors import TSpaceError, from_code
+from tspace.common import tracing
+from tspace.common.metrics import UNKNOWN_METHOD, MethodMetrics, RpcMetrics
+from tspace.common.tracing import Tracer
+from tspace.common.watchdog import Activity
 
 T = TypeVar("T")
 
@@ -26,17 +31,37 @@ class ClientAndServer(AbstractAsyncClient):
     ) -> Optional[str]:
         raise NotImplemented
 
-    def __init__(self, sender: Callable[[str], Awaitable[None]]) -> None:
-        super().__init__()
+    def __init__(
+        self,
+        sender: Callable[[str], Awaitable[None]],
+        metrics: RpcMetrics | None = None,
+        tracer: Tracer | None = None,
+        trace_track: str = "",
+        admit: Callable[[str, dict], Awaitable[None]] | None = None,
+    ) -> None:
+        # incoming requests go through admit, if given, which is expected to
+        # call handle_request once it decides to run them
+        self.admit = admit
+        self.tracer = tracer or Tracer()
+        self.trace_track = trace_track
+        super().__init__(tracers=(tracing.PjrpcTracer(self.tracer, trace_track),))
         self.sender = sender
+        self.metrics = metrics
+        self._hooks: dict[str, _MethodHooks] = {}
         self.futures: dict[str, Future[str | None]] = {}
         self.dispatcher = AsyncDispatcher(error_handlers={None: [self.error_handler]})
 
     async def error_handler(
         self, request: Request, context: Optional[Any], error: JsonRpcError
     ) -> JsonRpcError:
+        metrics = self._hooks_for(request.method).metrics
+        if metrics:
+            metrics.errors += 1
 
         cause = error.__cause__
+        if cause is None:
+            # raised by pjrpc itself, such as for a method that doesn't exist
+            return error
         return JsonRpcError(code=cause.code, message=cause.message, data=cause.data)
 
     def build_client(self, cls: type[T]) -> T:
@@ -71,7 +96,7 @@ class ClientAndServer(AbstractAsyncClient):
 
     def register_methods(self, obj: object) -> None:
         registry = MethodRegistry()
-        validator = validators.PydanticValidator()
+        validator = _TracedValidator(self)
         for name, fn in {
             name: fn
             for name, fn in inspect.getmembers(obj, inspect.ismethod)
@@ -79,8 +104,11 @@ class ClientAndServer(AbstractAsyncClient):
         }.items():
 
             async def call(local_fn, *args: Any, **kwargs: Any) -> Any:
-                resp = await local_fn(*args, **kwargs)
-                return _serialize(resp)
+                method = local_fn.__name__
+                with self.tracer.span(tracing.HANDLER, method, self.trace_track):
+                    resp = await local_fn(*args, **kwargs)
+                with self.tracer.span(tracing.SERIALIZE, method, self.trace_track):
+                    return _serialize(resp)
 
             registry.add_methods(
                 Method(
@@ -91,6 +119,29 @@ class ClientAndServer(AbstractAsyncClient):
                 )
             )
         self.dispatcher.add_methods(registry)
+        if self.metrics:
+            self.metrics.register(registry.keys())
+
+    def fail_pending(self, error: Exception):
+        """
+        Fails the calls still waiting on an answer, when none can come anymore
+        """
+        for future in self.futures.values():
+            if not future.done():
+                future.set_exception(error)
+
+    def handles(self, method: str) -> bool:
+        return self.dispatcher.registry.get(method) is not None
+
+    def _hooks_for(self, method: str) -> "_MethodHooks":
+        hooks = self._hooks.get(method)
+        if hooks is None:
+            # clients can send any name, the ones not registered share an entry
+            name = method if self.handles(method) else UNKNOWN_METHOD
+            hooks = self._hooks.get(name)
+            if hooks is None:
+                hooks = self._hooks[name] = _MethodHooks(name, self.metrics)
+        return hooks
 
     def unregister_methods(self, target: object) -> None:
         reg = self.dispatcher.registry
@@ -109,7 +160,8 @@ class ClientAndServer(AbstractAsyncClient):
         # kwargs = {**self._request_args, **kwargs}
         assert isinstance(request, Request)
 
-        converted = _serialize(request.params)
+        with self.tracer.span(tracing.SERIALIZE, request.method, self.trace_track):
+            converted = _serialize(request.params)
         # match request.params:
         #     case list():
         #         converted = [c.model_dump() if isinstance(c, BaseModel) else c for c in request.params]
@@ -126,12 +178,14 @@ class ClientAndServer(AbstractAsyncClient):
             id=request.id,
         )
         log.info(f"Calling {request.method}")
-        request_text = self.json_dumper(serialized_request, cls=self.json_encoder)
+        with self.tracer.span(tracing.SERIALIZE, request.method, self.trace_track):
+            request_text = self.json_dumper(serialized_request, cls=self.json_encoder)
 
         try:
             log.info("calling")
 
-            await self.sender(request_text)
+            with self.tracer.span(tracing.SEND, request.method, self.trace_track):
+                await self.sender(request_text)
         finally:
             log.info("Called")
 
@@ -160,7 +214,8 @@ class ClientAndServer(AbstractAsyncClient):
             return
 
         # fixme: stop loading twice
-        data = json.loads(text)
+        with self.tracer.span(tracing.RECEIVE, track=self.trace_track):
+            data = json.loads(text)
         if data.get("jsonrpc") == "2.0":
             if "result" in data:
                 log.info(f"got result: {text}")
@@ -174,13 +229,67 @@ class ClientAndServer(AbstractAsyncClient):
                     fut.set_result(data)
             else:
                 log.info(f"Got something else: {text}")
-                try:
-                    resp = await self.dispatcher.dispatch(text)
-                    if resp:
-                        await self.sender(resp)
-                except Exception as e:
-                    log.error(f"error: {e}", exc_info=True)
-                    raise
+                if self.admit:
+                    await self.admit(text, data)
+                else:
+                    await self.handle_request(text, data)
+
+    async def handle_request(self, text: str, data: dict) -> None:
+        hooks = self._hooks_for(data.get("method", ""))
+        start = time.perf_counter()
+        try:
+            with hooks.activity:
+                resp = await self.dispatcher.dispatch(text)
+            if hooks.metrics:
+                hooks.metrics.observe(time.perf_counter() - start)
+            if resp:
+                with self.tracer.span(tracing.SEND, hooks.name, self.trace_track):
+                    await self.sender(resp)
+        except Exception as e:
+            log.error(f"error: {e}", exc_info=True)
+            raise
+
+    async def reject(self, data: dict, error: TSpaceError) -> None:
+        """
+        Answers a request with an error without dispatching it
+        """
+        if data.get("id") is None:
+            return
+        await self.sender(
+            json.dumps(
+                {
+                    "jsonrpc": "2.0",
+                    "id": data["id"],
+                    "error": {"code": error.code, "message": error.message},
+                }
+            )
+        )
+
+
+class _MethodHooks:
+    """
+    What handling a call reuses for each method, made the first time it's called
+    so calls after don't allocate them again
+    """
+
+    __slots__ = ("name", "activity", "metrics")
+
+    def __init__(self, name: str, metrics: RpcMetrics | None):
+        self.name = name
+        self.activity = Activity(f"rpc {name}")
+        self.metrics: MethodMetrics | None = metrics.method(name) if metrics else None
+
+
+class _TracedValidator(validators.PydanticValidator):
+    def __init__(self, api: ClientAndServer):
+        super().__init__()
+        self.api = api
+
+    def validate_method(self, method, params, exclude=(), **kwargs) -> dict[str, Any]:
+        with self.api.tracer.span(
+            tracing.VALIDATE, method.__name__, self.api.trace_track
+        ):
+            return super().validate_method(method, params, exclude, **kwargs)
 
 
 def _serialize(value: Any) -> Any:
@@ -0,0 +1,181 @@
+import json
+import os
+import time
+from collections import deque
+from types import SimpleNamespace
+from typing import Any, Optional
+
+from pjrpc import AbstractRequest, AbstractResponse
+from pjrpc.client import tracer as pjrpc_tracer
+
+# stages of handling a call, used as span names
+RECEIVE = "receive"
+VALIDATE = "validate"
+HANDLER = "handler"
+SERIALIZE = "serialize"
+SEND = "send"
+CALL = "call"
+
+MAX_EVENTS = 100_000
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    """
+    Receives a span for each stage of handling an RPC call. This one ignores them
+    all, so a session without tracing only pays for a method call per stage.
+    """
+
+    def span(self, name: str, method: str = "", track: str = ""):
+        return _NULL_SPAN
+
+
+class _Span:
+    __slots__ = ("recorder", "name", "method", "track", "start")
+
+    def __init__(
+        self, recorder: "ChromeTraceRecorder", name: str, method: str, track: str
+    ):
+        self.recorder = recorder
+        self.name = name
+        self.method = method
+        self.track = track
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.recorder.record(
+            self.name,
+            self.method,
+            self.track,
+            self.start,
+            time.perf_counter_ns() - self.start,
+            error=exc_type is not None,
+        )
+        return False
+
+
+class ChromeTraceRecorder(Tracer):
+    """
+    Keeps spans in memory while recording is on, and writes them out in the Chrome
+    trace event format, which chrome://tracing and https://ui.perfetto.dev can
+    open. Each session gets its own track so concurrent calls don't overlap.
+    Only the most recent spans are kept, so leaving it on can't use up memory.
+    """
+
+    def __init__(self, max_events: int = MAX_EVENTS):
+        self.recording = False
+        self.events: deque[dict[str, Any]] = deque(maxlen=max_events)
+        self._tracks: dict[str, int] = {}
+
+    def start(self):
+        self.events.clear()
+        self.recording = True
+
+    def stop(self):
+        self.recording = False
+
+    def span(self, name: str, method: str = "", track: str = ""):
+        if not self.recording:
+            return _NULL_SPAN
+        return _Span(self, name, method, track)
+
+    def record(
+        self,
+        name: str,
+        method: str,
+        track: str,
+        start_ns: int,
+        duration_ns: int,
+        error: bool = False,
+    ):
+        tid = self._tracks.get(track)
+        if tid is None:
+            tid = self._tracks[track] = len(self._tracks) + 1
+        args: dict[str, Any] = {"method": method}
+        if error:
+            args["error"] = True
+        self.events.append(
+            {
+                "name": f"{name} {method}" if method else name,
+                "cat": name,
+                "ph": "X",
+                "ts": start_ns / 1000,
+                "dur": duration_ns / 1000,
+                "pid": os.getpid(),
+                "tid": tid,
+                "args": args,
+            }
+        )
+
+    def to_chrome_trace(self) -> dict[str, Any]:
+        pid = os.getpid()
+        names = [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": pid,
+                "tid": tid,
+                "args": {"name": track or "rpc"},
+            }
+            for track, tid in self._tracks.items()
+        ]
+        return {"traceEvents": names + list(self.events), "displayTimeUnit": "ms"}
+
+    def export(self, path: str):
+        with open(path, "w") as f:
+            json.dump(self.to_chrome_trace(), f)
+
+
+class PjrpcTracer(pjrpc_tracer.Tracer):
+    """
+    Records outgoing calls made through pjrpc's traced client methods as spans.
+    pjrpc shares a default trace context between calls, so calls are matched up
+    by request instead.
+    """
+
+    def __init__(self, tracer: Tracer, track: str = ""):
+        self.tracer = tracer
+        self.track = track
+        self._spans: dict[int, Any] = {}
+
+    def on_request_begin(
+        self, trace_context: SimpleNamespace, request: AbstractRequest
+    ) -> None:
+        span = self.tracer.span(CALL, getattr(request, "method", ""), self.track)
+        span.__enter__()
+        self._spans[id(request)] = span
+
+    def on_request_end(
+        self,
+        trace_context: SimpleNamespace,
+        request: AbstractRequest,
+        response: Optional[AbstractResponse],
+    ) -> None:
+        span = self._spans.pop(id(request), None)
+        if span is not None:
+            span.__exit__(None, None, None)
+
+    def on_error(
+        self,
+        trace_context: SimpleNamespace,
+        request: AbstractRequest,
+        error: BaseException,
+    ) -> None:
+        span = self._spans.pop(id(request), None)
+        if span is not None:
+            span.__exit__(type(error), error, None)
@@ -0,0 +1,181 @@
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from collections import Counter, deque
+from dataclasses import dataclass, field
+
+from tspace.client.logging import log
+from tspace.common.metrics import Histogram
+
+STALL_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STACK_LIMIT = 20
+
+# what each task is busy with, for tasks that say so through activity()
+_labels: dict[asyncio.Task, str] = {}
+
+
+class Activity:
+    """
+    Marks what the current task is doing while entered, so a stall while it runs
+    is blamed on it rather than on the task as a whole.
+
+    One can be kept and entered over and over, by any number of tasks at once,
+    for work that runs often.
+    """
+
+    __slots__ = ("label", "_previous")
+
+    def __init__(self, label: str):
+        self.label = label
+        self._previous: dict[asyncio.Task, str | None] = {}
+
+    def __enter__(self):
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            return
+        if task is not None:
+            self._previous[task] = _labels.get(task)
+            _labels[task] = self.label
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            return
+        if task is None or task not in self._previous:
+            return
+        previous = self._previous.pop(task)
+        if previous is None:
+            del _labels[task]
+        else:
+            _labels[task] = previous
+
+
+def activity(label: str) -> Activity:
+    return Activity(label)
+
+
+def describe(task: asyncio.Task | None) -> str:
+    if task is None:
+        return "callback"
+    label = _labels.get(task)
+    if label:
+        return label
+    coro = task.get_coro()
+    return f"task {getattr(coro, '__qualname__', task.get_name())}"
+
+
+@dataclass
+class Stall:
+    source: str
+    started: float
+    duration: float = 0.0
+    # distinct stacks seen while stalled, most recent call last
+    stacks: Counter[str] = field(default_factory=Counter)
+
+
+class LoopWatchdog:
+    """
+    Notices when a single callback holds up the event loop.
+
+    The loop bumps a heartbeat every interval, and a thread checks on it. Once
+    the heartbeat is late by more than the threshold, the thread samples the loop
+    thread's stack until the loop comes back, then logs the stall along with the
+    RPC method or task that was running.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.1,
+        interval: float = 0.02,
+        max_samples: int = 5,
+        history: int = 20,
+    ):
+        self.threshold = threshold
+        self.interval = interval
+        self.max_samples = max_samples
+        self.stalls: Counter[str] = Counter()
+        self.stall_duration = Histogram(STALL_BUCKETS)
+        self.recent: deque[Stall] = deque(maxlen=history)
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread_id = 0
+        self._beat = 0.0
+        self._handle: asyncio.TimerHandle | None = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._thread_id = threading.get_ident()
+        self._stop.clear()
+        self._heartbeat()
+        self._thread = threading.Thread(
+            target=self._watch, name="loop-watchdog", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._handle:
+            self._handle.cancel()
+            self._handle = None
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def _heartbeat(self):
+        self._beat = time.monotonic()
+        self._handle = self._loop.call_later(self.interval, self._heartbeat)
+
+    def _watch(self):
+        stall: Stall | None = None
+        beat = self._beat
+        while not self._stop.wait(self.interval):
+            if not self._loop.is_running():
+                stall = None
+                continue
+
+            if self._beat != beat:
+                if stall is not None:
+                    stall.duration = self._beat - stall.started
+                    self._report(stall)
+                    stall = None
+                beat = self._beat
+                continue
+
+            late = time.monotonic() - beat - self.interval
+            if late < self.threshold:
+                continue
+
+            if stall is None:
+                task = asyncio.current_task(self._loop)
+                stall = Stall(source=describe(task), started=beat + self.interval)
+            if sum(stall.stacks.values()) < self.max_samples:
+                frame = sys._current_frames().get(self._thread_id)
+                if frame is not None:
+                    stack = traceback.StackSummary.extract(
+                        traceback.walk_stack(frame), limit=STACK_LIMIT
+                    )
+                    stack.reverse()
+                    stall.stacks["".join(stack.format())] += 1
+
+    def _report(self, stall: Stall):
+        self.stalls[stall.source] += 1
+        self.stall_duration.observe(stall.duration)
+        self.recent.append(stall)
+
+        samples = "\n".join(
+            f"seen {count}x:\n{stack}" for stack, count in stall.stacks.most_common()
+        )
+        log.warning(
+            f"Event loop stalled for {stall.duration:.3f}s in {stall.source}\n{samples}"
+        )
@@ -0,0 +1,56 @@
+import zlib
+
+# defaults for websocket connections, used by clients before they've seen the
+# server's config
+MAX_MESSAGE_SIZE = 1 << 20
+HEARTBEAT = 30.0
+COMPRESS_THRESHOLD = 512
+COMPRESS_LEVEL = 6
+
+# query parameter a client sets when it can read compressed frames
+COMPRESS_PARAM = "compress"
+
+# what a sync flush ends a deflate block with, dropped on the wire as
+# permessage-deflate does
+_FLUSH_TAIL = b"\x00\x00\xff\xff"
+
+
+class FrameCompressor:
+    """
+    Compresses outgoing messages at or over a size threshold into binary frames,
+    leaving smaller ones as text, where compressing costs more CPU than the bytes
+    it saves. All frames on a connection share one deflate stream, so repeated
+    JSON keys and sector data in later messages refer back to earlier ones.
+    """
+
+    def __init__(
+        self, threshold: int = COMPRESS_THRESHOLD, level: int = COMPRESS_LEVEL
+    ):
+        self.threshold = threshold
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+
+    def encode(self, text: str) -> str | bytes:
+        if len(text) < self.threshold:
+            return text
+        data = self._compressor.compress(text.encode())
+        data += self._compressor.flush(zlib.Z_SYNC_FLUSH)
+        return data[: -len(_FLUSH_TAIL)]
+
+
+class FrameDecompressor:
+    def __init__(self, max_size: int = MAX_MESSAGE_SIZE):
+        self.max_size = max_size
+        self._decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+
+    def decode(self, data: bytes) -> str:
+        """
+        Raises ValueError for a frame that is too big or isn't valid deflate
+        data, after which the stream can't be read any further.
+        """
+        try:
+            text = self._decompressor.decompress(data + _FLUSH_TAIL, self.max_size)
+        except zlib.error as e:
+            raise ValueError(f"Invalid compressed message: {e}") from e
+        if self._decompressor.unconsumed_tail:
+            raise ValueError(f"Message larger than {self.max_size} bytes")
+        return text.decode()
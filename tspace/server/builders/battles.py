@@ -23,5 +23,6 @@ def create(game: Galaxy, attacker: Ship, target: Ship) -> Battle:
     game.battles[battle.id] = battle
     attacker.battle_id = battle.id
     target.battle_id = battle.id
+    game.start_battle(battle)
 
     return battle
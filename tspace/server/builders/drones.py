@@ -14,6 +14,7 @@ autoid = AutoIncrementId()
 
 
 FIGHTER = DroneType(
+    id=1,
     name="Fighter",
     symbol_right="\u257E",
     symbol_left="\u257C",
@@ -23,11 +24,13 @@ FIGHTER = DroneType(
     speed=5,
     initiative=4,
     damage_range=(1, 3),
+    health=3,
 )
 
+DRONE_TYPES = {t.id: t for t in (FIGHTER,)}
+
 
 def create_initial(ship: Ship, drone_type: DroneType, count: int) -> DroneStack:
-    assert len(ship.drones) < ship.ship_type.drone_stack_max
     stack = DroneStack(drone_type, count)
-    ship.drones.append(stack)
+    ship.add_drones(stack)
     return stack
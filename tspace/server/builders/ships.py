@@ -17,6 +17,7 @@ autoid = AutoIncrementId()
 
 
 MERCHANT_CRUISER = ShipType(
+    id=1,
     name="Merchant Cruiser",
     cost=41300,
     holds_initial=200,
@@ -28,6 +29,8 @@ MERCHANT_CRUISER = ShipType(
     initiative=5,
 )
 
+SHIP_TYPES = {t.id: t for t in (MERCHANT_CRUISER,)}
+
 
 def create() -> Ship:
     breakpoint()
@@ -0,0 +1,338 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Sequence
+
+import numpy as np
+
+from tspace.common.models import DroneType, ShipType
+
+# Size of the hex battlefield, matching the client's Battlefield grid. Columns use
+# "odd-q" offset coordinates: odd columns are shoved down half a hex.
+GRID_WIDTH = 20
+GRID_HEIGHT = 20
+
+MAX_ROUNDS = 100
+
+_NO_TARGET = np.iinfo(np.int32).max
+
+
+class Side(IntEnum):
+    ATTACKER = 0
+    TARGET = 1
+
+
+class Outcome(IntEnum):
+    PENDING = -1
+    ATTACKER_WON = 0
+    TARGET_WON = 1
+    DRAW = 2
+
+
+@dataclass
+class Combatant:
+    ship_type: ShipType
+    stacks: Sequence[tuple[DroneType, int]]
+
+
+@dataclass
+class BattleResult:
+    outcome: Outcome
+    rounds: int
+    # surviving drones per stack, in the order the stacks were given
+    attacker_sizes: list[int]
+    target_sizes: list[int]
+
+
+class BattleEngine:
+    """
+    Resolves battles between drone stacks on a hex grid.
+
+    Every stack of every battle lives in a row of fixed width arrays, so a single
+    call to step() advances all running battles by one round. Randomness is
+    derived by hashing each battle's seed with the round and turn, which makes a
+    battle's result depend only on its seed and combatants, not on which other
+    battles happen to be stepped with it.
+    """
+
+    def __init__(self, max_stacks_per_side: int = 3, capacity: int = 16):
+        self.max_stacks_per_side = max_stacks_per_side
+        self.slots = max_stacks_per_side * 2
+        self._ids: dict[int, int] = {}
+        self._free: list[int] = []
+        self._allocate(capacity)
+
+    def _allocate(self, capacity: int):
+        shape = (capacity, self.slots)
+        old = getattr(self, "_capacity", 0)
+
+        def grow(name: str, dtype, fill, per_slot: bool = True):
+            arr = np.full(shape if per_slot else capacity, fill, dtype=dtype)
+            if old:
+                arr[:old] = getattr(self, name)
+            setattr(self, name, arr)
+
+        # static per-stack attributes
+        grow("side", np.int8, -1)
+        grow("attack", np.int32, 0)
+        grow("defense", np.int32, 0)
+        grow("speed", np.int32, 0)
+        grow("health", np.int64, 1)
+        grow("damage_low", np.int64, 0)
+        grow("damage_high", np.int64, 0)
+        grow("order", np.int64, 0)
+        # dynamic per-stack state
+        grow("hp", np.int64, 0)
+        grow("col", np.int32, 0)
+        grow("row", np.int32, 0)
+        # per-battle state
+        grow("seed", np.uint64, 0, per_slot=False)
+        grow("round", np.int32, 0, per_slot=False)
+        grow("active", np.bool_, False, per_slot=False)
+        grow("outcome", np.int8, Outcome.PENDING, per_slot=False)
+
+        self._free.extend(range(capacity - 1, old - 1, -1))
+        self._capacity = capacity
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __contains__(self, battle_id: int):
+        return battle_id in self._ids
+
+    @property
+    def running(self) -> int:
+        return int(self.active.sum())
+
+    def add(self, battle_id: int, seed: int, attacker: Combatant, target: Combatant):
+        if battle_id in self._ids:
+            raise ValueError(f"Battle {battle_id} already added")
+        for combatant in (attacker, target):
+            if len(combatant.stacks) > self.max_stacks_per_side:
+                raise ValueError("Too many drone stacks")
+
+        if not self._free:
+            self._allocate(self._capacity * 2)
+        idx = self._free.pop()
+        self._ids[battle_id] = idx
+
+        self.side[idx] = -1
+        self.hp[idx] = 0
+        self.attack[idx] = self.defense[idx] = self.speed[idx] = 0
+        self.damage_low[idx] = self.damage_high[idx] = 0
+        self.health[idx] = 1
+
+        initiative = np.full(self.slots, -1, dtype=np.int64)
+        for side, combatant in enumerate((attacker, target)):
+            ship = combatant.ship_type
+            start_row = GRID_HEIGHT // 2 - len(combatant.stacks) // 2
+            col = 0 if side == Side.ATTACKER else GRID_WIDTH - 1
+            for pos, (drone_type, size) in enumerate(combatant.stacks):
+                slot = side * self.max_stacks_per_side + pos
+                self.side[idx, slot] = side
+                self.attack[idx, slot] = drone_type.attack + ship.attack
+                self.defense[idx, slot] = drone_type.defense + ship.defense
+                self.speed[idx, slot] = drone_type.speed
+                self.health[idx, slot] = drone_type.health
+                self.damage_low[idx, slot] = drone_type.damage_range[0]
+                self.damage_high[idx, slot] = drone_type.damage_range[1]
+                self.hp[idx, slot] = size * drone_type.health
+                self.col[idx, slot] = col
+                self.row[idx, slot] = start_row + pos
+                initiative[slot] = drone_type.initiative + ship.initiative
+
+        # higher initiative acts first, ties go to the attacker and then the
+        # earlier stack
+        self.order[idx] = np.argsort(-initiative, kind="stable")
+        self.seed[idx] = np.uint64(seed & 0xFFFFFFFFFFFFFFFF)
+        self.round[idx] = 0
+        self.outcome[idx] = Outcome.PENDING
+        self.active[idx] = True
+
+    def remove(self, battle_id: int) -> BattleResult:
+        result = self.result(battle_id)
+        idx = self._ids.pop(battle_id)
+        self.active[idx] = False
+        self._free.append(idx)
+        return result
+
+    def result(self, battle_id: int) -> BattleResult:
+        idx = self._ids[battle_id]
+        sizes = self._sizes(self.hp[idx], self.health[idx])
+        sizes[self.side[idx] < 0] = -1
+        per_side = self.max_stacks_per_side
+        return BattleResult(
+            outcome=Outcome(int(self.outcome[idx])),
+            rounds=int(self.round[idx]),
+            attacker_sizes=[int(s) for s in sizes[:per_side] if s >= 0],
+            target_sizes=[int(s) for s in sizes[per_side:] if s >= 0],
+        )
+
+    def is_finished(self, battle_id: int) -> bool:
+        return not self.active[self._ids[battle_id]]
+
+    def finished(self) -> list[int]:
+        return [
+            battle_id
+            for battle_id, idx in self._ids.items()
+            if self.outcome[idx] != Outcome.PENDING
+        ]
+
+    def run(self, max_steps: int = MAX_ROUNDS):
+        for _ in range(max_steps):
+            if not self.step():
+                break
+
+    def step(self) -> int:
+        """
+        Resolves one round of every running battle, returning how many are still
+        running afterwards.
+        """
+        rows = np.flatnonzero(self.active)
+        if not len(rows):
+            return 0
+
+        hp = self.hp[rows]
+        col = self.col[rows]
+        row = self.row[rows]
+        side = self.side[rows]
+        health = self.health[rows]
+        rounds = self.round[rows]
+        seeds = self.seed[rows]
+        batch = np.arange(len(rows))
+
+        for turn in range(self.slots):
+            actor = self.order[rows, turn]
+            acting = hp[batch, actor] > 0
+            if not acting.any():
+                continue
+
+            actor_side = side[batch, actor]
+            enemy = (side != actor_side[:, None]) & (side >= 0) & (hp > 0)
+
+            actor_col = col[batch, actor]
+            actor_row = row[batch, actor]
+            dist = _hex_distance(actor_col[:, None], actor_row[:, None], col, row)
+            dist = np.where(enemy, dist, _NO_TARGET)
+            target = dist.argmin(axis=1)
+            target_dist = dist[batch, target]
+            acting &= target_dist != _NO_TARGET
+
+            # move towards the closest enemy, stopping next to it
+            steps = np.clip(target_dist - 1, 0, self.speed[rows, actor])
+            steps = np.where(acting, steps, 0)
+            new_col, new_row = _hex_step_towards(
+                actor_col,
+                actor_row,
+                col[batch, target],
+                row[batch, target],
+                steps,
+                np.maximum(target_dist, 1),
+            )
+            col[batch, actor] = new_col
+            row[batch, actor] = new_row
+
+            attacking = acting & (target_dist - steps <= 1)
+            if not attacking.any():
+                continue
+
+            low = self.damage_low[rows, actor]
+            high = self.damage_high[rows, actor]
+            rolls = low + _random(seeds, rounds, turn) % (high - low + 1)
+
+            size = self._sizes(hp[batch, actor], health[batch, actor])
+            damage = (
+                size
+                * rolls
+                * attack_modifier(self.attack[rows, actor], self.defense[rows, target])
+            )
+            damage = np.where(attacking, damage.astype(np.int64), 0)
+            hp[batch, target] = np.maximum(hp[batch, target] - damage, 0)
+
+        rounds += 1
+        alive = hp > 0
+        attacker_alive = (alive & (side == Side.ATTACKER)).any(axis=1)
+        target_alive = (alive & (side == Side.TARGET)).any(axis=1)
+
+        outcome = np.full(len(rows), Outcome.PENDING, dtype=np.int8)
+        outcome[~target_alive] = Outcome.ATTACKER_WON
+        outcome[~attacker_alive] = Outcome.TARGET_WON
+        outcome[(attacker_alive & target_alive) & (rounds >= MAX_ROUNDS)] = Outcome.DRAW
+        outcome[~attacker_alive & ~target_alive] = Outcome.DRAW
+
+        self.hp[rows] = hp
+        self.col[rows] = col
+        self.row[rows] = row
+        self.round[rows] = rounds
+        self.outcome[rows] = outcome
+        still_running = outcome == Outcome.PENDING
+        self.active[rows] = still_running
+        return int(still_running.sum())
+
+    @staticmethod
+    def _sizes(hp: np.ndarray, health: np.ndarray) -> np.ndarray:
+        return -(-hp // health)
+
+
+def attack_modifier(attack: np.ndarray, defense: np.ndarray) -> np.ndarray:
+    # each point of attack over defense adds 5% damage, up to +300%, and each point
+    # of defense over attack takes off 2.5%, down to -70%
+    diff = attack - defense
+    return np.where(
+        diff >= 0,
+        1 + np.minimum(diff * 0.05, 3.0),
+        1 - np.minimum(-diff * 0.025, 0.7),
+    )
+
+
+def _to_cube(col: np.ndarray, row: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # odd-q offset to axial coordinates
+    return col, row - (col - (col & 1)) // 2
+
+
+def _hex_distance(col_a, row_a, col_b, row_b) -> np.ndarray:
+    q_a, r_a = _to_cube(col_a, row_a)
+    q_b, r_b = _to_cube(col_b, row_b)
+    dq = q_a - q_b
+    dr = r_a - r_b
+    return (np.abs(dq) + np.abs(dr) + np.abs(dq + dr)) // 2
+
+
+def _hex_step_towards(col_a, row_a, col_b, row_b, steps, dist):
+    q_a, r_a = _to_cube(col_a, row_a)
+    q_b, r_b = _to_cube(col_b, row_b)
+    t = steps / dist
+    q = q_a + (q_b - q_a) * t
+    r = r_a + (r_b - r_a) * t
+    s = -q - r
+
+    # round fractional cube coordinates to the nearest hex
+    rq, rr, rs = np.rint(q), np.rint(r), np.rint(s)
+    dq, dr, ds = np.abs(rq - q), np.abs(rr - r), np.abs(rs - s)
+    fix_q = (dq > dr) & (dq > ds)
+    fix_r = ~fix_q & (dr > ds)
+    rq = np.where(fix_q, -rr - rs, rq)
+    rr = np.where(fix_r, -rq - rs, rr)
+
+    new_col = rq.astype(np.int32)
+    new_row = rr.astype(np.int32) + (new_col - (new_col & 1)) // 2
+    return new_col, new_row
+
+
+def _random(seeds: np.ndarray, rounds: np.ndarray, turn: int) -> np.ndarray:
+    # splitmix64 over (seed, round, turn), giving a stream per battle that does
+    # not depend on the other battles in the batch
+    with np.errstate(over="ignore"):
+        x = _splitmix64(seeds)
+        x = _splitmix64(
+            x + (rounds.astype(np.uint64) << np.uint64(8)) + np.uint64(turn)
+        )
+    return (x >> np.uint64(1)).astype(np.int64)
+
+
+def _splitmix64(x: np.ndarray) -> np.ndarray:
+    x = x + np.uint64(0x9E3779B97F4A7C15)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
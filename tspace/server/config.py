@@ -1,12 +1,16 @@
+import tempfile
 from typing import Any, Optional
 
+from tspace.common import wire
 from tspace.common.models import GameConfigPublic
 from tspace.server.models import SessionContext
+from tspace.server.ratelimit import RateLimit
 
 
 class PortConfig:
-    def __init__(self, density: int = 40):
+    def __init__(self, density: int = 40, regeneration_rate: float = 0.02):
         self.density = density
+        self.regeneration_rate = regeneration_rate
 
 
 class PlayerConfig:
@@ -27,7 +31,52 @@ class GameConfig:
         debug_network: bool = False,
         warp_density: int = 3.5,
         sectors_count: int = 0,
+        tick_interval: float = 0.5,
+        economy_interval: int = 60,
+        admin_token: Optional[str] = None,
+        debug_dir: str = tempfile.gettempdir(),
+        stall_threshold: float = 0.1,
+        session_resume_window: float = 300,
+        session_buffer_size: int = 500,
+        interest_radius: int = 2,
+        map_max_radius: int = 10,
+        rpc_rate_limits: Optional[dict[str, RateLimit]] = None,
+        rpc_queue_size: int = 32,
+        rpc_workers: int = 4,
+        worker_processes: Optional[int] = None,
+        ws_compress: bool = True,
+        ws_compress_threshold: int = wire.COMPRESS_THRESHOLD,
+        ws_max_message_size: int = wire.MAX_MESSAGE_SIZE,
+        ws_heartbeat: Optional[float] = wire.HEARTBEAT,
     ):
+        # websocket messages at or over the threshold are compressed for clients
+        # that ask for it, and bigger incoming messages than the max are refused
+        self.ws_compress = ws_compress
+        self.ws_compress_threshold = ws_compress_threshold
+        self.ws_max_message_size = ws_max_message_size
+        self.ws_heartbeat = ws_heartbeat
+        # per method limits for each session, on top of DEFAULT_METHOD_LIMITS
+        self.rpc_rate_limits = rpc_rate_limits
+        self.rpc_queue_size = rpc_queue_size
+        self.rpc_workers = rpc_workers
+        # processes for CPU-bound work like galaxy generation, by default one
+        # less than the CPUs, and 0 runs it on threads instead
+        self.worker_processes = worker_processes
+        # players hear about ships warping within this many warps of them
+        self.interest_radius = interest_radius
+        # the widest window of the galaxy map a player can ask for, in hexes
+        self.map_max_radius = map_max_radius
+        # how long a disconnected player can come back to their session, and how
+        # many messages are kept for them meanwhile
+        self.session_resume_window = session_resume_window
+        self.session_buffer_size = session_buffer_size
+        # a callback blocking the event loop for longer than this is reported
+        self.stall_threshold = stall_threshold
+        # admin endpoints are disabled unless a token is set
+        self.admin_token = admin_token
+        self.debug_dir = debug_dir
+        self.tick_interval = tick_interval
+        self.economy_interval = economy_interval
         self.player = player
         self.warp_density = warp_density
         self.debug_network = debug_network
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from enum import Enum
+from typing import Any, Callable, TypeVar
+
+T = TypeVar("T")
+
+
+class Pool(Enum):
+    # for work that releases the GIL (numpy, io, compression)
+    THREAD = "thread"
+    # for pure python work, which would hold the GIL in a thread
+    PROCESS = "process"
+
+
+class WorkerPools:
+    """
+    Runs blocking or CPU-bound work off the event loop thread.
+
+    Process pool work and its arguments and results are pickled, so it has to be
+    a module level function that doesn't touch live galaxy state. Thread pool work
+    shares memory with the loop, so it must only read state nothing else changes
+    while it runs.
+
+    With no processes, process pool work runs in the thread pool instead, for
+    games embedded in the client, where forking a pool isn't worth it.
+    """
+
+    def __init__(self, threads: int | None = None, processes: int | None = None):
+        self.threads = threads or min(4, os.cpu_count() or 1)
+        self.processes = (
+            max(1, (os.cpu_count() or 2) - 1) if processes is None else processes
+        )
+        self._thread_pool: ThreadPoolExecutor | None = None
+        self._process_pool: ProcessPoolExecutor | None = None
+
+    def configure(self, threads: int | None = None, processes: int | None = None):
+        """
+        Resizes the pools. Only takes effect for pools not yet created.
+        """
+        if threads is not None:
+            self.threads = threads
+        if processes is not None:
+            self.processes = processes
+
+    def executor(self, pool: Pool) -> Executor:
+        # created on first use, so servers that never offload don't fork
+        if pool is Pool.THREAD or not self.processes:
+            if self._thread_pool is None:
+                self._thread_pool = ThreadPoolExecutor(
+                    self.threads, thread_name_prefix="tspace-worker"
+                )
+            return self._thread_pool
+        if self._process_pool is None:
+            self._process_pool = ProcessPoolExecutor(self.processes)
+        return self._process_pool
+
+    async def run(
+        self, pool: Pool, fn: Callable[..., T], *args: Any, **kwargs: Any
+    ) -> T:
+        if kwargs:
+            fn = functools.partial(fn, **kwargs)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor(pool), fn, *args)
+
+    async def run_in_thread(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        return await self.run(Pool.THREAD, fn, *args, **kwargs)
+
+    async def run_in_process(
+        self, fn: Callable[..., T], *args: Any, **kwargs: Any
+    ) -> T:
+        return await self.run(Pool.PROCESS, fn, *args, **kwargs)
+
+    def shutdown(self):
+        for executor in (self._thread_pool, self._process_pool):
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+        self._thread_pool = self._process_pool = None
+
+
+_workers = WorkerPools()
+
+
+def get_workers() -> WorkerPools:
+    return _workers
+
+
+def offload(pool: Pool = Pool.THREAD):
+    """
+    Marks a blocking function as offloadable. The function itself stays as it
+    is, for callers not on the event loop, and `fn.offloaded(...)` is an
+    awaitable version that runs it in the given pool.
+    """
+
+    def decorator(fn: Callable[..., T]) -> Callable[..., T]:
+        # fn is returned unwrapped, so the process pool can still pickle it by name
+        async def offloaded(*args: Any, **kwargs: Any) -> T:
+            return await _workers.run(pool, fn, *args, **kwargs)
+
+        fn.offloaded = offloaded
+        fn.pool = pool
+        return fn
+
+    return decorator
@@ -1,11 +1,17 @@
 from __future__ import annotations
 
+import asyncio
 import random
-from typing import TYPE_CHECKING, Dict
+from typing import TYPE_CHECKING, Callable, Dict, Iterator
 
 import networkx
 
-from tspace.server.graph import gen_hex_center, remove_warps
+from tspace.server.combat import BattleEngine, Combatant
+from tspace.server.graph import plan_warps
+from tspace.server.interest import InterestManager
+from tspace.server.odds import BattleOddsEstimator
+from tspace.server.scheduler import Scheduler
+from tspace.server.spatial import HexIndex
 from tspace.server.models import (
     Sector,
     Player,
@@ -28,10 +34,17 @@ class Galaxy:
         self.sectors: dict[int, Sector] = {}
         self.ports: dict[int, Port] = {}
         self.sector_coords_to_id = {}
+        self.hexes = HexIndex()
         self.players: dict[int, Player] = {}
         self.ships: dict[int:Ship] = {}
         self.planets: dict[int, Planet] = {}
         self.battles: dict[int, Battle] = {}
+        self.battle_engine = BattleEngine()
+        self.battle_odds = BattleOddsEstimator()
+        self.scheduler = Scheduler(config.tick_interval)
+        self.interest = InterestManager(config.interest_radius)
+        # told about the battles that ended on each tick
+        self.on_battles_finished: Callable[[list[Battle]], None] | None = None
         self._graph = None
 
         self.rnd = random.Random(self.config.seed)
@@ -47,8 +60,62 @@ class Galaxy:
         p.visit_sector(sec.id)
         ship.move_sector(sec.id)
         sec.enter_ship(ship)
+        self.interest.enter(p.id, sec.id)
         return p
 
+    def remove_player(self, player: Player):
+        self.interest.leave(player.id)
+        ship = self.ships.pop(player.ship_id)
+        sector = self.sectors[ship.sector_id]
+        if ship.id in sector.ship_ids:
+            sector.exit_ship(ship)
+        del self.players[player.id]
+
+    def start_battle(self, battle: Battle):
+        attacker, target = battle.engage()
+        self.battle_engine.add(
+            battle.id,
+            seed=self.rnd.getrandbits(64),
+            attacker=attacker,
+            target=target,
+        )
+
+    async def prefetch_odds(self, sector: Sector):
+        """
+        Simulates the odds between every pair of ships in the sector that
+        aren't cached yet, as they all go into the sector's public view
+        """
+        combat = {ship.id: ship.to_combat() for ship in sector.ships}
+        await self.battle_odds.prefetch(
+            (combat[own], combat[other])
+            for own in combat
+            for other in combat
+            if own != other
+        )
+
+    def step_battles(self) -> list[Battle]:
+        """
+        Resolves a round of every running battle, returning the battles that ended
+        """
+        self.battle_engine.step()
+        ended = []
+        for battle_id in self.battle_engine.finished():
+            battle = self.battles[battle_id]
+            battle.finish(self.battle_engine.remove(battle_id))
+            ended.append(battle)
+        return ended
+
+    def _run_battles(self):
+        ended = self.step_battles()
+        if ended and self.on_battles_finished:
+            self.on_battles_finished(ended)
+
+    def regenerate_ports(self) -> Iterator[None]:
+        rate = self.config.port.regeneration_rate
+        for port in list(self.ports.values()):
+            port.regenerate(rate)
+            yield
+
     def id_to_coords(self, sector_id):
         return self.sectors[sector_id].coords
 
@@ -56,8 +123,23 @@ class Galaxy:
         return self.sector_coords_to_id[(x, y)]
 
     def _bang_world(self):
-        g = gen_hex_center(self.config.diameter)
-        remove_warps(g, self.config.warp_density, self.rnd)
+        graph, state = plan_warps(
+            self.config.diameter, self.config.warp_density, self.rnd.getstate()
+        )
+        self.rnd.setstate(state)
+        for _ in self._populate(graph):
+            pass
+
+    async def _bang_world_offloaded(self):
+        graph, state = await plan_warps.offloaded(
+            self.config.diameter, self.config.warp_density, self.rnd.getstate()
+        )
+        self.rnd.setstate(state)
+        for count, _ in enumerate(self._populate(graph)):
+            if count % 100 == 0:
+                await asyncio.sleep(0)
+
+    def _populate(self, g: networkx.Graph) -> Iterator[None]:
         self._graph = g
 
         self.sector_coords_to_id = networkx.get_node_attributes(g, "sector_id")
@@ -76,9 +158,35 @@ class Galaxy:
                 for x in range(int(self.rnd.gauss(4.5, 1.5))):
                     planet = planets.create(self, None)
                     sector.planet_ids.append(planet.id)
+            yield
 
     def start(self):
         self._bang_world()
+        self._setup()
+
+    async def start_offloaded(self):
+        """
+        Like start(), but builds the warp graph in a worker process and yields to
+        the event loop while populating sectors
+        """
+        await self._bang_world_offloaded()
+        self._setup()
+
+    def sectors_within(self, sector_id: int, radius: int) -> list[Sector]:
+        """
+        Sectors within radius hexes of the given one, by position rather than
+        warps, nearest first
+        """
+        center = self.sectors[sector_id].coords
+        return [self.sectors[i] for i in self.hexes.within(center, radius)]
+
+    def _setup(self):
+        self.hexes.build(self.sectors.values())
+        self.interest.build(self.sectors.values())
+        self.scheduler.add_phase("battles", self._run_battles)
+        self.scheduler.add_phase(
+            "economy", self.regenerate_ports, every=self.config.economy_interval
+        )
         p = players.create(self, "Moorg")
 
         sec = self.sectors[self.config.player.initial_sector_id]
@@ -7,6 +7,8 @@ import networkx as nx
 from networkx import Graph
 from networkx.algorithms import shortest_path_length
 
+from tspace.server.executor import Pool, offload
+
 
 def gen_hex_center(size) -> nx.Graph:
     g = nx.Graph(directed=False)
@@ -42,6 +44,21 @@ def gen_hex_center(size) -> nx.Graph:
     return g.to_directed()
 
 
+@offload(Pool.PROCESS)
+def plan_warps(
+    diameter: int, warp_density: float, rnd_state: tuple
+) -> tuple[nx.Graph, tuple]:
+    """
+    Builds the warp graph, returning it along with the random state it leaves
+    behind, so the rest of the universe comes out the same wherever this ran.
+    """
+    rnd = random.Random()
+    rnd.setstate(rnd_state)
+    g = gen_hex_center(diameter)
+    remove_warps(g, warp_density, rnd)
+    return g, rnd.getstate()
+
+
 # def gen_2d_grid(size):
 #     g = nx.grid_2d_graph(size, size)
 #     x = y = n = 0
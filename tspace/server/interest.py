@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import TYPE_CHECKING, Iterable
+
+if TYPE_CHECKING:
+    from tspace.server.models import Sector
+
+
+class InterestManager:
+    """
+    Tracks which players are close enough to each sector to hear about traffic
+    in it.
+
+    A player's area of interest is every sector within `radius` warps of their
+    ship. The neighbourhoods are worked out once from the warp graph, and moving
+    only updates the sectors that enter or leave the player's area, so finding
+    who to tell about a sector is a set lookup.
+    """
+
+    def __init__(self, radius: int):
+        self.radius = radius
+        self.neighbourhoods: dict[int, frozenset[int]] = {}
+        self.areas: dict[int, frozenset[int]] = {}
+        self.watchers: defaultdict[int, set[int]] = defaultdict(set)
+
+    def build(self, sectors: Iterable[Sector]):
+        warps = {sector.id: sector.warps for sector in sectors}
+        self.neighbourhoods = {
+            sector_id: self._within_radius(sector_id, warps) for sector_id in warps
+        }
+
+    def _within_radius(self, start: int, warps: dict[int, list[int]]) -> frozenset[int]:
+        seen = {start}
+        frontier = [start]
+        for _ in range(self.radius):
+            next_frontier = []
+            for sector_id in frontier:
+                for target in warps[sector_id]:
+                    if target not in seen:
+                        seen.add(target)
+                        next_frontier.append(target)
+            frontier = next_frontier
+        return frozenset(seen)
+
+    def enter(self, player_id: int, sector_id: int):
+        self.move(player_id, sector_id)
+
+    def move(self, player_id: int, sector_id: int):
+        old = self.areas.get(player_id, frozenset())
+        new = self.neighbourhoods[sector_id]
+        for left in old - new:
+            self.watchers[left].discard(player_id)
+        for entered in new - old:
+            self.watchers[entered].add(player_id)
+        self.areas[player_id] = new
+
+    def leave(self, player_id: int):
+        for sector_id in self.areas.pop(player_id, ()):
+            self.watchers[sector_id].discard(player_id)
+
+    def watching(self, *sector_ids: int) -> set[int]:
+        players = set()
+        for sector_id in sector_ids:
+            players |= self.watchers.get(sector_id, set())
+        return players
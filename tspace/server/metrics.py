@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from tspace.common.background import BackgroundTasks
+from tspace.common.metrics import Histogram
+
+if TYPE_CHECKING:
+    from tspace.server.server import Server
+
+
+def _label(value: str) -> str:
+    """
+    Escapes a label value, which may come from a client
+    """
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def render(server: Server) -> str:
+    """
+    Renders the server's metrics in the prometheus text exposition format
+    """
+    lines: list[str] = []
+
+    def metric(name: str, kind: str, help_text: str):
+        lines.append(f"# HELP tspace_{name} {help_text}")
+        lines.append(f"# TYPE tspace_{name} {kind}")
+
+    def histogram(name: str, hist: Histogram, labels: str = ""):
+        prefix = f"{labels}," if labels else ""
+        for bound, count in hist.cumulative():
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            lines.append(f'tspace_{name}_bucket{{{prefix}le="{le}"}} {count}')
+        suffix = f"{{{labels}}}" if labels else ""
+        lines.append(f"tspace_{name}_sum{suffix} {hist.sum}")
+        lines.append(f"tspace_{name}_count{suffix} {hist.count}")
+
+    methods = [
+        (_label(name), stats)
+        for name, stats in sorted(server.rpc_metrics.methods.items())
+    ]
+    metric("rpc_requests_total", "counter", "RPC requests handled, by method")
+    for name, stats in methods:
+        lines.append(f'tspace_rpc_requests_total{{method="{name}"}} {stats.calls}')
+    metric("rpc_errors_total", "counter", "RPC requests that failed, by method")
+    for name, stats in methods:
+        lines.append(f'tspace_rpc_errors_total{{method="{name}"}} {stats.errors}')
+    metric("rpc_rate_limited_total", "counter", "RPC requests rejected, by method")
+    for name, stats in methods:
+        lines.append(
+            f'tspace_rpc_rate_limited_total{{method="{name}"}} {stats.limited}'
+        )
+    metric("rpc_latency_seconds", "histogram", "RPC dispatch latency, by method")
+    for name, stats in methods:
+        histogram("rpc_latency_seconds", stats.latency, f'method="{name}"')
+
+    connected = sum(1 for session in server.sessions.values() if session.connected)
+    metric("sessions_active", "gauge", "Connected player sessions")
+    lines.append(f"tspace_sessions_active {connected}")
+    metric("sessions_detached", "gauge", "Disconnected sessions that can be resumed")
+    lines.append(f"tspace_sessions_detached {len(server.sessions) - connected}")
+
+    metric("rpc_requests_queued", "gauge", "RPC requests waiting to be dispatched")
+    lines.append(f"tspace_rpc_requests_queued {server.rpc_dispatcher.queued()}")
+
+    metric("background_tasks_pending", "gauge", "Background tasks not yet finished")
+    lines.append(
+        f"tspace_background_tasks_pending {len(BackgroundTasks.background_tasks)}"
+    )
+
+    game = server.game
+    metric("galaxy_entities", "gauge", "Entities in the galaxy, by kind")
+    for kind, entities in (
+        ("sectors", game.sectors),
+        ("ports", game.ports),
+        ("planets", game.planets),
+        ("players", game.players),
+        ("ships", game.ships),
+        ("battles", game.battles),
+    ):
+        lines.append(f'tspace_galaxy_entities{{kind="{kind}"}} {len(entities)}')
+
+    lag = server.loop_lag
+    metric("event_loop_lag_seconds", "histogram", "Event loop scheduling lag")
+    histogram("event_loop_lag_seconds", lag.lag)
+    metric("event_loop_lag_max_seconds", "gauge", "Largest event loop lag seen")
+    lines.append(f"tspace_event_loop_lag_max_seconds {lag.max_lag}")
+
+    watchdog = server.watchdog
+    metric(
+        "event_loop_stalls_total", "counter", "Event loop stalls, by what was running"
+    )
+    for source, count in sorted(watchdog.stalls.items()):
+        lines.append(
+            f'tspace_event_loop_stalls_total{{source="{_label(source)}"}} {count}'
+        )
+    metric("event_loop_stall_seconds", "histogram", "Duration of event loop stalls")
+    histogram("event_loop_stall_seconds", watchdog.stall_duration)
+
+    ticks = game.scheduler.metrics
+    metric("ticks_total", "counter", "Game loop ticks run")
+    lines.append(f"tspace_ticks_total {ticks.ticks}")
+    metric("tick_overruns_total", "counter", "Game loop ticks that ran late")
+    lines.append(f"tspace_tick_overruns_total {ticks.overruns}")
+    metric("tick_duration_seconds", "gauge", "Duration of the last game loop tick")
+    lines.append(f"tspace_tick_duration_seconds {ticks.last_duration}")
+    metric("tick_duration_max_seconds", "gauge", "Longest game loop tick")
+    lines.append(f"tspace_tick_duration_max_seconds {ticks.max_duration}")
+    metric("tick_phase_deferrals_total", "counter", "Phase runs deferred, by phase")
+    for name, phase in ticks.phases.items():
+        lines.append(
+            f'tspace_tick_phase_deferrals_total{{phase="{name}"}} {phase.deferrals}'
+        )
+
+    lines.append("")
+    return "\n".join(lines)
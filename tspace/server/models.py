@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import enum
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import List, Dict, Tuple
 from typing import Optional, TYPE_CHECKING
 
@@ -12,6 +12,7 @@ from tspace.common.models import (
     TradingCommodityPublic,
     PortPublic,
     SectorPublic,
+    SectorSummaryPublic,
     PlanetPublic,
     TraderShipPublic,
     CommodityType,
@@ -19,9 +20,11 @@ from tspace.common.models import (
     ShipType,
     BattlePublic,
     DroneType,
-    RelativeStrength, CombatantPublic,
+    RelativeStrength, CombatantPublic, BattleOddsPublic,
 )
 
+from tspace.server.combat import BattleResult, Combatant
+
 if TYPE_CHECKING:
     from tspace.server.galaxy import Galaxy
 
@@ -29,6 +32,40 @@ if TYPE_CHECKING:
 @dataclass
 class SessionContext:
     player: Player
+    # memoized relative strengths by ship id, only set for the life of a broadcast
+    relative_strengths: dict[int, RelativeStrength] | None = None
+
+    @classmethod
+    def for_broadcast(cls, player: Player) -> SessionContext:
+        return cls(player=player, relative_strengths={})
+
+    def relative_strength(self, ship: Ship) -> RelativeStrength:
+        if self.relative_strengths is None:
+            return self.player.ship.get_relative_strength(ship)
+
+        strength = self.relative_strengths.get(ship.id)
+        if strength is None:
+            strength = self.player.ship.get_relative_strength(ship)
+            self.relative_strengths[ship.id] = strength
+        return strength
+
+    def battle_odds(self, ship: Ship) -> BattleOddsPublic | None:
+        own_ship = self.player.ship
+        if ship.id == own_ship.id:
+            return None
+
+        # only odds simulated ahead of time, see Galaxy.prefetch_odds, building
+        # a view never waits on a simulation
+        odds = self.player.galaxy.battle_odds.cached(
+            own_ship.to_combat(), ship.to_combat()
+        )
+        if odds is None:
+            return None
+        return BattleOddsPublic(
+            win_probability=round(odds.win_probability, 2),
+            expected_losses=round(odds.attacker_losses, 1),
+            expected_kills=round(odds.target_losses, 1),
+        )
 
 
 class Planet:
@@ -83,9 +120,13 @@ COMMODITY_COSTS = {
 class TradingCommodity:
     def __init__(self, type: CommodityType, amount: int, buying: bool):
         self.type: CommodityType = type
-        self.amount = amount
         self.buying = buying
         self.capacity = amount
+        self._cost = COMMODITY_COSTS[type]
+        self.amount = amount
+        # the price and the (amount, capacity, buying) it was calculated for
+        self._price: float = 0.0
+        self._price_key: tuple[int, int, bool] | None = None
 
     def to_public(self, context: SessionContext) -> TradingCommodityPublic:
         return TradingCommodityPublic(
@@ -97,8 +138,15 @@ class TradingCommodity:
         )
 
     @property
-    def price(self):
-        cost = COMMODITY_COSTS[self.type]
+    def price(self) -> float:
+        key = (self.amount, self.capacity, self.buying)
+        if key != self._price_key:
+            self._price = self._calculate_price()
+            self._price_key = key
+        return self._price
+
+    def _calculate_price(self) -> float:
+        cost = self._cost
         if self.buying:
             return round(
                 cost.buy_offer + ((self.amount / self.capacity) * cost.buy_offer) / 2,
@@ -132,7 +180,10 @@ class PortClass(enum.Enum):
 
     @classmethod
     def by_id(cls, id: int):
-        return next(e for e in cls if e.id == id)
+        return _PORT_CLASSES_BY_ID[id]
+
+
+_PORT_CLASSES_BY_ID: dict[int, PortClass] = {e.id: e for e in PortClass}
 
 
 class Port:
@@ -140,7 +191,9 @@ class Port:
         self, id: int, sector_id: int, name: str, commodities: List[TradingCommodity]
     ):
         self.id = id
-        self.commodities = commodities
+        self.commodities: Dict[CommodityType, TradingCommodity] = {
+            c.type: c for c in commodities
+        }
         self.name = name
         self.sector_id = sector_id
 
@@ -149,11 +202,16 @@ class Port:
             id=self.id,
             name=self.name,
             sector_id=self.sector_id,
-            commodities=[c.to_public(context) for c in self.commodities],
+            commodities=[c.to_public(context) for c in self.commodities.values()],
         )
 
-    def commodity(self, type: CommodityType):
-        return next(c for c in self.commodities if c.type == type)
+    def commodity(self, type: CommodityType) -> TradingCommodity:
+        return self.commodities[type]
+
+    def regenerate(self, rate: float):
+        for c in self.commodities.values():
+            if c.amount < c.capacity:
+                c.amount = min(c.capacity, c.amount + max(1, int(c.capacity * rate)))
 
 
 class Sector:
@@ -185,6 +243,16 @@ class Sector:
             planets=[planet.to_public(context) for planet in self.planets],
         )
 
+    def to_summary(self, context: SessionContext) -> SectorSummaryPublic:
+        return SectorSummaryPublic(
+            id=self.id,
+            coords=self.coords,
+            warps=self.warps,
+            ports=len(self.port_ids),
+            planets=len(self.planet_ids),
+            ships=len(self.ship_ids),
+        )
+
     def can_warp(self, sector_id):
         return sector_id in self.warps
 
@@ -267,6 +335,20 @@ class Battle:
         self.sector_id = sector_id
         self.attacker_ship_id = attacker_ship_id
         self.target_ship_id = target_ship_id
+        self.result: BattleResult | None = None
+        # each ship's stacks with their sizes as the battle started, by ship id
+        self.stacks: dict[int, list[tuple[DroneStack, int]]] = {}
+
+    def engage(self) -> tuple[Combatant, Combatant]:
+        """
+        The attacker and target as they go into battle
+        """
+        combatants = []
+        for ship_id in (self.attacker_ship_id, self.target_ship_id):
+            ship = self.game.ships[ship_id]
+            self.stacks[ship_id] = [(stack, stack.size) for stack in ship.drones]
+            combatants.append(ship.to_combat())
+        return combatants[0], combatants[1]
 
     def to_public(self, context: SessionContext) -> BattlePublic:
         return BattlePublic(
@@ -276,15 +358,47 @@ class Battle:
             target=self.game.ships[self.target_ship_id].to_combatant(context),
         )
 
+    def finish(self, result: BattleResult):
+        self.result = result
+        for ship_id, sizes in (
+            (self.attacker_ship_id, result.attacker_sizes),
+            (self.target_ship_id, result.target_sizes),
+        ):
+            ship = self.game.ships[ship_id]
+            # the losses go to the stacks that fought, stacks the ship gained
+            # or lost since are left as they are
+            for (stack, start_size), size in zip(self.stacks.get(ship_id, ()), sizes):
+                if stack.ship is not ship:
+                    continue
+                stack.size = max(0, stack.size - (start_size - size))
+                if not stack.size:
+                    ship.remove_drones(stack)
+            ship.battle = None
+
 
 class DroneStack:
     def __init__(self, drone_type: DroneType, size: int = 1):
         self.drone_type = drone_type
-        self.size = size
+        self.ship: Ship | None = None
+        self._size = size
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @size.setter
+    def size(self, value: int):
+        if self.ship:
+            self.ship.strength += (value - self._size) * self.drone_type.leadership
+        self._size = value
+
+    @property
+    def strength(self) -> int:
+        return self._size * self.drone_type.leadership
 
     def to_public(self, context: SessionContext):
         return DroneStackPublic(
-            drone_type=self.drone_type,
+            drone_type_id=self.drone_type.id,
             size=self.size,
         )
 
@@ -310,9 +424,12 @@ class Ship:
         self.ship_type = ship_type
         self.sector_id = sector_id
         self.game = game
-        self.drones = drones
+        self.drones: list[DroneStack] = []
+        # sum of the leadership of all drones, kept up to date by the stacks
+        self.strength = 0
         self.battle_id: int | None = None
-        assert len(self.drones) <= self.type.drone_stack_max
+        for stack in drones:
+            self.add_drones(stack)
 
     def to_public(self, context: SessionContext) -> ShipPublic:
         return ShipPublic(
@@ -335,14 +452,21 @@ class Ship:
             drones=[d.to_public(context) for d in self.drones],
         )
 
+    def to_combat(self) -> Combatant:
+        return Combatant(
+            ship_type=self.ship_type,
+            stacks=[(stack.drone_type, stack.size) for stack in self.drones],
+        )
+
     def to_trader(self, context: SessionContext) -> TraderShipPublic:
         return TraderShipPublic(
             id=self.id,
             name=self.name,
-            type=self.ship_type,
+            type_id=self.ship_type.id,
             trader=self.player.to_trader(context),
-            relative_strength=context.player.ship.get_relative_strength(self),
-            in_battle=bool(self.battle_id is not None)
+            relative_strength=context.relative_strength(self),
+            in_battle=bool(self.battle_id is not None),
+            odds=context.battle_odds(self),
         )
 
     @property
@@ -353,15 +477,24 @@ class Ship:
     def battle(self, value: Battle | None):
         self.battle_id = value.id if value else None
 
+    def add_drones(self, stack: DroneStack):
+        assert stack.ship is None
+        assert len(self.drones) < self.type.drone_stack_max
+        stack.ship = self
+        self.drones.append(stack)
+        self.strength += stack.strength
+
+    def remove_drones(self, stack: DroneStack):
+        self.drones.remove(stack)
+        self.strength -= stack.strength
+        stack.ship = None
+
     def get_relative_strength(self, other_ship: Ship) -> RelativeStrength:
-        self_strength = sum(
-            stack.size * stack.drone_type.leadership for stack in self.drones
-        )
-        other_strength = sum(
-            stack.size * stack.drone_type.leadership for stack in other_ship.drones
-        )
+        total_strength = self.strength + other_ship.strength
+        if not total_strength:
+            return RelativeStrength.EVEN
 
-        relative_strength = int(other_strength / (self_strength + other_strength) * 100)
+        relative_strength = int(other_ship.strength / total_strength * 100)
 
         for strength in RelativeStrength:
             if relative_strength >= strength.percentage:
@@ -8,21 +8,24 @@ from tspace.common.models import (
     PlayerPublic,
     SectorPublic,
     TraderShipPublic,
-    PortPublic, BattlePublic,
+    PortPublic, BattlePublic, ShipTrafficPublic, GalaxyMapPublic,
 )
 from tspace.common.actions import SectorActions, PortActions
 from tspace.server.builders import battles
 from tspace.server.galaxy import Galaxy
-from tspace.server.models import CommodityType, SessionContext, Ship, Battle
+from tspace.server.models import CommodityType, SessionContext, Ship, Battle, Sector
 from tspace.server.models import Player
 from tspace.server.models import Port
 
+if typing.TYPE_CHECKING:
+    from tspace.server.sessions import Session
+
 
 # @methods_to_json()
 class ShipMoves(SectorActions, PortActions):
     def __init__(
         self,
-        sessions: typing.Callable[[], dict[int, ServerEvents]],
+        sessions: typing.Callable[[], dict[int, "Session"]],
         context: SessionContext,
         galaxy: Galaxy,
         events: ServerEvents,
@@ -53,19 +56,14 @@ class ShipMoves(SectorActions, PortActions):
             target.enter_ship(ship)
             ship.move_sector(target.id)
             self.player.visit_sector(target.id)
+            self.galaxy.interest.move(self.player.id, target.id)
+            await self.galaxy.prefetch_odds(target)
             target_public = target.to_public(self.context)
 
             async def do_after():
-                ship_as_trader = ship.to_trader()
-                for ship_other in (
-                    s for s in ship_sector.ships if s.player_id != self.player.id
-                ):
-                    if ship_other.player_id in self.sessions():
-                        await self.sessions()[ship_other.player_id].on_ship_exit_sector(
-                            sector=ship_sector.to_public(self.context), ship=ship_as_trader
-                        )
-
-                await self._broadcast_ship_enter_sector(ship_as_trader, target_public)
+                await self._broadcast_ship_exit_sector(ship, ship_sector)
+                await self._broadcast_ship_enter_sector(ship, target)
+                await self._broadcast_ship_traffic(ship, ship_sector, target)
 
             schedule_background_task(do_after())
             return target_public
@@ -73,18 +71,72 @@ class ShipMoves(SectorActions, PortActions):
             traceback.print_exc()
 
     async def _broadcast_player_enter_sector(self, player: Player):
-        await self._broadcast_ship_enter_sector(
-            player.ship.to_trader(self.context), player.sector.to_public(self.context)
-        )
-
-    async def _broadcast_ship_enter_sector(
-        self, ship_as_trader: TraderShipPublic, target: SectorPublic
+        await self._broadcast_ship_enter_sector(player.ship, player.sector)
+
+    def _broadcast_recipients(
+        self, ship: Ship, sector: Sector
+    ) -> typing.Iterator[tuple[ServerEvents, SessionContext]]:
+        sessions = self.sessions()
+        for other in sector.ships:
+            if other.player_id != ship.player_id and other.player_id in sessions:
+                # a fresh context per recipient so relative strengths are
+                # calculated once per (viewer, ship) pair for this broadcast
+                context = SessionContext.for_broadcast(other.player)
+                yield sessions[other.player_id].events, context
+
+    async def _broadcast_ship_exit_sector(self, ship: Ship, sector: Sector):
+        await self.galaxy.prefetch_odds(sector)
+        for events, context in self._broadcast_recipients(ship, sector):
+            await events.on_ship_exit_sector(
+                sector=sector.to_public(context), ship=ship.to_trader(context)
+            )
+
+    async def _broadcast_ship_enter_sector(self, ship: Ship, sector: Sector):
+        await self.galaxy.prefetch_odds(sector)
+        for events, context in self._broadcast_recipients(ship, sector):
+            await events.on_ship_enter_sector(
+                sector=sector.to_public(context), ship=ship.to_trader(context)
+            )
+
+    async def _broadcast_ship_traffic(
+        self, ship: Ship, from_sector: Sector, to_sector: Sector
     ):
-        for ship in (s for s in target.ships if s.trader.id != self.player.id):
-            if ship.trader.id in self.sessions():
-                await self.sessions()[ship.trader.id].on_ship_enter_sector(
-                    sector=target, ship=ship_as_trader
+        sessions = self.sessions()
+        sector_ids = (from_sector.id, to_sector.id)
+        traffic = None
+        for player_id in self.galaxy.interest.watching(*sector_ids):
+            session = sessions.get(player_id)
+            if session is None or player_id == ship.player_id:
+                continue
+            # players in either sector already hear about it from the sector events
+            if session.player.ship.sector_id in sector_ids:
+                continue
+
+            if traffic is None:
+                traffic = ShipTrafficPublic(
+                    ship_id=ship.id,
+                    ship_name=ship.name,
+                    trader=ship.player.to_trader(self.context),
+                    from_sector_id=from_sector.id,
+                    to_sector_id=to_sector.id,
                 )
+            await session.events.on_ship_traffic(traffic=traffic)
+
+    async def get_galaxy_map(self, radius: int, **kwargs) -> GalaxyMapPublic:
+        if not 0 <= radius <= self.galaxy.config.map_max_radius:
+            raise InvalidActionError(
+                f"Map radius must be between 0 and {self.galaxy.config.map_max_radius}"
+            )
+
+        center_id = self.player.ship.sector_id
+        return GalaxyMapPublic(
+            center_sector_id=center_id,
+            radius=radius,
+            sectors=[
+                sector.to_summary(self.context)
+                for sector in self.galaxy.sectors_within(center_id, radius)
+            ],
+        )
 
     async def enter_port(
         self, port_id: int, **kwargs
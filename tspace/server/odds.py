@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import asyncio
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Iterable
+
+import numpy as np
+
+from tspace.server.combat import Combatant, Side, attack_modifier
+from tspace.server.executor import Pool, offload
+
+SIMULATIONS = 2000
+MAX_ROUNDS = 50
+CACHE_SIZE = 4096
+
+
+@dataclass(frozen=True)
+class BattleOdds:
+    win_probability: float
+    # expected number of drones each side loses
+    attacker_losses: float
+    target_losses: float
+
+
+class BattleOddsEstimator:
+    """
+    Estimates the outcome of a battle by running many simplified battles at once.
+
+    The simulation skips movement: every round, each stack in initiative order
+    attacks the first enemy stack still alive. Results are cached by the
+    composition of both sides, so showing the odds for the same fleets again
+    costs a dictionary lookup.
+    """
+
+    def __init__(
+        self,
+        simulations: int = SIMULATIONS,
+        cache_size: int = CACHE_SIZE,
+        seed: int = 0,
+    ):
+        self.simulations = simulations
+        self.cache_size = cache_size
+        self.seed = seed
+        self._cache: OrderedDict[tuple, BattleOdds] = OrderedDict()
+
+    def estimate(self, attacker: Combatant, target: Combatant) -> BattleOdds:
+        attacker, target = _in_canonical_order(attacker), _in_canonical_order(target)
+        key = (_canonical(attacker), _canonical(target))
+        odds = self.cached(attacker, target)
+        if odds is None:
+            odds = simulate(attacker, target, self._rng(key), self.simulations)
+            self._store(key, odds)
+        return odds
+
+    def cached(self, attacker: Combatant, target: Combatant) -> BattleOdds | None:
+        """
+        The odds if they've been estimated already, without simulating
+        """
+        key = (_canonical(attacker), _canonical(target))
+        odds = self._cache.get(key)
+        if odds is not None:
+            self._cache.move_to_end(key)
+        return odds
+
+    async def prefetch(self, pairs: Iterable[tuple[Combatant, Combatant]]):
+        """
+        Simulates any of the pairs not cached yet in the thread pool, so that
+        estimating them afterwards is a lookup
+        """
+        jobs = {}
+        for attacker, target in pairs:
+            attacker = _in_canonical_order(attacker)
+            target = _in_canonical_order(target)
+            key = (_canonical(attacker), _canonical(target))
+            if key not in self._cache and key not in jobs:
+                jobs[key] = simulate.offloaded(
+                    attacker, target, self._rng(key), self.simulations
+                )
+
+        if jobs:
+            for key, odds in zip(jobs, await asyncio.gather(*jobs.values())):
+                self._store(key, odds)
+
+    def _rng(self, key: tuple) -> np.random.Generator:
+        # seeded by the composition, so the same fleets always get the same odds
+        return np.random.default_rng([self.seed, zlib.crc32(repr(key).encode())])
+
+    def _store(self, key: tuple, odds: BattleOdds):
+        self._cache[key] = odds
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def clear(self):
+        self._cache.clear()
+
+
+def _in_canonical_order(combatant: Combatant) -> Combatant:
+    # the simulation depends on the order of the stacks, through ties in
+    # initiative and which enemy stack is first, so fleets that are cached as
+    # the same are simulated in the same order
+    return Combatant(
+        combatant.ship_type,
+        sorted(
+            ((drone_type, size) for drone_type, size in combatant.stacks if size > 0),
+            key=lambda stack: (stack[0].name, stack[1]),
+        ),
+    )
+
+
+def _canonical(combatant: Combatant) -> tuple:
+    ship = combatant.ship_type
+    return (
+        ship.name,
+        ship.attack,
+        ship.defense,
+        ship.initiative,
+        tuple(
+            sorted(
+                (drone_type.name, size)
+                for drone_type, size in combatant.stacks
+                if size > 0
+            )
+        ),
+    )
+
+
+@offload(Pool.THREAD)
+def simulate(
+    attacker: Combatant, target: Combatant, rng: np.random.Generator, simulations: int
+) -> BattleOdds:
+    side, attack, defense, health, low, high, initiative, sizes = ([] for _ in range(8))
+    for combatant_side, combatant in enumerate((attacker, target)):
+        ship = combatant.ship_type
+        for drone_type, size in combatant.stacks:
+            if size <= 0:
+                continue
+            side.append(combatant_side)
+            attack.append(drone_type.attack + ship.attack)
+            defense.append(drone_type.defense + ship.defense)
+            health.append(drone_type.health)
+            low.append(drone_type.damage_range[0])
+            high.append(drone_type.damage_range[1])
+            initiative.append(drone_type.initiative + ship.initiative)
+            sizes.append(size)
+
+    side = np.array(side)
+    attacker_stacks = side == Side.ATTACKER
+    target_stacks = side == Side.TARGET
+    if not attacker_stacks.any() or not target_stacks.any():
+        return BattleOdds(
+            win_probability=float(not target_stacks.any() and attacker_stacks.any()),
+            attacker_losses=0.0,
+            target_losses=0.0,
+        )
+
+    health = np.array(health)
+    sizes = np.array(sizes)
+    attack = np.array(attack)
+    defense = np.array(defense)
+    modifiers = attack_modifier(attack[:, None], defense[None, :])
+    order = np.argsort(-np.array(initiative), kind="stable")
+    enemies = [np.flatnonzero(side != side[actor]) for actor in range(len(side))]
+
+    hp = np.tile(sizes * health, (simulations, 1))
+    sims = np.arange(simulations)
+
+    for _ in range(MAX_ROUNDS):
+        for actor in order:
+            actor_alive = hp[:, actor] > 0
+            enemy_alive = hp[:, enemies[actor]] > 0
+            acting = actor_alive & enemy_alive.any(axis=1)
+            if not acting.any():
+                continue
+
+            target_idx = enemies[actor][enemy_alive.argmax(axis=1)]
+            rolls = rng.integers(low[actor], high[actor] + 1, size=simulations)
+            size = -(-hp[:, actor] // health[actor])
+            damage = (size * rolls * modifiers[actor, target_idx]).astype(np.int64)
+            hp[sims, target_idx] -= np.where(acting, damage, 0)
+            np.maximum(hp, 0, out=hp)
+
+        alive = hp > 0
+        if not (
+            alive[:, attacker_stacks].any(axis=1) & alive[:, target_stacks].any(axis=1)
+        ).any():
+            break
+
+    alive = hp > 0
+    won = alive[:, attacker_stacks].any(axis=1) & ~alive[:, target_stacks].any(axis=1)
+    losses = sizes - (-(-hp // health))
+    return BattleOdds(
+        win_probability=float(won.mean()),
+        attacker_losses=float(losses[:, attacker_stacks].sum(axis=1).mean()),
+        target_losses=float(losses[:, target_stacks].sum(axis=1).mean()),
+    )
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import asyncio
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from types import FrameType
+
+from tspace.client.logging import log
+from tspace.common.tracing import ChromeTraceRecorder
+
+MAX_SECONDS = 300
+SAMPLE_INTERVAL = 0.005
+
+
+class ProfilerBusy(Exception):
+    pass
+
+
+class StackSampler:
+    """
+    Statistical profiler: a thread that periodically looks at what the event loop
+    thread is running. Much cheaper than cProfile for the loop itself, at the cost
+    of missing anything shorter than the sampling interval.
+    """
+
+    def __init__(self, thread_id: int, interval: float = SAMPLE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._run, name="stack-sampler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.stacks[collapse(frame)] += 1
+
+    def write_collapsed(self, path: str):
+        # the "folded" format read by flamegraph.pl and speedscope
+        with open(path, "w") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+def collapse(frame: FrameType | None) -> str:
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        location = f"{os.path.basename(code.co_filename)}:{code.co_firstlineno}"
+        names.append(f"{code.co_name} ({location})")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class Profiler:
+    """
+    Runs one profiling session at a time for a number of seconds while the
+    server keeps going, then writes the result to the output directory.
+    """
+
+    def __init__(self, output_dir: str):
+        self.output_dir = output_dir
+        self._lock = asyncio.Lock()
+
+    @property
+    def busy(self) -> bool:
+        return self._lock.locked()
+
+    def _path(self, kind: str, suffix: str) -> str:
+        os.makedirs(self.output_dir, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        return os.path.join(self.output_dir, f"tspace-{kind}-{stamp}.{suffix}")
+
+    async def _exclusive(self):
+        if self.busy:
+            raise ProfilerBusy("A profiling session is already running")
+        await self._lock.acquire()
+
+    async def profile(self, seconds: float) -> tuple[str, str]:
+        """
+        Runs cProfile over the event loop thread, returning the path of the
+        pstats dump and a summary of the most expensive functions.
+        """
+        seconds = min(seconds, MAX_SECONDS)
+        await self._exclusive()
+        try:
+            log.info(f"Profiling for {seconds}s")
+            profile = cProfile.Profile()
+            profile.enable()
+            try:
+                await asyncio.sleep(seconds)
+            finally:
+                profile.disable()
+
+            path = self._path("profile", "pstats")
+            profile.dump_stats(path)
+            summary = io.StringIO()
+            pstats.Stats(profile, stream=summary).sort_stats("cumulative").print_stats(
+                30
+            )
+            return path, summary.getvalue()
+        finally:
+            self._lock.release()
+
+    async def sample(
+        self, seconds: float, interval: float = SAMPLE_INTERVAL
+    ) -> tuple[str, str]:
+        """
+        Samples the event loop thread's stack, returning the path of the folded
+        stacks and the most common of them.
+        """
+        seconds = min(seconds, MAX_SECONDS)
+        await self._exclusive()
+        try:
+            log.info(f"Sampling for {seconds}s")
+            sampler = StackSampler(threading.get_ident(), interval)
+            sampler.start()
+            try:
+                await asyncio.sleep(seconds)
+            finally:
+                # joining takes at most one interval
+                sampler.stop()
+
+            path = self._path("samples", "folded")
+            sampler.write_collapsed(path)
+            summary = "\n".join(
+                f"{count:>6} {';'.join(stack.split(';')[-3:])}"
+                for stack, count in sampler.stacks.most_common(20)
+            )
+            return path, summary
+        finally:
+            self._lock.release()
+
+    async def trace(self, tracer: ChromeTraceRecorder, seconds: float) -> str:
+        """
+        Records RPC spans, returning the path of the Chrome trace file.
+        """
+        seconds = min(seconds, MAX_SECONDS)
+        await self._exclusive()
+        try:
+            log.info(f"Tracing for {seconds}s")
+            tracer.start()
+            try:
+                await asyncio.sleep(seconds)
+            finally:
+                tracer.stop()
+
+            path = self._path("trace", "json")
+            tracer.export(path)
+            return path
+        finally:
+            self._lock.release()
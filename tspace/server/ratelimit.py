@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import asyncio
+import time
+import weakref
+from collections import deque
+from dataclasses import dataclass
+from typing import Protocol
+
+from tspace.client.logging import log
+from tspace.common.errors import RateLimitedError
+from tspace.common.metrics import UNKNOWN_METHOD, RpcMetrics
+from tspace.common.rpc import ClientAndServer
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    # sustained calls per second, and how many can be made at once after a pause
+    rate: float
+    burst: int
+
+
+DEFAULT_LIMIT = RateLimit(rate=20, burst=40)
+DEFAULT_METHOD_LIMITS = {
+    "move_trader": RateLimit(rate=5, burst=10),
+    "buy_from_port": RateLimit(rate=5, burst=10),
+    "sell_to_port": RateLimit(rate=5, burst=10),
+}
+
+
+class TokenBucket:
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, limit: RateLimit, now: float):
+        self.rate = limit.rate
+        self.capacity = limit.burst
+        self.tokens = float(limit.burst)
+        self.updated = now
+
+    def take(self, now: float) -> bool:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+
+class RpcSession(Protocol):
+    api: ClientAndServer
+
+
+class _SessionQueue:
+    __slots__ = ("session", "pending", "scheduled", "buckets")
+
+    def __init__(self, session: RpcSession):
+        self.session = session
+        self.pending: deque[tuple[str, dict]] = deque()
+        # whether the session is waiting in the ready queue or being served
+        self.scheduled = False
+        self.buckets: dict[str, TokenBucket] = {}
+
+
+class FairDispatcher:
+    """
+    Sits in front of each session's pjrpc dispatcher, so one busy client can't
+    starve the others.
+
+    Requests over a session's per-method rate limit, or beyond its queue size,
+    are answered straight away with a RateLimitedError. The rest are queued per
+    session, and workers take one request from each session with work in turn.
+    A session only ever has one request running, so its requests are handled
+    in order.
+    """
+
+    def __init__(
+        self,
+        limits: dict[str, RateLimit] | None = None,
+        default_limit: RateLimit = DEFAULT_LIMIT,
+        queue_size: int = 32,
+        workers: int = 4,
+        metrics: RpcMetrics | None = None,
+    ):
+        self.limits = {**DEFAULT_METHOD_LIMITS, **(limits or {})}
+        self.default_limit = default_limit
+        self.queue_size = queue_size
+        self.workers = workers
+        self.metrics = metrics
+        self._queues: weakref.WeakKeyDictionary[RpcSession, _SessionQueue] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._ready: asyncio.Queue[_SessionQueue] | None = None
+        self._tasks: list[asyncio.Task] = []
+
+    @property
+    def running(self) -> bool:
+        return any(not task.done() for task in self._tasks)
+
+    def start(self):
+        if not self.running:
+            self._ready = asyncio.Queue()
+            self._tasks = [
+                asyncio.create_task(self._work()) for _ in range(self.workers)
+            ]
+
+    def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+
+    def queued(self) -> int:
+        return sum(len(queue.pending) for queue in self._queues.values())
+
+    async def submit(self, session: RpcSession, text: str, data: dict):
+        queue = self._queues.get(session)
+        if queue is None:
+            queue = self._queues[session] = _SessionQueue(session)
+
+        method = data.get("method", "")
+        if len(queue.pending) >= self.queue_size:
+            await self._reject(queue, data, "Too many requests waiting")
+            return
+
+        # clients can name any method they like, so the ones that don't exist
+        # share a bucket rather than each getting a fresh one
+        key = method if queue.session.api.handles(method) else UNKNOWN_METHOD
+        bucket = queue.buckets.get(key)
+        now = time.monotonic()
+        if bucket is None:
+            limit = self.limits.get(key, self.default_limit)
+            bucket = queue.buckets[key] = TokenBucket(limit, now)
+        if not bucket.take(now):
+            await self._reject(queue, data, f"Too many {key} requests")
+            return
+
+        queue.pending.append((text, data))
+        if not queue.scheduled:
+            queue.scheduled = True
+            self._ready.put_nowait(queue)
+
+    async def _reject(self, queue: _SessionQueue, data: dict, message: str):
+        if self.metrics:
+            self.metrics.method(data.get("method", "")).limited += 1
+        await queue.session.api.reject(data, RateLimitedError(message))
+
+    async def _work(self):
+        while True:
+            queue = await self._ready.get()
+            text, data = queue.pending.popleft()
+            try:
+                await queue.session.api.handle_request(text, data)
+            except Exception:
+                log.exception("Failed handling request")
+
+            # back of the line, behind every other session with work waiting
+            if queue.pending:
+                self._ready.put_nowait(queue)
+            else:
+                queue.scheduled = False
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator
+
+from tspace.client.logging import log
+from tspace.common.watchdog import activity
+
+# a phase's work either does everything when called, or returns an iterator that
+# does one unit of work per step so it can be spread over several ticks
+PhaseWork = Callable[[], Iterator[Any] | Any]
+
+
+@dataclass
+class PhaseMetrics:
+    runs: int = 0
+    deferrals: int = 0
+    errors: int = 0
+    last_duration: float = 0.0
+    max_duration: float = 0.0
+    total_duration: float = 0.0
+
+    def record(self, duration: float):
+        self.last_duration = duration
+        self.max_duration = max(self.max_duration, duration)
+        self.total_duration += duration
+
+
+@dataclass
+class TickMetrics:
+    ticks: int = 0
+    overruns: int = 0
+    last_duration: float = 0.0
+    max_duration: float = 0.0
+    total_duration: float = 0.0
+    phases: dict[str, PhaseMetrics] = field(default_factory=dict)
+
+    def record(self, duration: float):
+        self.ticks += 1
+        self.last_duration = duration
+        self.max_duration = max(self.max_duration, duration)
+        self.total_duration += duration
+
+    @property
+    def mean_duration(self) -> float:
+        return self.total_duration / self.ticks if self.ticks else 0.0
+
+
+class Phase:
+    def __init__(self, name: str, work: PhaseWork, every: int, budget: float):
+        self.name = name
+        self.work = work
+        self.every = every
+        self.budget = budget
+        self.metrics = PhaseMetrics()
+        # whether the phase should start a new run when there is time for it
+        self.due = False
+        self._pending: Iterator[Any] | None = None
+
+    @property
+    def deferred(self) -> bool:
+        return self._pending is not None
+
+
+class Scheduler:
+    """
+    Runs periodic galaxy work at a fixed tick rate.
+
+    Each tick runs the registered phases in order, giving each its own time
+    budget. A phase that runs out of budget, or that would start after the tick's
+    budget is spent, picks up where it left off on the next tick. Control goes
+    back to the event loop between phases so RPC handling isn't held up.
+    """
+
+    def __init__(self, interval: float, tick_budget: float | None = None):
+        self.interval = interval
+        self.tick_budget = tick_budget if tick_budget is not None else interval / 2
+        self.phases: list[Phase] = []
+        self.tick = 0
+        self.metrics = TickMetrics()
+        self._task: asyncio.Task | None = None
+
+    def add_phase(
+        self, name: str, work: PhaseWork, every: int = 1, budget: float = 0.005
+    ) -> Phase:
+        phase = Phase(name, work, every=every, budget=budget)
+        self.phases.append(phase)
+        self.metrics.phases[name] = phase.metrics
+        return phase
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        if not self.running:
+            self._task = asyncio.create_task(self.run())
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        while True:
+            await self.run_tick()
+
+            next_tick += self.interval
+            delay = next_tick - loop.time()
+            if delay < 0:
+                # don't try to catch up on missed ticks, just start the next now
+                self.metrics.overruns += 1
+                next_tick = loop.time()
+                delay = 0
+            await asyncio.sleep(delay)
+
+    async def run_tick(self):
+        # only time spent in phases counts, not time other tasks ran in between
+        worked = 0.0
+        for phase in self.phases:
+            if self.tick % phase.every == 0:
+                phase.due = True
+            if not phase.due and not phase.deferred:
+                continue
+
+            if worked >= self.tick_budget:
+                phase.metrics.deferrals += 1
+                continue
+
+            start = time.perf_counter()
+            with activity(f"phase {phase.name}"):
+                if not phase.deferred:
+                    phase.due = False
+                    self._begin(phase)
+                if phase.deferred:
+                    self._run_slice(phase, deadline=start + phase.budget)
+            duration = time.perf_counter() - start
+            phase.metrics.record(duration)
+            worked += duration
+
+            await asyncio.sleep(0)
+
+        self.tick += 1
+        self.metrics.record(worked)
+
+    def _begin(self, phase: Phase):
+        phase.metrics.runs += 1
+        try:
+            work = phase.work()
+        except Exception:
+            phase.metrics.errors += 1
+            log.exception(f"Scheduled phase {phase.name} failed")
+            return
+
+        if isinstance(work, Iterator):
+            phase._pending = work
+
+    def _run_slice(self, phase: Phase, deadline: float):
+        try:
+            while True:
+                next(phase._pending)
+                if time.perf_counter() >= deadline:
+                    phase.metrics.deferrals += 1
+                    break
+        except StopIteration:
+            phase._pending = None
+        except Exception:
+            phase._pending = None
+            phase.metrics.errors += 1
+            log.exception(f"Scheduled phase {phase.name} failed")
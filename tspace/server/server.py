@@ -1,41 +1,177 @@
+import asyncio
+import functools
+import time
 from typing import Awaitable, TypeVar
 from typing import Callable
-from typing import Dict
+from typing import Dict, Optional
 
+from tspace.common.background import schedule_background_task
+from tspace.common.metrics import LoopLagMonitor, RpcMetrics
+from tspace.common.models import TypeCatalogPublic
 from tspace.common.rpc import ClientAndServer
+from tspace.common.tracing import ChromeTraceRecorder
+from tspace.common.watchdog import LoopWatchdog
+from tspace.server.builders.drones import DRONE_TYPES
+from tspace.server.builders.ships import SHIP_TYPES
 from tspace.server.config import GameConfig
+from tspace.server.executor import get_workers
 from tspace.server.galaxy import Galaxy
-from tspace.server.models import SessionContext
+from tspace.server.models import Battle, SessionContext
 from tspace.server.moves import ShipMoves, ServerEvents
+from tspace.server.profiling import Profiler
+from tspace.server.ratelimit import FairDispatcher
+from tspace.server.sessions import Session
 
 T = TypeVar("T")
 
+# how often to look for sessions to evict
+SESSION_SWEEP_SECONDS = 10
+
+TYPE_CATALOG = TypeCatalogPublic(
+    ship_types=list(SHIP_TYPES.values()),
+    drone_types=list(DRONE_TYPES.values()),
+)
+
 
 class Server:
     def __init__(self, config: GameConfig):
         self.config = config
-        self.sessions: Dict[int, ServerEvents] = {}
+        # by player id, including detached sessions that can still be resumed
+        self.sessions: Dict[int, Session] = {}
+        self._sessions_by_token: Dict[str, Session] = {}
+        self.rpc_metrics = RpcMetrics()
+        self.rpc_dispatcher = FairDispatcher(
+            limits=config.rpc_rate_limits,
+            queue_size=config.rpc_queue_size,
+            workers=config.rpc_workers,
+            metrics=self.rpc_metrics,
+        )
+        self.loop_lag = LoopLagMonitor()
+        self.watchdog = LoopWatchdog(threshold=config.stall_threshold)
+        self.tracer = ChromeTraceRecorder()
+        self.profiler = Profiler(config.debug_dir)
         self.game = Galaxy(config)
-        self.game.start()
+        self.game.on_battles_finished = self._battles_finished
+        self._started: asyncio.Future | None = None
+
+    async def start(self):
+        """
+        Builds the galaxy without blocking the event loop. Safe to call more than
+        once, later calls wait for the first.
+        """
+        if self._started is None:
+            self._started = asyncio.ensure_future(self._start())
+        await asyncio.shield(self._started)
+
+    async def _start(self):
+        get_workers().configure(processes=self.config.worker_processes)
+        await self.game.start_offloaded()
+        self.game.scheduler.add_phase(
+            "sessions",
+            self.evict_idle_sessions,
+            every=max(1, round(SESSION_SWEEP_SECONDS / self.config.tick_interval)),
+        )
 
     async def join(
-        self, name, callback: Callable[[str], Awaitable[None]]
-    ) -> Callable[[str], Awaitable[None]]:
-        player = self.game.add_player(name)
+        self,
+        name,
+        callback: Callable[[str], Awaitable[None]],
+        token: Optional[str] = None,
+    ) -> Session:
+        """
+        Connects a player, returning the session to pass their messages to. A
+        token from an earlier session resumes it rather than adding a new player.
+        """
+        await self.start()
+        self.game.scheduler.start()
+        self.rpc_dispatcher.start()
+        self.loop_lag.start()
+        self.watchdog.start()
 
-        api = ClientAndServer(callback)
+        session = self._sessions_by_token.get(token) if token else None
+        if session is not None:
+            if not await session.attach(callback):
+                await self._enter_game(session)
+            return session
+
+        player = self.game.add_player(name)
+        session = Session(player, callback, self.config.session_buffer_size)
 
-        events = api.build_client(ServerEvents)
+        api = ClientAndServer(
+            session.send,
+            metrics=self.rpc_metrics,
+            tracer=self.tracer,
+            trace_track=f"player {player.id} {name}",
+            admit=functools.partial(self.rpc_dispatcher.submit, session),
+        )
+        session.api = api
+        session.events = api.build_client(ServerEvents)
 
         session_ctx = SessionContext(player=player)
-        moves = ShipMoves(lambda: self.sessions, session_ctx, self.game, events)
-        api.register_methods(moves)
+        session.moves = ShipMoves(
+            lambda: self.sessions, session_ctx, self.game, session.events
+        )
+        api.register_methods(session.moves)
+
+        await self._enter_game(session)
+        self.sessions[player.id] = session
+        self._sessions_by_token[session.token] = session
+        await session.moves._broadcast_player_enter_sector(player)
 
-        await events.on_game_enter(
-            player=player.to_public(session_ctx),
-            config=self.config.to_public(session_ctx),
+        return session
+
+    async def _enter_game(self, session: Session):
+        context = session.moves.context
+        await self.game.prefetch_odds(session.player.sector)
+        await session.events.on_game_enter(
+            player=session.player.to_public(context),
+            config=self.config.to_public(context),
+            catalog=TYPE_CATALOG,
+            session_token=session.token,
         )
-        self.sessions[player.id] = events
-        await moves._broadcast_player_enter_sector(player)
 
-        return api.on_incoming
+    def detach(
+        self,
+        session: Session,
+        callback: Optional[Callable[[str], Awaitable[None]]] = None,
+    ):
+        session.detach(callback)
+
+    def _battles_finished(self, battles: list[Battle]):
+        schedule_background_task(self._announce_battles(battles))
+
+    async def _announce_battles(self, battles: list[Battle]):
+        for battle in battles:
+            for ship_id in (battle.attacker_ship_id, battle.target_ship_id):
+                ship = self.game.ships.get(ship_id)
+                session = self.sessions.get(ship.player_id) if ship else None
+                if session is None:
+                    continue
+                context = session.moves.context
+                await session.events.on_battle_exit(
+                    battle=battle.to_public(context),
+                    player=session.player.to_public(context),
+                )
+
+    def evict_idle_sessions(self):
+        now = time.monotonic()
+        for session in list(self.sessions.values()):
+            if session.connected:
+                continue
+            if session.detached_for(now) < self.config.session_resume_window:
+                continue
+            if session.player.ship.battle_id:
+                # let the battle finish first
+                continue
+
+            del self.sessions[session.player.id]
+            del self._sessions_by_token[session.token]
+            schedule_background_task(self._evict(session))
+
+    async def _evict(self, session: Session):
+        player = session.player
+        ship = player.ship
+        sector = self.game.sectors[ship.sector_id]
+        sector.exit_ship(ship)
+        await session.moves._broadcast_ship_exit_sector(ship, sector)
+        self.game.remove_player(player)
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import secrets
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Awaitable, Callable
+
+from tspace.client.logging import log
+from tspace.common.rpc import ClientAndServer
+
+if TYPE_CHECKING:
+    from tspace.common.events import ServerEvents
+    from tspace.server.models import Player
+    from tspace.server.moves import ShipMoves
+
+
+class Session:
+    """
+    A player's connection to the server, which outlives any one websocket.
+
+    While detached, messages for the player are kept in a bounded buffer. A
+    client that comes back with the session's token within the resume window gets
+    them replayed. If the buffer overflowed in the meantime, the client is sent
+    the full game state instead.
+    """
+
+    def __init__(
+        self,
+        player: Player,
+        callback: Callable[[str], Awaitable[None]],
+        buffer_size: int,
+    ):
+        self.player = player
+        self.token = secrets.token_urlsafe(16)
+        self.api: ClientAndServer | None = None
+        self.events: ServerEvents | None = None
+        self.moves: ShipMoves | None = None
+        self.missed: deque[str] = deque(maxlen=buffer_size)
+        # whether messages were dropped from the buffer since detaching
+        self.overflowed = False
+        self.detached_at: float | None = None
+        self._callback: Callable[[str], Awaitable[None]] | None = callback
+        # whether missed messages are being sent to a resumed connection
+        self._replaying = False
+
+    @property
+    def connected(self) -> bool:
+        return self._callback is not None or self._replaying
+
+    async def send(self, text: str):
+        callback = self._callback
+        if callback is not None:
+            try:
+                await callback(text)
+                return
+            except (ConnectionError, RuntimeError) as e:
+                log.info(f"Lost connection to player {self.player.id}: {e}")
+                self.detach(callback)
+        self._buffer(text)
+
+    def _buffer(self, text: str):
+        if len(self.missed) == self.missed.maxlen:
+            self.overflowed = True
+        self.missed.append(text)
+
+    def detach(self, callback: Callable[[str], Awaitable[None]] | None = None):
+        """
+        Disconnects the session, or only the given connection's callback, so a
+        connection closing after the client resumed on another leaves it alone.
+        """
+        if callback is not None and callback is not self._callback:
+            return
+        if self._callback is not None:
+            self._callback = None
+            self.detached_at = time.monotonic()
+
+    async def attach(self, callback: Callable[[str], Awaitable[None]]) -> bool:
+        """
+        Sends the new connection whatever it missed, returning False if that is
+        incomplete and the client needs a full resync instead.
+
+        Messages sent meanwhile join the end of the buffer, so the connection
+        gets everything in order, and it only goes live once that's drained.
+        """
+        self.detached_at = None
+        if not self.overflowed:
+            self._replaying = True
+            try:
+                while self.missed and not self.overflowed:
+                    try:
+                        await callback(self.missed[0])
+                    except (ConnectionError, RuntimeError) as e:
+                        log.info(f"Lost connection to player {self.player.id}: {e}")
+                        self.detached_at = time.monotonic()
+                        return True
+                    self.missed.popleft()
+            finally:
+                self._replaying = False
+
+        # overflowed before, or while replaying if more came in than it holds
+        complete = not self.overflowed
+        self.missed.clear()
+        self.overflowed = False
+        self._callback = callback
+        return complete
+
+    def detached_for(self, now: float) -> float:
+        return 0.0 if self.detached_at is None else now - self.detached_at
+
+    async def __call__(self, text: str):
+        await self.api.on_incoming(text)
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Iterable, Iterator
+
+if TYPE_CHECKING:
+    from tspace.server.models import Sector
+
+# axial directions, walked in order to trace a ring
+HEX_DIRECTIONS = ((1, 0), (1, -1), (0, -1), (-1, 0), (-1, 1), (0, 1))
+
+
+def hex_distance(a: tuple[int, int], b: tuple[int, int]) -> int:
+    dq = a[0] - b[0]
+    dr = a[1] - b[1]
+    return (abs(dq) + abs(dr) + abs(dq + dr)) // 2
+
+
+def ring_offsets(k: int) -> list[tuple[int, int]]:
+    if k == 0:
+        return [(0, 0)]
+    q, r = HEX_DIRECTIONS[4][0] * k, HEX_DIRECTIONS[4][1] * k
+    offsets = []
+    for dq, dr in HEX_DIRECTIONS:
+        for _ in range(k):
+            offsets.append((q, r))
+            q, r = q + dq, r + dr
+    return offsets
+
+
+class HexIndex:
+    """
+    Sector ids by axial (q, r) hex coordinates, kept in a dense array covering
+    the galaxy's bounding square.
+
+    Ring and range queries walk precomputed offsets out from the centre, so
+    they only touch the cells within range rather than every sector.
+    """
+
+    def __init__(self):
+        self.radius = 0
+        self._width = 1
+        self._cells: list[int] = [0]
+        self._rings: list[list[tuple[int, int]]] = [ring_offsets(0)]
+
+    def build(self, sectors: Iterable[Sector]):
+        sectors = list(sectors)
+        self.radius = max(
+            (max(abs(q), abs(r)) for q, r in (s.coords for s in sectors)), default=0
+        )
+        self._width = 2 * self.radius + 1
+        self._cells = [0] * (self._width * self._width)
+        for sector in sectors:
+            self._cells[self._cell(*sector.coords)] = sector.id
+        # no two sectors are further apart than the galaxy's diameter
+        self._rings = [ring_offsets(k) for k in range(2 * self.radius + 1)]
+
+    def _cell(self, q: int, r: int) -> int:
+        return (r + self.radius) * self._width + q + self.radius
+
+    def get(self, q: int, r: int) -> int | None:
+        if abs(q) > self.radius or abs(r) > self.radius:
+            return None
+        return self._cells[self._cell(q, r)] or None
+
+    def ring(self, center: tuple[int, int], k: int) -> Iterator[int]:
+        """
+        Sector ids exactly k hexes from the centre
+        """
+        if k >= len(self._rings):
+            return
+        q, r = center
+        for dq, dr in self._rings[k]:
+            sector_id = self.get(q + dq, r + dr)
+            if sector_id:
+                yield sector_id
+
+    def within(self, center: tuple[int, int], k: int) -> Iterator[int]:
+        """
+        Sector ids within k hexes of the centre, nearest rings first
+        """
+        for distance in range(min(k, len(self._rings) - 1) + 1):
+            yield from self.ring(center, distance)
@@ -0,0 +1,29 @@
+import asyncio
+import json
+
+from tspace.server.builders.drones import FIGHTER
+from tspace.server.builders.ships import MERCHANT_CRUISER
+from tspace.server.config import GameConfig
+from tspace.server.server import Server
+
+
+def test_types_are_sent_once_and_referenced_by_id():
+    server = Server(GameConfig(1, "Test", diameter=10, seed="test"))
+    sent: list[str] = []
+
+    async def callback(text: str):
+        sent.append(text)
+
+    asyncio.run(server.join("Trader", callback))
+
+    params = json.loads(sent[0])["params"]
+    assert params["catalog"]["ship_types"] == [MERCHANT_CRUISER.model_dump()]
+    assert params["catalog"]["drone_types"][0]["name"] == FIGHTER.name
+
+    ship = params["player"]["sector"]["ships"][0]
+    assert ship["type_id"] == MERCHANT_CRUISER.id
+    assert {stack["drone_type_id"] for stack in params["player"]["ship"]["drones"]} == {
+        FIGHTER.id
+    }
+    # the symbols only appear in the catalog
+    assert sent[0].count(json.dumps(FIGHTER.symbol_left)) == 1
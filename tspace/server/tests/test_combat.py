@@ -0,0 +1,46 @@
+from tspace.server.builders.drones import FIGHTER
+from tspace.server.builders.ships import MERCHANT_CRUISER
+from tspace.server.combat import BattleEngine, Combatant, Outcome
+
+
+def _combatants(attacker_sizes, target_sizes):
+    return (
+        Combatant(MERCHANT_CRUISER, [(FIGHTER, size) for size in attacker_sizes]),
+        Combatant(MERCHANT_CRUISER, [(FIGHTER, size) for size in target_sizes]),
+    )
+
+
+def test_battle_deterministic_per_seed():
+    results = []
+    for _ in range(2):
+        engine = BattleEngine()
+        engine.add(1, 1234, *_combatants([30, 10], [20, 20, 5]))
+        engine.run()
+        results.append(engine.result(1))
+
+    assert results[0] == results[1]
+    assert results[0].outcome != Outcome.PENDING
+
+
+def test_battle_independent_of_batch():
+    alone = BattleEngine()
+    alone.add(1, 99, *_combatants([25, 25, 25], [40, 40]))
+    alone.run()
+
+    batched = BattleEngine(capacity=2)
+    for battle_id in range(10):
+        batched.add(battle_id, battle_id * 7, *_combatants([5, 50], [30]))
+    batched.add(99, 99, *_combatants([25, 25, 25], [40, 40]))
+    batched.run()
+
+    assert batched.result(99) == alone.result(1)
+
+
+def test_overwhelming_attacker_wins():
+    engine = BattleEngine()
+    engine.add(1, 5, *_combatants([50, 50, 50], [1]))
+    engine.run()
+
+    result = engine.result(1)
+    assert result.outcome == Outcome.ATTACKER_WON
+    assert result.target_sizes == [0]
@@ -0,0 +1,85 @@
+import asyncio
+import os
+import threading
+import time
+
+from tspace.server.config import GameConfig
+from tspace.server.executor import Pool, WorkerPools, get_workers, offload
+from tspace.server.galaxy import Galaxy
+
+
+def where(value: int) -> tuple[int, int, int]:
+    return value, os.getpid(), threading.get_ident()
+
+
+@offload(Pool.THREAD)
+def double(value: int) -> int:
+    return value * 2
+
+
+def test_offloaded_runs_off_the_loop_and_stays_callable():
+    async def run():
+        return await double.offloaded(21)
+
+    assert double(2) == 4
+    assert double.pool is Pool.THREAD
+    assert asyncio.run(run()) == 42
+
+
+def test_process_work_runs_in_another_process():
+    workers = WorkerPools(threads=1, processes=1)
+
+    async def run():
+        return await workers.run_in_process(where, 1)
+
+    try:
+        value, pid, _ = asyncio.run(run())
+    finally:
+        workers.shutdown()
+    assert value == 1
+    assert pid != os.getpid()
+
+
+def test_no_processes_runs_process_work_on_threads():
+    workers = WorkerPools(threads=1)
+    workers.configure(processes=0)
+
+    async def run():
+        return await workers.run(Pool.PROCESS, where, value=2)
+
+    try:
+        value, pid, thread = asyncio.run(run())
+    finally:
+        workers.shutdown()
+    assert value == 2
+    assert pid == os.getpid()
+    assert thread != threading.get_ident()
+    assert workers._process_pool is None
+
+
+def test_loop_keeps_beating_while_a_galaxy_is_built():
+    def config():
+        return GameConfig(1, "Test", diameter=30, seed="test")
+
+    start = time.perf_counter()
+    Galaxy(config()).start()
+    inline = time.perf_counter() - start
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        gaps = []
+        building = asyncio.create_task(Galaxy(config()).start_offloaded())
+        while not building.done():
+            beat = loop.time()
+            await asyncio.sleep(0.001)
+            gaps.append(loop.time() - beat)
+        await building
+        return gaps
+
+    try:
+        gaps = asyncio.run(run())
+    finally:
+        get_workers().shutdown()
+    # built inline, the loop would be held up for the whole build
+    assert len(gaps) > 10
+    assert max(gaps) * 4 < inline
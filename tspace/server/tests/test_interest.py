@@ -0,0 +1,84 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+from tspace.server.config import GameConfig
+from tspace.server.interest import InterestManager
+from tspace.server.server import Server
+
+
+def line_of_sectors(count: int):
+    return [
+        SimpleNamespace(id=i, warps=[w for w in (i - 1, i + 1) if 1 <= w <= count])
+        for i in range(1, count + 1)
+    ]
+
+
+def test_area_updates_incrementally_on_move():
+    interest = InterestManager(radius=2)
+    interest.build(line_of_sectors(10))
+    assert interest.neighbourhoods[1] == {1, 2, 3}
+    assert interest.neighbourhoods[5] == {3, 4, 5, 6, 7}
+
+    interest.enter(1, 1)
+    interest.enter(2, 9)
+    assert interest.watching(3) == {1}
+    assert interest.watching(8, 3) == {1, 2}
+
+    for sector_id in (2, 3, 4, 5):
+        interest.move(1, sector_id)
+    assert interest.areas[1] == interest.neighbourhoods[5]
+    assert interest.watching(1) == set()
+    assert interest.watching(7) == {1, 2}
+
+    interest.leave(2)
+    assert interest.watching(7) == {1}
+
+
+def test_nearby_traffic_reaches_only_players_in_range():
+    server = Server(GameConfig(1, "Test", diameter=10, seed="test", interest_radius=2))
+    received: dict[str, list] = {}
+
+    def client(name: str):
+        received[name] = []
+
+        async def callback(text: str):
+            received[name].append(json.loads(text))
+
+        return callback
+
+    async def run():
+        await server.join("Watcher", client("watcher"))
+        mover = await server.join("Mover", client("mover"))
+
+        galaxy = server.game
+        near, further = next(
+            (near, further)
+            for near in galaxy.sectors[1].warps
+            for further in galaxy.sectors[near].warps
+            if further != 1
+        )
+        for request_id, sector_id in enumerate((near, further)):
+            await mover(
+                json.dumps(
+                    {
+                        "jsonrpc": "2.0",
+                        "id": request_id,
+                        "method": "move_trader",
+                        "params": {"sector_id": sector_id},
+                    }
+                )
+            )
+            await asyncio.sleep(0.05)
+
+        traffic = [
+            m for m in received["watcher"] if m.get("method") == "on_ship_traffic"
+        ]
+        assert len(traffic) == 1
+        assert traffic[0]["params"]["traffic"]["to_sector_id"] == further
+        assert (
+            galaxy.interest.areas[mover.player.id]
+            == galaxy.interest.neighbourhoods[further]
+        )
+
+    asyncio.run(run())
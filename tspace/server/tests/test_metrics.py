@@ -0,0 +1,81 @@
+import asyncio
+import json
+
+from tspace.common.metrics import RpcMetrics
+from tspace.common.rpc import ClientAndServer
+from tspace.common.watchdog import describe
+from tspace.server.config import GameConfig
+from tspace.server.metrics import render
+from tspace.server.server import Server
+
+
+def test_unregistered_methods_share_one_escaped_series():
+    server = Server(GameConfig(1, "Test", diameter=10, seed="test"))
+
+    async def run():
+        received = []
+
+        async def client(text: str):
+            received.append(text)
+
+        session = await server.join("Tester", client)
+        for request_id, method in enumerate(
+            ("move_trader", 'evil"}\nfake_metric 1', "made_up"), 1
+        ):
+            params = {"sector_id": server.game.sectors[1].warps[0]}
+            await session(
+                json.dumps(
+                    {
+                        "jsonrpc": "2.0",
+                        "id": request_id,
+                        "method": method,
+                        "params": params,
+                    }
+                )
+            )
+        await asyncio.sleep(0.05)
+
+    asyncio.run(run())
+    server.watchdog.stalls['busy "loop"\\'] = 1
+
+    text = render(server)
+    assert set(server.rpc_metrics.methods) == {"move_trader", "unknown"}
+    assert 'tspace_rpc_requests_total{method="move_trader"} 1' in text
+    assert 'tspace_rpc_requests_total{method="unknown"} 2' in text
+    assert "fake_metric" not in text
+    assert 'tspace_event_loop_stalls_total{source="busy \\"loop\\"\\\\"} 1' in text
+
+
+def test_per_method_state_is_made_once():
+    class Echo:
+        async def echo(self, text: str) -> str:
+            return describe(asyncio.current_task())
+
+    sent = []
+
+    async def sender(text: str):
+        sent.append(json.loads(text))
+
+    metrics = RpcMetrics()
+    api = ClientAndServer(sender, metrics=metrics)
+    api.register_methods(Echo())
+
+    async def run():
+        for request_id, method in enumerate(("echo", "echo", "nope", "other"), 1):
+            await api.on_incoming(
+                json.dumps(
+                    {
+                        "jsonrpc": "2.0",
+                        "id": request_id,
+                        "method": method,
+                        "params": {"text": "hi"},
+                    }
+                )
+            )
+
+    asyncio.run(run())
+    assert sent[0]["result"] == "rpc echo"
+    assert set(api._hooks) == {"echo", "unknown"}
+    assert api._hooks["echo"].metrics is metrics.methods["echo"]
+    assert metrics.methods["echo"].calls == 2
+    assert metrics.methods["unknown"].errors == 2
@@ -0,0 +1,64 @@
+from types import SimpleNamespace
+
+from tspace.common.models import CommodityType
+from tspace.server.builders.drones import FIGHTER
+from tspace.server.builders.ships import MERCHANT_CRUISER
+from tspace.server.combat import BattleResult, Outcome
+from tspace.server.models import Battle, DroneStack, Ship, TradingCommodity
+
+
+def test_price_follows_amount_capacity_and_buying():
+    trading = TradingCommodity(CommodityType.organics, 1000, buying=False)
+
+    def fresh() -> float:
+        return trading._calculate_price()
+
+    assert trading.price == fresh()
+    trading.amount = 250
+    assert trading.price == fresh()
+    trading.capacity = 5000
+    assert trading.price == fresh()
+    trading.buying = True
+    assert trading.price == fresh()
+
+
+def test_ship_strength_kept_with_its_stacks():
+    ship = Ship(None, 1, MERCHANT_CRUISER, "Test", 1, 1, [DroneStack(FIGHTER, 10)])
+
+    def recomputed() -> int:
+        return sum(stack.size * stack.drone_type.leadership for stack in ship.drones)
+
+    assert ship.strength == recomputed() > 0
+    extra = DroneStack(FIGHTER, 5)
+    ship.add_drones(extra)
+    assert ship.strength == recomputed()
+
+    extra.size = 12
+    ship.drones[0].size -= 3
+    assert ship.strength == recomputed()
+
+    ship.remove_drones(extra)
+    assert ship.strength == recomputed()
+    # a stack off a ship no longer counts towards it
+    extra.size = 1
+    assert ship.strength == recomputed()
+
+
+def test_battle_losses_go_to_the_stacks_that_fought():
+    attacker = Ship(None, 1, MERCHANT_CRUISER, "A", 1, 1, [DroneStack(FIGHTER, 10)])
+    target = Ship(None, 2, MERCHANT_CRUISER, "T", 2, 1, [DroneStack(FIGHTER, 8)])
+    battle = Battle(SimpleNamespace(ships={1: attacker, 2: target}), 1, 1, 1, 2)
+    battle.engage()
+
+    # mid-battle the attacker brings in a new stack ahead of the fighting one
+    fighting = attacker.drones[0]
+    attacker.remove_drones(fighting)
+    fresh = DroneStack(FIGHTER, 20)
+    attacker.add_drones(fresh)
+    attacker.add_drones(fighting)
+
+    battle.finish(BattleResult(Outcome.ATTACKER_WON, 3, [4], [0]))
+
+    assert (fresh.size, fighting.size) == (20, 4)
+    assert attacker.drones == [fresh, fighting]
+    assert target.drones == [] and target.strength == 0
@@ -0,0 +1,73 @@
+import asyncio
+import time
+
+from tspace.server.builders.drones import FIGHTER
+from tspace.server.builders.ships import MERCHANT_CRUISER
+from tspace.server.combat import Combatant
+from tspace.server.odds import BattleOddsEstimator
+
+# how much faster a cached estimate has to be than simulating, kept well under
+# what it is so a busy machine doesn't fail the test, see benchmarks/odds.py
+# for the actual timings
+CACHED_SPEEDUP = 20
+
+
+def _combatant(*sizes):
+    return Combatant(MERCHANT_CRUISER, [(FIGHTER, size) for size in sizes])
+
+
+def test_odds_favor_stronger_fleet():
+    estimator = BattleOddsEstimator()
+
+    strong = estimator.estimate(_combatant(50, 50, 50), _combatant(5))
+    weak = estimator.estimate(_combatant(5), _combatant(50, 50, 50))
+
+    assert strong.win_probability > 0.95
+    assert weak.win_probability < 0.05
+    assert weak.attacker_losses > strong.attacker_losses
+
+
+def test_odds_cached_by_composition():
+    estimator = BattleOddsEstimator()
+
+    first = estimator.estimate(_combatant(10, 20, 30), _combatant(25, 25))
+    reordered = estimator.estimate(_combatant(30, 10, 20), _combatant(25, 25))
+
+    assert first is reordered
+
+
+def test_odds_independent_of_stack_order():
+    # stack order decides who strikes first on tied initiative and which enemy
+    # stack is hit, so it must not leak into the cached odds
+    forwards = BattleOddsEstimator().estimate(_combatant(1, 40), _combatant(30))
+    backwards = BattleOddsEstimator().estimate(_combatant(40, 1), _combatant(30))
+
+    assert forwards == backwards
+
+
+def test_cached_odds_never_simulate():
+    estimator = BattleOddsEstimator()
+    attacker, target = _combatant(10, 20), _combatant(25)
+    assert estimator.cached(attacker, target) is None
+
+    asyncio.run(estimator.prefetch([(attacker, target)]))
+    assert estimator.cached(_combatant(20, 10), target) == estimator.estimate(
+        attacker, target
+    )
+
+
+def test_cached_odds_much_faster_than_simulating():
+    estimator = BattleOddsEstimator()
+    attacker = _combatant(50, 50, 50)
+    target = _combatant(49, 50, 50)
+
+    start = time.perf_counter()
+    estimator.estimate(attacker, target)
+    uncached = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(100):
+        estimator.estimate(attacker, target)
+    cached = (time.perf_counter() - start) / 100
+
+    assert cached * CACHED_SPEEDUP < uncached
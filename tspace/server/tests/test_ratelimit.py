@@ -0,0 +1,120 @@
+import asyncio
+import json
+import time
+
+from tspace.common.errors import RateLimitedError
+from tspace.server.ratelimit import FairDispatcher, RateLimit, TokenBucket
+
+# how long each request keeps the event loop busy
+WORK = 0.002
+
+
+class FakeApi:
+    def __init__(self):
+        self.handled: list[float] = []
+        self.rejected: list[dict] = []
+
+    async def handle_request(self, text: str, data: dict):
+        time.sleep(WORK)
+        self.handled.append(time.perf_counter())
+        await asyncio.sleep(0)
+
+    async def reject(self, data: dict, error):
+        self.rejected.append({"id": data["id"], "code": error.code})
+
+    def handles(self, method: str) -> bool:
+        return method == "move_trader"
+
+
+class FakeSession:
+    def __init__(self):
+        self.api = FakeApi()
+
+
+def request(request_id: int, method: str = "move_trader") -> tuple[str, dict]:
+    data = {"jsonrpc": "2.0", "id": request_id, "method": method, "params": {}}
+    return json.dumps(data), data
+
+
+def test_token_bucket_refills_at_rate():
+    bucket = TokenBucket(RateLimit(rate=10, burst=2), now=0.0)
+    assert bucket.take(0.0)
+    assert bucket.take(0.0)
+    assert not bucket.take(0.0)
+    assert not bucket.take(0.05)
+    assert bucket.take(0.1)
+
+
+def test_well_behaved_session_latency_is_bounded_while_another_floods():
+    dispatcher = FairDispatcher(
+        limits={"move_trader": RateLimit(rate=1000, burst=1000)},
+        queue_size=1000,
+        workers=1,
+    )
+    abuser, polite = FakeSession(), FakeSession()
+    latencies = []
+
+    async def flood():
+        for i in range(1000):
+            await dispatcher.submit(abuser, *request(i))
+
+    async def behave():
+        for i in range(10):
+            sent = time.perf_counter()
+            await dispatcher.submit(polite, *request(i))
+            while len(polite.api.handled) <= i:
+                await asyncio.sleep(0)
+            latencies.append(polite.api.handled[i] - sent)
+            await asyncio.sleep(0.01)
+
+    async def run():
+        dispatcher.start()
+        await flood()
+        await behave()
+        dispatcher.stop()
+
+    asyncio.run(run())
+
+    # the flood alone would take 2 seconds to get through, but each polite
+    # request only waits for the one abusive request already running
+    assert len(abuser.api.handled) < 1000
+    assert max(latencies) < WORK * 10
+
+
+def test_over_limit_requests_are_rejected():
+    dispatcher = FairDispatcher(limits={"move_trader": RateLimit(rate=1, burst=3)})
+    session = FakeSession()
+
+    async def run():
+        dispatcher.start()
+        for i in range(5):
+            await dispatcher.submit(session, *request(i))
+        await asyncio.sleep(0.05)
+        dispatcher.stop()
+
+    asyncio.run(run())
+
+    assert len(session.api.handled) == 3
+    assert session.api.rejected == [
+        {"id": 3, "code": RateLimitedError.code},
+        {"id": 4, "code": RateLimitedError.code},
+    ]
+
+
+def test_made_up_methods_share_one_bucket():
+    dispatcher = FairDispatcher(
+        default_limit=RateLimit(rate=0.001, burst=5), queue_size=1000, workers=1
+    )
+    session = FakeSession()
+
+    async def run():
+        dispatcher.start()
+        for i in range(100):
+            await dispatcher.submit(session, *request(i, f"made_up_{i}"))
+        await asyncio.sleep(0.05)
+        dispatcher.stop()
+
+    asyncio.run(run())
+    assert len(session.api.handled) == 5
+    assert len(session.api.rejected) == 95
+    assert list(dispatcher._queues[session].buckets) == ["unknown"]
@@ -0,0 +1,46 @@
+import asyncio
+import time
+
+from tspace.server.scheduler import Scheduler
+
+
+def test_overrunning_phase_resumes_next_tick():
+    done = []
+
+    def slow_work():
+        for i in range(6):
+            time.sleep(0.002)
+            done.append(i)
+            yield
+
+    scheduler = Scheduler(interval=1, tick_budget=1)
+    phase = scheduler.add_phase("slow", slow_work, every=100, budget=0.003)
+
+    asyncio.run(scheduler.run_tick())
+    assert 0 < len(done) < 6
+    assert phase.deferred
+
+    for _ in range(5):
+        asyncio.run(scheduler.run_tick())
+    assert done == list(range(6))
+    assert not phase.deferred
+    assert phase.metrics.runs == 1
+    assert phase.metrics.deferrals >= 1
+
+
+def test_phases_deferred_when_tick_budget_spent():
+    calls = []
+
+    scheduler = Scheduler(interval=1, tick_budget=0.001)
+    scheduler.add_phase("first", lambda: time.sleep(0.002))
+    second = scheduler.add_phase("second", lambda: calls.append(scheduler.tick))
+
+    asyncio.run(scheduler.run_tick())
+    assert calls == []
+    assert second.due
+
+    scheduler.phases.pop(0)
+    asyncio.run(scheduler.run_tick())
+    assert calls == [1]
+    assert scheduler.metrics.ticks == 2
+    assert scheduler.metrics.max_duration >= 0.002
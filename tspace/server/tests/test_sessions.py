@@ -0,0 +1,206 @@
+import asyncio
+import json
+
+from pjrpc import Request
+
+from tspace.common.rpc import ClientAndServer
+from tspace.server.builders import battles
+from tspace.server.config import GameConfig
+from tspace.server.server import Server
+
+
+class Client:
+    def __init__(self):
+        self.received = []
+
+    async def __call__(self, text: str):
+        self.received.append(json.loads(text))
+
+    def methods(self) -> list[str]:
+        return [message.get("method", "result") for message in self.received]
+
+
+def move(session, sector_id: int, request_id: int = 1):
+    return session(
+        json.dumps(
+            {
+                "jsonrpc": "2.0",
+                "id": request_id,
+                "method": "move_trader",
+                "params": {"sector_id": sector_id},
+            }
+        )
+    )
+
+
+def test_resumed_session_gets_missed_events():
+    server = Server(GameConfig(1, "Test", diameter=10, seed="test"))
+
+    async def run():
+        watcher, mover = Client(), Client()
+        watching = await server.join("Watcher", watcher)
+        moving = await server.join("Mover", mover)
+        token = watcher.received[0]["params"]["session_token"]
+
+        seen = len(watcher.received)
+        server.detach(watching)
+        await move(moving, server.game.sectors[1].warps[0])
+        await asyncio.sleep(0.05)
+        assert len(watcher.received) == seen
+
+        reconnected = Client()
+        resumed = await server.join("Watcher", reconnected, token)
+        assert resumed is watching
+        assert reconnected.methods() == ["on_ship_exit_sector"]
+        assert len(server.game.players) == 3
+
+    asyncio.run(run())
+
+
+def test_overflowed_buffer_resyncs_and_idle_sessions_are_evicted():
+    server = Server(
+        GameConfig(
+            1,
+            "Test",
+            diameter=10,
+            seed="test",
+            session_buffer_size=1,
+            session_resume_window=0,
+        )
+    )
+
+    async def run():
+        watcher, mover = Client(), Client()
+        watching = await server.join("Watcher", watcher)
+        moving = await server.join("Mover", mover)
+
+        server.detach(watching)
+        warp = server.game.sectors[1].warps[0]
+        await move(moving, warp, 1)
+        await asyncio.sleep(0.05)
+        await move(moving, 1, 2)
+        await asyncio.sleep(0.05)
+
+        reconnected = Client()
+        await server.join("Watcher", reconnected, watching.token)
+        assert reconnected.methods() == ["on_game_enter"]
+
+        server.detach(watching)
+        server.evict_idle_sessions()
+        await asyncio.sleep(0.05)
+        assert watching.player.id not in server.sessions
+        assert watching.player.id not in server.game.players
+        assert "on_ship_exit_sector" in mover.methods()
+
+        fresh = Client()
+        rejoined = await server.join("Watcher", fresh, watching.token)
+        assert rejoined is not watching
+
+    asyncio.run(run())
+
+
+def test_old_connection_closing_leaves_the_resumed_one_attached():
+    server = Server(GameConfig(1, "Test", diameter=10, seed="test"))
+
+    async def run():
+        old, mover = Client(), Client()
+        watching = await server.join("Watcher", old)
+        moving = await server.join("Mover", mover)
+
+        # the client resumes before the server notices the old socket is gone
+        resumed = Client()
+        await server.join("Watcher", resumed, watching.token)
+        server.detach(watching, old)
+        assert watching.connected
+
+        seen = len(old.received)
+        await move(moving, server.game.sectors[1].warps[0])
+        await asyncio.sleep(0.05)
+        assert "on_ship_exit_sector" in resumed.methods()
+        assert len(old.received) == seen
+
+        server.detach(watching, resumed)
+        assert not watching.connected
+
+    asyncio.run(run())
+
+
+def test_battle_participants_hear_when_it_ends():
+    server = Server(GameConfig(1, "Test", diameter=10, seed="test", tick_interval=0.01))
+
+    async def run():
+        attacker, target, bystander = Client(), Client(), Client()
+        attacking = await server.join("Attacker", attacker)
+        targeted = await server.join("Target", target)
+        await server.join("Bystander", bystander)
+
+        battle = battles.create(
+            server.game, attacking.player.ship, targeted.player.ship
+        )
+        for _ in range(100):
+            if battle.result:
+                break
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.05)
+
+        assert battle.result is not None
+        for client, player in ((attacker, attacking), (target, targeted)):
+            (ended,) = [
+                m for m in client.received if m.get("method") == "on_battle_exit"
+            ]
+            assert ended["params"]["battle"]["id"] == battle.id
+            assert ended["params"]["player"]["id"] == player.player.id
+        assert "on_battle_exit" not in bystander.methods()
+
+    asyncio.run(run())
+
+
+def test_messages_sent_while_resuming_follow_the_missed_ones():
+    server = Server(GameConfig(1, "Test", diameter=10, seed="test"))
+
+    async def run():
+        session = await server.join("Watcher", Client())
+        server.detach(session)
+        for i in range(3):
+            await session.send(f"missed {i}")
+
+        received = []
+
+        async def slow(text: str):
+            await asyncio.sleep(0.01)
+            received.append(text)
+
+        resuming = asyncio.create_task(session.attach(slow))
+        await asyncio.sleep(0.005)
+        assert session.connected
+        await session.send("live")
+        assert await resuming
+        await session.send("after")
+        return received
+
+    assert asyncio.run(run()) == [
+        "missed 0",
+        "missed 1",
+        "missed 2",
+        "live",
+        "after",
+    ]
+
+
+def test_calls_left_unanswered_by_a_lost_connection_fail():
+    async def sender(text: str):
+        pass
+
+    api = ClientAndServer(sender)
+
+    async def run():
+        call = asyncio.create_task(api.send(Request("echo", {"text": "hi"}, id=1)))
+        await asyncio.sleep(0)
+        api.fail_pending(ConnectionError("gone"))
+        try:
+            await call
+        except ConnectionError:
+            return True
+        return False
+
+    assert asyncio.run(run())
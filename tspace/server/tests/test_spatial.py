@@ -0,0 +1,68 @@
+import asyncio
+import json
+
+from tspace.server.config import GameConfig
+from tspace.server.server import Server
+from tspace.server.spatial import hex_distance, ring_offsets
+
+
+def test_ring_offsets_are_at_distance():
+    for k in range(5):
+        offsets = ring_offsets(k)
+        assert len(offsets) == max(1, 6 * k)
+        assert len(set(offsets)) == len(offsets)
+        assert all(hex_distance((0, 0), offset) == k for offset in offsets)
+
+
+def test_range_query_matches_full_scan():
+    server = Server(GameConfig(1, "Test", diameter=12, seed="test"))
+    server.game.start()
+    galaxy = server.game
+
+    for sector_id in (1, 20, 60):
+        center = galaxy.sectors[sector_id].coords
+        for radius in (0, 1, 3, 20):
+            found = [s.id for s in galaxy.sectors_within(sector_id, radius)]
+            expected = {
+                s.id
+                for s in galaxy.sectors.values()
+                if hex_distance(center, s.coords) <= radius
+            }
+            assert len(found) == len(expected)
+            assert set(found) == expected
+
+
+def test_galaxy_map_rpc():
+    server = Server(GameConfig(1, "Test", diameter=12, seed="test", map_max_radius=3))
+    sent: list[dict] = []
+
+    async def callback(text: str):
+        sent.append(json.loads(text))
+
+    async def run():
+        player = await server.join("Trader", callback)
+        for request_id, radius in enumerate((2, 4)):
+            await player(
+                json.dumps(
+                    {
+                        "jsonrpc": "2.0",
+                        "id": request_id,
+                        "method": "get_galaxy_map",
+                        "params": {"radius": radius},
+                    }
+                )
+            )
+        await asyncio.sleep(0.05)
+
+    asyncio.run(run())
+
+    galaxy_map, too_wide = [m for m in sent if "id" in m]
+    assert galaxy_map["result"]["center_sector_id"] == 1
+    assert [s["id"] for s in galaxy_map["result"]["sectors"]] == [
+        s.id for s in server.game.sectors_within(1, 2)
+    ]
+    distances = [
+        hex_distance((0, 0), s["coords"]) for s in galaxy_map["result"]["sectors"]
+    ]
+    assert distances == sorted(distances) and distances[-1] == 2
+    assert too_wide["error"]["message"].startswith("Map radius")
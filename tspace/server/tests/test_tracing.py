@@ -0,0 +1,48 @@
+import asyncio
+import json
+
+from tspace.common import tracing
+from tspace.common.rpc import ClientAndServer
+from tspace.common.tracing import ChromeTraceRecorder
+
+
+class Echo:
+    async def echo(self, text: str) -> str:
+        return text
+
+
+def test_records_each_stage_of_a_call(tmp_path):
+    sent = []
+
+    async def sender(text: str):
+        sent.append(text)
+
+    tracer = ChromeTraceRecorder()
+    api = ClientAndServer(sender, tracer=tracer, trace_track="test")
+    api.register_methods(Echo())
+    request = json.dumps(
+        {"jsonrpc": "2.0", "id": 1, "method": "echo", "params": {"text": "hi"}}
+    )
+
+    asyncio.run(api.on_incoming(request))
+    assert not tracer.events
+
+    tracer.start()
+    asyncio.run(api.on_incoming(request))
+    tracer.stop()
+
+    assert json.loads(sent[-1])["result"] == "hi"
+    assert {event["cat"] for event in tracer.events} == {
+        tracing.RECEIVE,
+        tracing.VALIDATE,
+        tracing.HANDLER,
+        tracing.SERIALIZE,
+        tracing.SEND,
+    }
+
+    path = tmp_path / "trace.json"
+    tracer.export(str(path))
+    trace = json.loads(path.read_text())
+    spans = [event for event in trace["traceEvents"] if event["ph"] == "X"]
+    assert len(spans) == len(tracer.events)
+    assert all(span["dur"] >= 0 for span in spans)
@@ -0,0 +1,29 @@
+import asyncio
+import time
+
+from tspace.common.watchdog import LoopWatchdog, activity
+
+
+def blocking_handler():
+    time.sleep(0.3)
+
+
+def test_reports_stall_against_running_activity():
+    watchdog = LoopWatchdog(threshold=0.1, interval=0.01)
+
+    async def run():
+        watchdog.start()
+        try:
+            await asyncio.sleep(0.05)
+            with activity("rpc slow_method"):
+                blocking_handler()
+            await asyncio.sleep(0.1)
+        finally:
+            watchdog.stop()
+
+    asyncio.run(run())
+
+    assert watchdog.stalls == {"rpc slow_method": 1}
+    stall = watchdog.recent[-1]
+    assert 0.15 < stall.duration < 0.5
+    assert any("blocking_handler" in stack for stack in stall.stacks)
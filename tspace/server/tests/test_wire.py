@@ -0,0 +1,45 @@
+import json
+
+import pytest
+
+from tspace.common import wire
+
+
+def message(size: int) -> str:
+    return json.dumps({"jsonrpc": "2.0", "method": "on_x", "params": "a" * size})
+
+
+def test_frames_round_trip_over_one_stream():
+    compressor = wire.FrameCompressor(threshold=100)
+    decompressor = wire.FrameDecompressor()
+
+    small = message(10)
+    assert compressor.encode(small) == small
+
+    for size in (100, 5000, 5000):
+        text = message(size)
+        frame = compressor.encode(text)
+        assert isinstance(frame, bytes)
+        assert len(frame) < len(text)
+        assert decompressor.decode(frame) == text
+
+
+def test_rejects_frames_over_max_size():
+    frame = wire.FrameCompressor(threshold=0).encode(message(2000))
+    assert wire.FrameDecompressor(max_size=4096).decode(frame) == message(2000)
+
+    with pytest.raises(ValueError, match="larger than 1000 bytes"):
+        wire.FrameDecompressor(max_size=1000).decode(frame)
+
+
+def test_rejects_corrupt_and_truncated_frames():
+    with pytest.raises(ValueError, match="Invalid compressed message"):
+        wire.FrameDecompressor().decode(b"\xff\x00not deflate")
+
+    # deflate can't always tell a frame was cut short, but what comes out of
+    # one is never a whole message
+    text = json.dumps({"sectors": list(range(200))})
+    frame = wire.FrameCompressor(threshold=0).encode(text)
+    for end in range(len(frame) - 2):
+        with pytest.raises(ValueError):
+            json.loads(wire.FrameDecompressor().decode(frame[:end]))
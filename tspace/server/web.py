@@ -1,40 +1,127 @@
+import math
+import os
+
 import aiohttp
 from aiohttp import web
 
+from tspace.common import wire
+from tspace.server import metrics
 from tspace.server.config import GameConfig
+from tspace.server.executor import get_workers
+from tspace.server.profiling import ProfilerBusy
 from tspace.server.server import Server
 
 
 class WebGame:
     def __init__(self):
         self.config = GameConfig(
-            1, "Test Game", diameter=10, seed="test", debug_network=False
+            1,
+            "Test Game",
+            diameter=10,
+            seed="test",
+            debug_network=False,
+            admin_token=os.environ.get("TSPACE_ADMIN_TOKEN"),
         )
         self.server = Server(self.config)
 
+    async def on_startup(self, app: web.Application):
+        await self.server.start()
+
+    async def on_cleanup(self, app: web.Application):
+        get_workers().shutdown()
+
     async def handler(self, request: web.Request):
         print("websocket connected")
-        ws = web.WebSocketResponse()
+        ws = web.WebSocketResponse(
+            heartbeat=self.config.ws_heartbeat,
+            max_msg_size=self.config.ws_max_message_size,
+        )
         await ws.prepare(request)
 
+        compressor = decompressor = None
+        if self.config.ws_compress and request.query.get(wire.COMPRESS_PARAM):
+            compressor = wire.FrameCompressor(self.config.ws_compress_threshold)
+            decompressor = wire.FrameDecompressor(self.config.ws_max_message_size)
+
         async def cb(text):
             print(f"OUT: {text}")
-            await ws.send_str(text)
+            frame = compressor.encode(text) if compressor else text
+            # frames share a deflate stream, so nothing may await between
+            # encoding a frame and writing it out
+            if isinstance(frame, bytes):
+                await ws.send_bytes(frame)
+            else:
+                await ws.send_str(frame)
 
         player_name = request.query["name"]
+        token = request.query.get("token")
 
-        in_cb = await self.server.join(player_name, cb)
+        session = await self.server.join(player_name, cb, token)
 
         print("server joined")
-        async for msg in ws:
-            if msg.type == aiohttp.WSMsgType.text:
-                print("IN: %s" % msg.data)
-                await in_cb(msg.data)
-            elif msg.type == aiohttp.WSMsgType.error:
-                print("ws connection closed with exception %s" % ws.exception())
-            else:
-                print("unexpected message type: %s" % msg.type)
+        try:
+            async for msg in ws:
+                if msg.type == aiohttp.WSMsgType.text:
+                    print("IN: %s" % msg.data)
+                    await session(msg.data)
+                elif msg.type == aiohttp.WSMsgType.binary and decompressor:
+                    try:
+                        text = decompressor.decode(msg.data)
+                    except ValueError as e:
+                        # the deflate stream can't be read past a bad frame
+                        print(f"closing connection on bad compressed message: {e}")
+                        await ws.close(code=aiohttp.WSCloseCode.INVALID_TEXT)
+                        break
+                    await session(text)
+                elif msg.type == aiohttp.WSMsgType.error:
+                    print("ws connection closed with exception %s" % ws.exception())
+                else:
+                    print("unexpected message type: %s" % msg.type)
+        finally:
+            self.server.detach(session, cb)
 
         print("websocket connection closed")
 
         return ws
+
+    async def metrics_handler(self, request: web.Request):
+        return web.Response(
+            text=metrics.render(self.server),
+            headers={"Content-Type": "text/plain; version=0.0.4; charset=utf-8"},
+        )
+
+    async def admin_profile_handler(self, request: web.Request):
+        """
+        Profiles the running server for ?seconds=N (default 10). ?mode=sample uses
+        the stack sampler, ?mode=trace records RPC spans, and anything else runs
+        cProfile.
+        """
+        self._check_admin(request)
+        try:
+            seconds = float(request.query.get("seconds", 10))
+        except ValueError:
+            raise web.HTTPBadRequest(text="seconds must be a number")
+        if not math.isfinite(seconds) or seconds <= 0:
+            raise web.HTTPBadRequest(text="seconds must be a positive number")
+
+        profiler = self.server.profiler
+        mode = request.query.get("mode", "cprofile")
+        try:
+            if mode == "trace":
+                path = await profiler.trace(self.server.tracer, seconds)
+                summary = ""
+            elif mode == "sample":
+                path, summary = await profiler.sample(seconds)
+            else:
+                path, summary = await profiler.profile(seconds)
+        except ProfilerBusy as e:
+            raise web.HTTPConflict(text=str(e))
+
+        return web.Response(text=f"{path}\n\n{summary}")
+
+    def _check_admin(self, request: web.Request):
+        token = self.config.admin_token
+        if not token:
+            raise web.HTTPNotFound()
+        if request.headers.get("Authorization") != f"Bearer {token}":
+            raise web.HTTPUnauthorized()
@@ -1,3 +1,5 @@
+import multiprocessing
+
 from aiohttp.web import Application, run_app
 
 from tspace.server.web import WebGame
@@ -6,9 +8,15 @@ from tspace.server.web import WebGame
 def main():
     webgame = WebGame()
     app = Application()
+    app.on_startup.append(webgame.on_startup)
+    app.on_cleanup.append(webgame.on_cleanup)
     app.router.add_route("GET", "/", webgame.handler)
+    app.router.add_route("GET", "/metrics", webgame.metrics_handler)
+    app.router.add_route("POST", "/admin/profile", webgame.admin_profile_handler)
     run_app(app)
 
 
 if __name__ == "__main__":
+    # for the worker process pool in frozen builds
+    multiprocessing.freeze_support()
     main()